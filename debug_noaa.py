@@ -1,9 +1,10 @@
 import subprocess
 import shutil
+from src.core.atlas14 import base_url
 
 def test_fetch():
-    # Try the CSV endpoint found in pfdf source
-    url = "https://hdsc.nws.noaa.gov/cgi-bin/hdsc/new/fe_text_mean.csv?lat=29.7604&lon=-95.3698&data=depth&units=english&series=pds"
+    # The CSV endpoint found in pfdf source, or the stand-in set by $STORMGEN_PFDS_URL
+    url = f"{base_url()}?lat=29.7604&lon=-95.3698&data=depth&units=english&series=pds"
     
     print(f"Fetching {url} using curl...")
     try:
@@ -1,16 +1,43 @@
 import sys
+import time
+_STARTED = time.perf_counter()
+
 import os
 from PyQt5.QtWidgets import QApplication
-from src.gui.main_window import MainWindow
+from PyQt5.QtCore import QTimer
+# QtWebEngine has to be imported before the QApplication exists
+from src.gui.map_widget import register_tile_scheme
+
+def _timing(label, enabled):
+    if enabled:
+        print(f"[startup] {label}: {(time.perf_counter() - _STARTED) * 1000:.0f} ms")
 
 def main():
+    # --startup-timing prints time-to-window milestones; for a per-module import
+    # breakdown run `python -X importtime main.py`
+    show_timing = "--startup-timing" in sys.argv
+    _timing("Qt imported", show_timing)
+    
+    # Custom URL schemes must be registered before the application object exists
+    register_tile_scheme()
     app = QApplication(sys.argv)
     app.setApplicationName("NOAA Atlas 14 Rainfall Generator")
     
     # Set up basic styling or theme if needed
     
+    from src.gui.main_window import MainWindow
+    from src.core.session import PROJECT_EXTENSION
+    _timing("main window imported", show_timing)
+    
     window = MainWindow()
     window.show()
+    # `python main.py site.stormgen` opens a saved project
+    projects = [arg for arg in sys.argv[1:] if arg.endswith(PROJECT_EXTENSION)]
+    if projects:
+        window.open_project(projects[0])
+    _timing("main window shown", show_timing)
+    # First pass through the event loop: the window is painted and responsive
+    QTimer.singleShot(0, lambda: _timing("interactive", show_timing))
     
     sys.exit(app.exec_())
 
@@ -0,0 +1,10 @@
+# The library API (src.core.api) is loaded on first attribute access, so
+# `import src.core` and its submodules stay cheap for worker processes.
+_API_NAMES = {"default_cache", "fetch_site", "site_idf", "parse_return_period", "RegionChoice",
+              "select_region", "generate", "storm_table", "export_storm"}
+
+def __getattr__(name):
+    if name in _API_NAMES:
+        from src.core import api
+        return getattr(api, name)
+    raise AttributeError(f"module 'src.core' has no attribute {name!r}")
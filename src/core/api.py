@@ -0,0 +1,167 @@
+"""
+StormGen as a library: site lookup, region selection, storm generation and export,
+with no Qt, matplotlib or pandas import (pandas is loaded only to write .xlsx).
+
+    from src.core import api
+
+    site = api.fetch_site(29.7604, -95.3698)
+    choice = api.select_region(site, return_period=100)
+    storm = api.generate(choice.d24h, choice.pattern, time_step=5 / 60)
+    api.export_storm(storm, "houston_100yr.csv")
+"""
+import csv
+import os
+import threading
+from collections import namedtuple
+import numpy as np
+from src.core.fetch_cache import FetchCache
+from src.core.generator import RainfallGenerator, STORM_START
+from src.core.idf import IDFCurves
+
+_generator = RainfallGenerator() # Shared so compiled distributions are reused
+_cache = None
+_cache_lock = threading.Lock()
+
+def default_cache():
+    """The process-wide FetchCache, backed by the same on-disk site store as the desktop app."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from src.utils.paths import app_data_dir
+            _cache = FetchCache(db_path=os.path.join(app_data_dir("cache"), "atlas14.sqlite"))
+        return _cache
+
+def fetch_site(lat, lon, cache=None):
+    """
+    Atlas 14 frequency data for a location, from the cache when possible.
+
+    Returns:
+        dict: fetch_data() output ("full_data" holds {duration: {return period: depth}}).
+    """
+    return (cache or default_cache()).fetch(lat, lon)
+
+def site_idf(data):
+    """Fitted IDF equations for a site's data (see src.core.idf.IDFCurves)."""
+    return IDFCurves.for_site(data)
+
+def parse_return_period(value, default=None):
+    """
+    Accepts 100, "100" or "100yr". Invalid values return `default`, or raise
+    ValueError when no default is given.
+    """
+    try:
+        return int(str(value).lower().replace("yr", "").strip())
+    except ValueError:
+        if default is None:
+            raise ValueError(f"Unknown return period: {value!r}")
+        return default
+
+RegionChoice = namedtuple("RegionChoice", "return_period d60m d24h ratio region pattern")
+
+def select_region(data, return_period=25):
+    """
+    The Auto-Select rule: classifies a site by its 60-min / 24-hr depth ratio
+    at the given return period and picks the matching NOAA regional pattern.
+
+    Depths missing from the table count as 0 (giving a ratio of 0). Data without
+    a full table falls back to the 25-yr depths every fetch includes.
+
+    Returns:
+        RegionChoice: (return_period, d60m, d24h, ratio, region, pattern)
+    """
+    full = data.get("full_data")
+    if full:
+        d60m = full.get("60-min", {}).get(return_period, 0.0)
+        d24h = full.get("24-hr", {}).get(return_period, 0.0)
+    else:
+        return_period = 25
+        d60m = data["60m_25yr"]
+        d24h = data["24h_25yr"]
+    ratio = _generator.calculate_ratio(d60m, d24h)
+    region, pattern = _generator.suggest_type(ratio)
+    return RegionChoice(return_period, d60m, d24h, ratio, region, pattern)
+
+def is_auto_pattern(pattern):
+    return pattern is None or str(pattern).lower() == "auto" or str(pattern).startswith("Auto-Select")
+
+def generate(depth, pattern="auto", custom_curve=None, time_step=0.1, duration=48.0,
+             site=None, return_period=25, interpolation="linear"):
+    """
+    Generates a design storm as numpy arrays.
+
+    Args:
+        depth (float): Total 24-hr depth in inches.
+        pattern (str): Distribution name, or "auto" to use select_region() on `site`.
+        custom_curve (dict | CompiledDistribution, optional): For custom patterns.
+        time_step (float): Output interval in hours.
+        duration (float): Output length in hours (at least 24).
+        site (dict, optional): fetch_site() data, needed for "auto".
+        return_period (int): Return period used by "auto".
+        interpolation (str): "linear" or "pchip" (monotone cubic) between the
+            distribution's breakpoints.
+
+    Returns:
+        dict: hours, fractions, cumulative, incremental (+ _mm variants) arrays,
+        and the resolved pattern and depth.
+    """
+    if is_auto_pattern(pattern):
+        if site is None:
+            raise ValueError("Auto pattern selection needs the site's data.")
+        pattern = select_region(site, return_period).pattern
+    storm = _generator.generate_arrays(depth, pattern, custom_curve=custom_curve,
+                                       time_step=time_step, duration=duration, interpolation=interpolation)
+    storm["incremental_mm"] = storm["incremental"] * 25.4
+    storm["cumulative_mm"] = storm["cumulative"] * 25.4
+    storm["pattern"] = pattern
+    storm["depth"] = depth
+    return storm
+
+# Export columns: (header, storm key); Date/Time are derived from the hours
+EXPORT_COLUMNS = [
+    ("Date", "hours"),
+    ("Time", "hours"),
+    ("Hours", "hours"),
+    ("Incremental Rainfall (in)", "incremental"),
+    ("Cumulative Rainfall (in)", "cumulative"),
+    ("Incremental Rainfall (mm)", "incremental_mm"),
+    ("Cumulative Rainfall (mm)", "cumulative_mm"),
+]
+
+def storm_table(storm):
+    """
+    The export table for a storm.
+
+    Returns:
+        tuple: (headers, columns) where Date/Time columns are lists of strings and
+        the rest are numpy arrays.
+    """
+    hours = np.asarray(storm["hours"], dtype=float)
+    seconds = np.round(hours * 3600.0).astype("timedelta64[s]")
+    stamps = np.datetime_as_string(np.datetime64(STORM_START.replace(" ", "T")) + seconds, unit="s")
+    dates, _, times = np.char.partition(stamps, "T").T
+
+    columns = []
+    for header, key in EXPORT_COLUMNS:
+        if header == "Date":
+            columns.append(dates.tolist())
+        elif header == "Time":
+            columns.append(times.tolist())
+        elif key in storm:
+            columns.append(np.round(np.asarray(storm[key], dtype=float), 6))
+        else:
+            columns.append(np.round(np.asarray(storm[key.replace("_mm", "")], dtype=float) * 25.4, 6))
+    return [header for header, _ in EXPORT_COLUMNS], columns
+
+def export_storm(storm, path):
+    """Writes a storm to .csv, .tsv/.txt or .xlsx (chosen by extension)."""
+    headers, columns = storm_table(storm)
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xlsx":
+        import pandas as pd
+        pd.DataFrame(dict(zip(headers, columns))).to_excel(path, index=False)
+        return
+    delimiter = "\t" if ext in (".tsv", ".txt") else ","
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(headers)
+        writer.writerows(zip(*[c.tolist() if isinstance(c, np.ndarray) else c for c in columns]))
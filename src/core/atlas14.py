@@ -2,7 +2,32 @@ import subprocess
 import shutil
 import csv
 import io
+import os
 import re
+import time
+
+class FetchCancelled(Exception):
+    """Raised when a fetch is abandoned through its is_cancelled callback."""
+
+class PFDSHTTPError(RuntimeError):
+    """The server answered with an HTTP error status."""
+
+    def __init__(self, status, url):
+        super().__init__(f"NOAA PFDS returned HTTP {status} for {url}")
+        self.status = status
+
+# Failures worth retrying: throttling and server errors, and curl's
+# resolve/connect/timeout/empty-reply/receive errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_CURL_CODES = {6, 7, 28, 52, 56}
+
+# Overrides the PFDS endpoint, e.g. to point at src.service.pfds_standin
+BASE_URL_ENV = "STORMGEN_PFDS_URL"
+NOAA_BASE_URL = "https://hdsc.nws.noaa.gov/cgi-bin/hdsc/new/fe_text_mean.csv"
+
+def base_url():
+    """The PFDS CSV endpoint: $STORMGEN_PFDS_URL if set, otherwise NOAA's."""
+    return os.environ.get(BASE_URL_ENV) or NOAA_BASE_URL
 
 class Atlas14Fetcher:
     """
@@ -10,14 +35,29 @@ class Atlas14Fetcher:
     Uses 'curl' via subprocess to bypass SSL handshake issues on some systems.
     """
     
-    BASE_URL = "https://hdsc.nws.noaa.gov/cgi-bin/hdsc/new/fe_text_mean.csv"
+    BASE_URL = NOAA_BASE_URL
+    _default_base_url = staticmethod(base_url) # The parameter below shadows the function
     
-    def __init__(self):
+    def __init__(self, base_url=None, retries=2, backoff=0.5, timeout=60, verbose=True):
+        """
+        Args:
+            base_url (str, optional): CSV endpoint; defaults to $STORMGEN_PFDS_URL or NOAA.
+            retries (int): Extra attempts after a throttled (429), server-error or
+                network failure.
+            backoff (float): Seconds before the first retry, doubling each time.
+            timeout (float): Seconds allowed for each attempt.
+            verbose (bool): Print each request URL.
+        """
         # Verify curl is available
         if not shutil.which("curl"):
             raise EnvironmentError("The 'curl' command is required but not found in PATH.")
+        self.base_url = base_url or self._default_base_url()
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.verbose = verbose
 
-    def fetch_data(self, lat, lon, return_period_years=100):
+    def fetch_data(self, lat, lon, return_period_years=100, is_cancelled=None):
         """
         Fetches precipitation frequency estimates for the given lat/lon.
         
@@ -25,6 +65,8 @@ class Atlas14Fetcher:
             lat (float): Latitude
             lon (float): Longitude
             return_period_years (int): Return period to extract the 24h depth for generation (default 100).
+            is_cancelled (callable, optional): Polled while curl runs; returning True kills
+                the request and raises FetchCancelled.
             
         Returns:
             dict: {
@@ -36,33 +78,75 @@ class Atlas14Fetcher:
         """
         # Construct URL with parameters
         # data=depth, units=english, series=pds (partial duration series)
-        url = f"{self.BASE_URL}?lat={lat}&lon={lon}&data=depth&units=english&series=pds"
+        url = f"{self.base_url}?lat={lat}&lon={lon}&data=depth&units=english&series=pds"
         
-        print(f"Fetching data from: {url}")
+        if self.verbose:
+            print(f"Fetching data from: {url}")
         
         try:
-            # -L: Follow redirects
-            # -k: Insecure (skip SSL verification due to potential local handshake issues)
-            # -s: Silent (no progress bar)
-            process = subprocess.run(
-                ["curl", "-L", "-k", "-s", url], 
-                capture_output=True, 
-                text=True,
-                check=True
-            )
-            
-            content = process.stdout
+            content = self._get(url, is_cancelled)
             
             if "File not found" in content or "Error" in content and len(content) < 200:
                 raise ValueError("NOAA Atlas 14 returned an error or no data for this location.")
                 
             return self._parse_csv(content, return_period_years)
             
+        except (FetchCancelled, PFDSHTTPError):
+            raise
         except subprocess.CalledProcessError as e:
             raise RuntimeError(f"Failed to fetch data via curl: {e}")
         except Exception as e:
             raise RuntimeError(f"Error fetching data: {e}")
 
+    def _get(self, url, is_cancelled=None):
+        """Downloads url, retrying transient failures with exponential backoff."""
+        # -L: Follow redirects
+        # -k: Insecure (skip SSL verification due to potential local handshake issues)
+        # -s: Silent (no progress bar)
+        # -w: Append the final HTTP status on its own line
+        args = ["curl", "-L", "-k", "-s", "-m", str(self.timeout), "-w", "\n%{http_code}", url]
+        for attempt in range(self.retries + 1):
+            last_try = attempt == self.retries
+            try:
+                body, _, status = self._run_curl(args, is_cancelled).rpartition("\n")
+            except subprocess.CalledProcessError as e:
+                if last_try or e.returncode not in RETRY_CURL_CODES:
+                    raise
+            else:
+                status = int(status) if status.isdigit() else 0
+                if status < 400:
+                    return body
+                if last_try or status not in RETRY_STATUSES:
+                    raise PFDSHTTPError(status, url)
+            self._sleep(self.backoff * 2 ** attempt, is_cancelled)
+
+    def _sleep(self, seconds, is_cancelled=None, poll_interval=0.1):
+        deadline = time.monotonic() + seconds
+        while True:
+            if is_cancelled is not None and is_cancelled():
+                raise FetchCancelled("Fetch cancelled.")
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(min(poll_interval, remaining))
+
+    def _run_curl(self, args, is_cancelled=None, poll_interval=0.1):
+        """Runs curl and returns stdout, killing it early if is_cancelled() turns True."""
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        while True:
+            try:
+                stdout, stderr = process.communicate(timeout=poll_interval)
+                break
+            except subprocess.TimeoutExpired:
+                if is_cancelled is not None and is_cancelled():
+                    process.kill()
+                    process.communicate()
+                    raise FetchCancelled("Fetch cancelled.")
+        
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+        return stdout
+
     def _parse_csv(self, csv_content, target_return_period):
         """
         Parses the CSV content to extract specific depths.
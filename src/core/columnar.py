@@ -0,0 +1,226 @@
+"""
+Columnar (Parquet / Arrow IPC) export of generated storms and Atlas 14 tables.
+
+Tables are assembled from the numpy arrays with concatenate/repeat, never per
+row, and written as one hive-partitioned dataset (e.g. return_period=100/...)
+that pandas, DuckDB, Spark or pyarrow.dataset can scan directly.
+
+pyarrow is optional; it is imported only when one of these functions is used.
+"""
+import uuid
+import numpy as np
+from src.core.fetch_cache import site_key
+
+# Rows per record batch written; bounds memory when exporting many storms
+BATCH_ROWS = 1_000_000
+
+STORM_PARTITIONS = ("return_period",)
+FREQUENCY_PARTITIONS = ()
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError:
+        raise ImportError("Parquet/Arrow export needs the optional pyarrow package (pip install pyarrow).")
+    return pyarrow
+
+def _strings(pa, values, lengths):
+    """A dictionary-encoded string column: each value repeated lengths[i] times."""
+    dictionary, codes = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+    indices = np.repeat(codes.astype(np.int32), lengths)
+    return pa.DictionaryArray.from_arrays(pa.array(indices), pa.array(dictionary.tolist()))
+
+def storm_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("lat", pa.float64()), ("lon", pa.float64()),
+        ("site_row", pa.int32()), ("site_col", pa.int32()),
+        ("return_period", pa.int32()),
+        ("pattern", pa.dictionary(pa.int32(), pa.string())),
+        ("depth_in", pa.float64()),
+        ("hours", pa.float64()),
+        ("incremental_in", pa.float64()),
+        ("cumulative_in", pa.float64()),
+    ])
+
+def storm_batch(storms):
+    """
+    One RecordBatch holding many storms, one row per time step.
+
+    Args:
+        storms (list): Dicts with "hours", "incremental" and "cumulative" arrays (as
+            returned by src.core.api.generate()) plus scalar "lat", "lon",
+            "return_period", "pattern" and "depth". Missing scalars become NaN / 0 / "".
+
+    Returns:
+        pyarrow.RecordBatch
+    """
+    pa = _pyarrow()
+    lengths = np.array([len(s["hours"]) for s in storms], dtype=np.int64)
+    lat = np.array([s.get("lat", np.nan) for s in storms], dtype=float)
+    lon = np.array([s.get("lon", np.nan) for s in storms], dtype=float)
+    keys = np.array([site_key(a, b) if np.isfinite(a) and np.isfinite(b) else (0, 0) for a, b in zip(lat, lon)],
+                    dtype=np.int32).reshape(len(storms), 2)
+
+    def scalar(values, dtype):
+        return pa.array(np.repeat(np.asarray(values, dtype=dtype), lengths))
+
+    def series(name):
+        return pa.array(np.concatenate([np.asarray(s[name], dtype=float) for s in storms]) if storms
+                        else np.empty(0))
+
+    columns = [
+        scalar(lat, float), scalar(lon, float),
+        scalar(keys[:, 0], np.int32), scalar(keys[:, 1], np.int32),
+        scalar([s.get("return_period", 0) for s in storms], np.int32),
+        _strings(pa, [s.get("pattern", "") for s in storms], lengths),
+        scalar([s.get("depth", np.nan) for s in storms], float),
+        series("hours"), series("incremental"), series("cumulative"),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=storm_schema())
+
+def frequency_schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ("lat", pa.float64()), ("lon", pa.float64()),
+        ("site_row", pa.int32()), ("site_col", pa.int32()),
+        ("duration", pa.dictionary(pa.int32(), pa.string())),
+        ("return_period", pa.int32()),
+        ("depth_in", pa.float64()),
+    ])
+
+def frequency_batch(sites):
+    """
+    One RecordBatch of Atlas 14 depths in long form (one row per site, duration
+    and return period; depths NOAA did not publish are left out).
+
+    Args:
+        sites (list): (lat, lon, data) tuples, data being fetch_data() output.
+
+    Returns:
+        pyarrow.RecordBatch
+    """
+    pa = _pyarrow()
+    parts = {"lat": [], "lon": [], "row": [], "col": [], "duration": [], "rp": [], "depth": []}
+    for lat, lon, data in sites:
+        full = data.get("full_data", {})
+        durations = list(full)
+        rps = np.array(sorted({int(rp) for row in full.values() for rp in row}), dtype=np.int32)
+        depths = np.array([[full[d].get(rp, np.nan) for rp in rps] for d in durations],
+                          dtype=float).reshape(len(durations), len(rps))
+        keep = np.isfinite(depths)
+        n = int(keep.sum())
+        row, col = site_key(lat, lon)
+        parts["lat"].append(np.full(n, lat, dtype=float))
+        parts["lon"].append(np.full(n, lon, dtype=float))
+        parts["row"].append(np.full(n, row, dtype=np.int32))
+        parts["col"].append(np.full(n, col, dtype=np.int32))
+        parts["duration"].append(np.repeat(np.array(durations, dtype=str), keep.sum(axis=1)))
+        parts["rp"].append(np.broadcast_to(rps, depths.shape)[keep])
+        parts["depth"].append(depths[keep])
+
+    def joined(name, dtype):
+        return np.concatenate(parts[name]) if parts[name] else np.empty(0, dtype=dtype)
+
+    durations = joined("duration", str)
+    columns = [
+        pa.array(joined("lat", float)), pa.array(joined("lon", float)),
+        pa.array(joined("row", np.int32)), pa.array(joined("col", np.int32)),
+        _strings(pa, durations, np.ones(len(durations), dtype=np.int64)),
+        pa.array(joined("rp", np.int32)), pa.array(joined("depth", float)),
+    ]
+    return pa.RecordBatch.from_arrays(columns, schema=frequency_schema())
+
+def _chunks(items, size_of, limit):
+    """Groups items so each group holds about `limit` rows."""
+    chunk, rows = [], 0
+    for item in items:
+        chunk.append(item)
+        rows += size_of(item)
+        if rows >= limit:
+            yield chunk
+            chunk, rows = [], 0
+    if chunk:
+        yield chunk
+
+def write_dataset(batches, schema, root, partition_by=(), format="parquet", batch_rows=BATCH_ROWS):
+    """
+    Appends record batches to a partitioned dataset under `root`.
+
+    Each call writes new files (unique names), so results from many runs can
+    accumulate in one dataset.
+
+    Args:
+        batches (iterable): pyarrow.RecordBatch objects, consumed lazily.
+        schema (pyarrow.Schema): Their schema.
+        root (str): Dataset directory.
+        partition_by (tuple): Columns used as hive partition directories.
+        format (str): "parquet" or "arrow" (Arrow IPC / Feather v2).
+        batch_rows (int): Row group size; the writer queues at most a few of these.
+    """
+    pa = _pyarrow()
+    if format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown format: {format} (expected parquet or arrow)")
+    partitioning = None
+    if partition_by:
+        partitioning = pa.dataset.partitioning(pa.schema([schema.field(c) for c in partition_by]), flavor="hive")
+    # One write per batch: the dataset writer otherwise buffers far ahead of the
+    # files it has flushed, and memory would grow with the size of the export
+    for i, batch in enumerate(batches):
+        pa.dataset.write_dataset(
+            batch, root, schema=schema, format="ipc" if format == "arrow" else format,
+            partitioning=partitioning, basename_template=f"part-{uuid.uuid4().hex}-{i}-{{i}}.{format}",
+            existing_data_behavior="overwrite_or_ignore", max_rows_per_group=batch_rows)
+
+def export_storms(storms, root, partition_by=STORM_PARTITIONS, format="parquet", batch_rows=BATCH_ROWS):
+    """
+    Writes storms (see storm_batch()) to a dataset, partitioned by return period
+    by default. `storms` may be any iterable, so batch results can stream in.
+    """
+    batches = (storm_batch(chunk) for chunk in _chunks(storms, lambda s: len(s["hours"]), batch_rows))
+    write_dataset(batches, storm_schema(), root, partition_by, format, batch_rows)
+
+class StormDatasetWriter:
+    """
+    Collects storms one at a time (e.g. as batch jobs finish) and appends them to
+    a storm dataset every `batch_rows` rows. Use as a context manager, or call close().
+    """
+
+    def __init__(self, root, partition_by=STORM_PARTITIONS, format="parquet", batch_rows=BATCH_ROWS):
+        _pyarrow()
+        self.root = root
+        self.partition_by = partition_by
+        self.format = format
+        self.batch_rows = batch_rows
+        self.storms = 0
+        self._pending = []
+        self._rows = 0
+
+    def add(self, storm):
+        self._pending.append(storm)
+        self._rows += len(storm["hours"])
+        self.storms += 1
+        if self._rows >= self.batch_rows:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            write_dataset([storm_batch(self._pending)], storm_schema(), self.root,
+                          self.partition_by, self.format, self.batch_rows)
+            self._pending, self._rows = [], 0
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def export_frequency(sites, root, partition_by=FREQUENCY_PARTITIONS, format="parquet", batch_rows=BATCH_ROWS):
+    """Writes Atlas 14 tables for (lat, lon, data) sites to a dataset (see frequency_batch())."""
+    batches = (frequency_batch(chunk) for chunk in
+               _chunks(sites, lambda s: sum(len(row) for row in s[2].get("full_data", {}).values()), batch_rows))
+    write_dataset(batches, frequency_schema(), root, partition_by, format, batch_rows)
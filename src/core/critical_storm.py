@@ -0,0 +1,209 @@
+"""
+Critical-storm search: the storm duration, peak position and temporal pattern
+that maximise a design objective (peak flow, storage, ...) at a site.
+
+Each pattern's whole grid of durations x peak positions is built as one 2-D
+array (one storm per row) and scored in a single call to the objective;
+patterns are searched in parallel on a thread pool (the work is numpy, which
+releases the GIL).
+
+Storms of duration D are the most intense D hours of a 24-hour pattern,
+centred on its peak, scaled to the site's D-hour depth. The peak is moved to
+peak_position x D the way the Chicago (Keifer & Chu) storm places it: time
+before the peak is stretched or compressed by one factor and time after it by
+another, intensities keep their values, and the longer side takes more of the
+depth. At 0.5 a symmetric pattern is unchanged.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from src.core.generator import RainfallGenerator, RAINFALL_DISTRIBUTIONS, NOAA_ATLAS_14_DISTRIBUTIONS
+from src.core.hydrograph import runoff_hydrographs
+from src.core.idf import depth_table
+from src.core.losses import DEFAULT_IA_RATIO, runoff_depth
+
+DEFAULT_DURATIONS = (1.0, 2.0, 3.0, 6.0, 12.0, 24.0)
+DEFAULT_PEAK_POSITIONS = (0.25, 0.375, 0.5, 0.625, 0.75)
+
+# Acre-feet per cfs-hour (3600 ft^3 / 43560 ft^2)
+ACRE_FEET_PER_CFS_HOUR = 3600.0 / 43560.0
+
+Candidate = namedtuple("Candidate", ["pattern", "duration", "peak_position", "depth", "score"])
+
+_generator = RainfallGenerator()
+
+def builtin_patterns():
+    return list(RAINFALL_DISTRIBUTIONS) + list(NOAA_ATLAS_14_DISTRIBUTIONS)
+
+def site_depths(site, return_period, durations=DEFAULT_DURATIONS):
+    """
+    Atlas 14 depths for storm durations, interpolated log-log between the
+    tabulated durations where needed.
+
+    Args:
+        site (dict): fetch_data() / api.fetch_site() output.
+        return_period (int): Return period in years.
+        durations (iterable): Storm durations in hours.
+
+    Returns:
+        dict: {duration_hours: depth_in}
+    """
+    minutes, return_periods, depths = depth_table(site.get("full_data", {}))
+    if int(return_period) not in return_periods:
+        raise ValueError(f"No Atlas 14 depths for the {return_period}-yr return period.")
+    column = depths[:, list(return_periods).index(int(return_period))]
+    keep = np.isfinite(column) & (column > 0)
+    minutes, column = minutes[keep], column[keep]
+    wanted = np.asarray(durations, dtype=float) * 60.0
+    if len(minutes) < 2 or wanted.min() < minutes[0] or wanted.max() > minutes[-1]:
+        raise ValueError("Storm durations fall outside the site's Atlas 14 durations.")
+    values = np.exp(np.interp(np.log(wanted), np.log(minutes), np.log(column)))
+    # Tabulated durations keep NOAA's values exactly
+    exact = np.isin(wanted, minutes)
+    values[exact] = column[np.searchsorted(minutes, wanted[exact])]
+    return dict(zip((float(d) for d in durations), values.tolist()))
+
+def peak_time(distribution):
+    """Middle of the steepest segment of a cumulative curve, in hours."""
+    i = int(np.argmax(np.diff(distribution.fractions) / np.diff(distribution.times)))
+    return 0.5 * (distribution.times[i] + distribution.times[i + 1])
+
+def storm_fractions(distribution, durations, peak_positions, time_step, n_steps, interpolation="linear"):
+    """
+    Cumulative fractions for every (duration, peak position) pair, one row each
+    (durations vary slowest). Rows run from 0 to n_steps * time_step and hold
+    1.0 after their storm ends.
+
+    Returns:
+        np.ndarray: (len(durations) * len(peak_positions), n_steps + 1)
+    """
+    durations, positions = (grid.reshape(-1, 1) for grid in
+                            np.meshgrid(np.asarray(durations, dtype=float), np.asarray(peak_positions, dtype=float),
+                                        indexing="ij"))
+    first, last = distribution.times[0], distribution.times[-1]
+    if np.any(durations > last - first):
+        raise ValueError(f"Storm durations must not exceed the {last - first:g}-hour pattern.")
+    if np.any((positions <= 0) | (positions >= 1)):
+        raise ValueError("Peak positions must be between 0 and 1.")
+
+    # The D-hour window of the pattern around its peak
+    start = np.clip(peak_time(distribution) - durations / 2.0, first, last - durations)
+    peak_in_window = peak_time(distribution) - start
+    at_start = distribution.evaluate(start, interpolation)
+    at_peak = distribution.evaluate(start + peak_in_window, interpolation) - at_start
+
+    # Storm time -> window time, piecewise linear through (peak_position x D, peak).
+    # Each side's depth is scaled by its stretch so intensities keep their values
+    tau = np.minimum(np.arange(n_steps + 1) * time_step, durations)
+    storm_peak = positions * durations
+    before = storm_peak / peak_in_window
+    after = (durations - storm_peak) / (durations - peak_in_window)
+    rising = tau <= storm_peak
+    u = np.where(rising, tau / before, peak_in_window + (tau - storm_peak) / after)
+    depth = distribution.evaluate(start + u, interpolation) - at_start
+    fractions = np.where(rising, before * depth, before * at_peak + after * (depth - at_peak))
+    return fractions / fractions[:, -1:]
+
+def peak_intensity(hours, incremental):
+    """Objective: the highest rainfall intensity (in/hr) of each storm."""
+    return incremental.max(axis=1) / (hours[1] - hours[0])
+
+class PeakFlow:
+    """
+    Objective: SCS peak runoff (cfs) from one subbasin, using curve-number
+    losses and the SCS unit hydrograph.
+    """
+
+    def __init__(self, area, tc, curve_number, ia_ratio=DEFAULT_IA_RATIO, lag=None):
+        self.area = area
+        self.tc = tc
+        self.curve_number = curve_number
+        self.ia_ratio = ia_ratio
+        self.lag = lag
+
+    def hydrographs(self, hours, incremental):
+        # Many storms, one subbasin: losses broadcast over the storms' cumulative rows
+        runoff = runoff_depth(np.cumsum(incremental, axis=1), self.curve_number, self.ia_ratio)
+        excess = np.diff(runoff, axis=1, prepend=0.0)
+        return runoff_hydrographs(excess, [self.area], [self.tc], hours[1] - hours[0],
+                                  None if self.lag is None else [self.lag], start=hours[0])
+
+    def __call__(self, hours, incremental):
+        return self.hydrographs(hours, incremental)["peak_cfs"]
+
+class PeakStorage(PeakFlow):
+    """
+    Objective: detention storage (acre-ft) needed to hold the inflow above a
+    constant allowable release rate.
+    """
+
+    def __init__(self, area, tc, curve_number, release_cfs, ia_ratio=DEFAULT_IA_RATIO, lag=None):
+        super().__init__(area, tc, curve_number, ia_ratio, lag)
+        self.release_cfs = release_cfs
+
+    def __call__(self, hours, incremental):
+        flow = self.hydrographs(hours, incremental)["flow"]
+        above = np.maximum(flow - self.release_cfs, 0.0)
+        return above.sum(axis=1) * (hours[1] - hours[0]) * ACRE_FEET_PER_CFS_HOUR
+
+def _score_pattern(pattern, depths, peak_positions, time_step, n_steps, interpolation, objective):
+    distribution = pattern if not isinstance(pattern, str) else _generator.get_distribution(pattern)
+    durations = list(depths)
+    fractions = storm_fractions(distribution, durations, peak_positions, time_step, n_steps, interpolation)
+    cumulative = fractions * np.repeat(list(depths.values()), len(peak_positions))[:, None]
+    incremental = np.diff(cumulative, axis=1, prepend=0.0)
+    hours = np.arange(n_steps + 1) * time_step
+    scores = np.asarray(objective(hours, incremental), dtype=float)
+    if scores.shape != (len(incremental),):
+        raise ValueError(f"Objective returned shape {scores.shape}, expected ({len(incremental)},).")
+    return distribution.name, hours, cumulative, incremental, scores
+
+def find_critical_storm(depths, objective=peak_intensity, patterns=None, peak_positions=DEFAULT_PEAK_POSITIONS,
+                        time_step=5 / 60, interpolation="linear", workers=None):
+    """
+    Searches durations x peak positions x patterns for the storm with the
+    highest objective.
+
+    Args:
+        depths (dict): {duration_hours: depth_in}, e.g. from site_depths().
+        objective (callable): f(hours, incremental) -> one score per storm,
+            incremental being (n_storms, n_steps); higher is more critical.
+            See peak_intensity, PeakFlow and PeakStorage.
+        patterns (list, optional): Distribution names or CompiledDistributions
+            (default: every built-in pattern).
+        peak_positions (iterable): Peak times as fractions of the duration.
+        time_step (float): Interval in hours.
+        interpolation (str): "linear" or "pchip" between pattern breakpoints.
+        workers (int, optional): Patterns scored in parallel.
+
+    Returns:
+        dict: The critical storm (hours, cumulative, incremental arrays; pattern,
+        duration, peak_position, depth, score) and "ranking", every Candidate
+        sorted from most to least critical.
+    """
+    if not depths:
+        raise ValueError("No storm durations to search.")
+    depths = {float(d): float(v) for d, v in sorted(depths.items())}
+    peak_positions = list(peak_positions)
+    patterns = builtin_patterns() if patterns is None else list(patterns)
+    n_steps = int(np.ceil(max(depths) / time_step - 1e-9))
+    workers = workers or min(len(patterns), os.cpu_count() or 1)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stormgen-critical") as pool:
+        results = list(pool.map(lambda p: _score_pattern(p, depths, peak_positions, time_step, n_steps,
+                                                         interpolation, objective), patterns))
+
+    ranking = []
+    for name, _, _, _, scores in results:
+        for row, score in enumerate(scores):
+            duration = list(depths)[row // len(peak_positions)]
+            ranking.append(Candidate(name, duration, peak_positions[row % len(peak_positions)],
+                                     depths[duration], float(score)))
+    ranking.sort(key=lambda c: c.score, reverse=True)
+
+    best = ranking[0]
+    name, hours, cumulative, incremental, _ = next(r for r in results if r[0] == best.pattern)
+    row = list(depths).index(best.duration) * len(peak_positions) + peak_positions.index(best.peak_position)
+    return dict(best._asdict(), hours=hours, cumulative=cumulative[row], incremental=incremental[row],
+                ranking=ranking)
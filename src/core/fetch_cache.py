@@ -0,0 +1,226 @@
+import json
+import math
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from src.core.atlas14 import Atlas14Fetcher, FetchCancelled
+from src.core.idf import IDFCurves
+
+# NOAA Atlas 14 estimates are gridded at 30 arc-seconds; points in one cell share data
+GRID_CELLS_PER_DEGREE = 120
+
+def site_key(lat, lon):
+    """Returns the (row, col) Atlas 14 grid cell containing lat/lon."""
+    return (math.floor(lat * GRID_CELLS_PER_DEGREE), math.floor(lon * GRID_CELLS_PER_DEGREE))
+
+def encode_site_data(data):
+    """Serializes fetch_data() output to (json text, compressed raw csv)."""
+    payload = {k: v for k, v in data.items() if k != "raw_csv"}
+    raw = zlib.compress(data.get("raw_csv", "").encode("utf-8"))
+    return json.dumps(payload), raw
+
+def decode_site_data(payload, raw):
+    """Inverse of encode_site_data(); restores integer return-period keys."""
+    data = json.loads(payload)
+    data["full_data"] = {dur: {int(rp): depth for rp, depth in row.items()}
+                         for dur, row in data.get("full_data", {}).items()}
+    data["raw_csv"] = zlib.decompress(raw).decode("utf-8") if raw else ""
+    return data
+
+class _InFlight:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self):
+        self.future = Future()
+        self.waiters = 0
+
+class FetchCache:
+    """
+    Thread-safe cache of Atlas 14 results in front of one shared, long-lived fetcher.
+
+    Results are keyed by grid cell, so nearby clicks in the same cell are cache hits.
+    Concurrent requests for a cell that is already being fetched wait for that fetch
+    instead of starting another one.
+
+    With a db_path, every fetched site is also written to SQLite, so the cache
+    survives restarts and the memory LRU only holds recently used sites.
+    """
+
+    def __init__(self, fetcher=None, max_entries=1024, db_path=None):
+        self._fetcher = fetcher
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # site key -> data (LRU order)
+        self._in_flight = {}          # site key -> _InFlight
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS sites (
+                    row INTEGER, col INTEGER, lat REAL, lon REAL,
+                    d60m_25yr REAL, d24h_25yr REAL,
+                    payload TEXT, raw_csv BLOB,
+                    PRIMARY KEY (row, col))""")
+            self._db.commit()
+
+    @property
+    def fetcher(self):
+        # Created on first use so a missing curl surfaces as a fetch error, not at startup
+        with self._lock:
+            if self._fetcher is None:
+                self._fetcher = Atlas14Fetcher()
+            return self._fetcher
+
+    def get(self, lat, lon):
+        """Returns cached data for the cell containing lat/lon, or None."""
+        key = site_key(lat, lon)
+        with self._lock:
+            return self._lookup(key)
+
+    def put(self, lat, lon, data):
+        key = site_key(lat, lon)
+        with self._lock:
+            return self._store(key, data, lat, lon)
+
+    def _lookup(self, key):
+        # Caller holds the lock
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            return data
+        if self._db is not None:
+            row = self._db.execute("SELECT payload, raw_csv FROM sites WHERE row = ? AND col = ?", key).fetchone()
+            if row is not None:
+                data = decode_site_data(*row)
+                self._remember(key, data)
+                return data
+        return None
+
+    def _remember(self, key, data):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _store(self, key, data, lat, lon):
+        # Caller holds the lock. Returns the cached copy; the caller's dict is left alone
+        data = dict(data)
+        try:
+            IDFCurves.for_site(data) # Fit once; stored with the data as data["idf"]
+        except ValueError:
+            pass # Too few durations to fit; callers fall back to the table
+        self._remember(key, data)
+        if self._db is not None:
+            payload, raw = encode_site_data(data)
+            self._db.execute("INSERT OR REPLACE INTO sites VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (key[0], key[1], lat, lon, data.get("60m_25yr"), data.get("24h_25yr"), payload, raw))
+            self._db.commit()
+        return data
+
+    def sites(self):
+        """
+        Returns a lightweight summary of every cached site (memory and disk):
+        list of (lat, lon, 60-min 25-yr depth, 24-hr 25-yr depth).
+        """
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute("SELECT lat, lon, d60m_25yr, d24h_25yr FROM sites").fetchall()
+            # Memory-only: key centers stand in for the original coordinates
+            return [((row + 0.5) / GRID_CELLS_PER_DEGREE, (col + 0.5) / GRID_CELLS_PER_DEGREE,
+                     data.get("60m_25yr"), data.get("24h_25yr"))
+                    for (row, col), data in self._entries.items()]
+
+    def state(self, lat, lon):
+        """Returns "cached", "fetching" or None for the cell containing lat/lon."""
+        key = site_key(lat, lon)
+        with self._lock:
+            if key in self._in_flight:
+                return "fetching"
+            if self._lookup(key) is not None:
+                return "cached"
+            return None
+
+    def fetch(self, lat, lon, is_cancelled=None):
+        """
+        Returns data for lat/lon from the cache, an in-flight request, or a new fetch.
+
+        Args:
+            lat (float): Latitude
+            lon (float): Longitude
+            is_cancelled (callable, optional): Returns True once the caller no longer
+                wants the result. The network request is only aborted when no other
+                caller is waiting on it.
+
+        Raises:
+            FetchCancelled: If the caller cancelled before a result was available.
+        """
+        key = site_key(lat, lon)
+        with self._lock:
+            data = self._lookup(key)
+            if data is not None:
+                self.hits += 1
+                return data
+            entry = self._in_flight.get(key)
+            owner = entry is None
+            if owner:
+                entry = self._in_flight[key] = _InFlight()
+                self.misses += 1
+            else:
+                entry.waiters += 1
+                self.joined += 1
+
+        if not owner:
+            try:
+                return self._wait(entry, is_cancelled)
+            except FetchCancelled:
+                if is_cancelled is not None and is_cancelled():
+                    raise
+                # The owner gave up just before we joined; fetch on our own behalf
+                return self.fetch(lat, lon, is_cancelled)
+
+        def abandon():
+            return is_cancelled is not None and is_cancelled() and entry.waiters == 0
+
+        try:
+            data = self.fetcher.fetch_data(lat, lon, is_cancelled=abandon)
+        except BaseException as e:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            entry.future.set_exception(e)
+            raise
+
+        with self._lock:
+            data = self._store(key, data, lat, lon)
+            self._in_flight.pop(key, None)
+        entry.future.set_result(data)
+        return data
+
+    def _wait(self, entry, is_cancelled, poll_interval=0.1):
+        try:
+            while True:
+                try:
+                    return entry.future.result(timeout=poll_interval)
+                except FutureTimeout:
+                    if is_cancelled is not None and is_cancelled():
+                        raise FetchCancelled("Fetch cancelled.")
+        finally:
+            with self._lock:
+                entry.waiters -= 1
+
+    def close(self):
+        """Closes the on-disk store; the memory cache stays usable."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "in_flight": len(self._in_flight),
+                    "hits": self.hits, "misses": self.misses, "joined": self.joined}
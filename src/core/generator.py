@@ -1,10 +1,113 @@
-import pandas as pd
 import numpy as np
+from src.core.interpolation import PchipCurve
 from src.utils.definitions import RAINFALL_DISTRIBUTIONS, NOAA_ATLAS_14_DISTRIBUTIONS
 
+# Timestamp of hour 0 in generated series
+STORM_START = "2026-01-01 00:00"
+
+# How cumulative fractions are filled in between a distribution's breakpoints:
+# "linear" spreads rain evenly within each block (np.interp); "pchip" uses a
+# monotone cubic, so intensities vary smoothly at fine time steps
+INTERPOLATIONS = ("linear", "pchip")
+
+# Evaluated time grids kept per distribution (time step x length combinations)
+MAX_CACHED_GRIDS = 32
+
+class CompiledDistribution:
+    """
+    A cumulative distribution stored as sorted, read-only numpy arrays.
+    Built-in and custom curves are both compiled into this form once and
+    then reused by every call to generate().
+    """
+    __slots__ = ("name", "times", "fractions", "_pchip", "_grids")
+
+    def __init__(self, name, times, fractions):
+        self.name = name
+        self.times = np.asarray(times, dtype=float)
+        self.fractions = np.asarray(fractions, dtype=float)
+        self.times.setflags(write=False)
+        self.fractions.setflags(write=False)
+        self._pchip = None
+        self._grids = {} # (interpolation, time_step, n_steps) -> fractions, see on_grid()
+
+    @classmethod
+    def from_points(cls, name, points):
+        """Builds a compiled distribution from a {time_hr: fraction} dict."""
+        items = sorted(points.items())
+        times = [t for t, _ in items]
+        fractions = [f for _, f in items]
+        return cls(name, times, fractions)
+
+    def evaluate(self, hours, interpolation="linear"):
+        """
+        Cumulative fractions at the given times (held at the end values outside the curve).
+
+        Args:
+            hours (np.ndarray): Times in hours.
+            interpolation (str): "linear" or "pchip" (see INTERPOLATIONS).
+        """
+        if interpolation == "linear":
+            return np.interp(hours, self.times, self.fractions)
+        if interpolation == "pchip":
+            # Coefficients are computed on first use and kept with the compiled curve
+            if self._pchip is None:
+                self._pchip = PchipCurve(self.times, self.fractions)
+            return self._pchip(hours)
+        raise ValueError(f"Unknown interpolation: {interpolation} (expected one of {', '.join(INTERPOLATIONS)})")
+
+    def on_grid(self, time_step, n_steps, interpolation="linear"):
+        """
+        Fractions at 0, time_step, ..., n_steps * time_step. Batch runs reuse a few
+        grids, so results are kept (read-only) per grid; repeat calls cost nothing.
+        """
+        key = (interpolation, time_step, n_steps)
+        fractions = self._grids.get(key)
+        if fractions is None:
+            fractions = self.evaluate(np.arange(n_steps + 1) * time_step, interpolation)
+            fractions.setflags(write=False)
+            if len(self._grids) >= MAX_CACHED_GRIDS:
+                self._grids.clear()
+            self._grids[key] = fractions
+        return fractions
+
+    def __len__(self):
+        return len(self.times)
+
+    def __repr__(self):
+        return f"CompiledDistribution({self.name!r}, {len(self)} points)"
+
 class RainfallGenerator:
     def __init__(self):
-        pass
+        # Distribution name -> CompiledDistribution, filled on first use
+        self._compiled = {}
+
+    def get_distribution(self, distribution_name, custom_curve=None):
+        """
+        Returns the CompiledDistribution for a built-in name or a custom curve.
+
+        Args:
+            distribution_name (str): Key in RAINFALL_DISTRIBUTIONS / NOAA_ATLAS_14_DISTRIBUTIONS or "Custom...".
+            custom_curve (dict | CompiledDistribution, optional): Curve used when the name starts with "Custom".
+        """
+        if distribution_name.startswith("Custom") and custom_curve:
+            if isinstance(custom_curve, CompiledDistribution):
+                return custom_curve
+            return CompiledDistribution.from_points(distribution_name, custom_curve)
+
+        compiled = self._compiled.get(distribution_name)
+        if compiled is not None:
+            return compiled
+
+        points = RAINFALL_DISTRIBUTIONS.get(distribution_name)
+        if not points:
+            points = NOAA_ATLAS_14_DISTRIBUTIONS.get(distribution_name)
+
+        if not points:
+            raise ValueError(f"Unknown distribution: {distribution_name}")
+
+        compiled = CompiledDistribution.from_points(distribution_name, points)
+        self._compiled[distribution_name] = compiled
+        return compiled
 
     def calculate_ratio(self, depth_60m, depth_24h):
         """Calculates the 60min/24h ratio."""
@@ -25,48 +128,41 @@ class RainfallGenerator:
         else:
             return "Type D", "NOAA Region D"
 
-    def generate(self, total_depth, distribution_name, custom_curve=None):
+    def generate_arrays(self, total_depth, distribution_name, custom_curve=None,
+                        time_step=0.1, duration=48.0, interpolation="linear"):
         """
-        Generates 24h rainfall distribution.
-        start_time: 2026-01-01 00:00
-        interval: 6 min
+        Generates the rainfall series as plain numpy arrays (no DataFrame).
+        This is the fast path used by the GUI table/graph and batch tools.
         
         Args:
             total_depth (float): Total 24h rainfall in inches.
             distribution_name (str): Key in RAINFALL_DISTRIBUTIONS or "Custom".
-            custom_curve (dict, optional): {time_hr: fraction} if distribution_name is "Custom".
+            custom_curve (dict | CompiledDistribution, optional): See generate().
+            time_step (float): Output interval in hours (default 0.1 = 6 min).
+            duration (float): Output length in hours, at least 24 (default 48).
+            interpolation (str): "linear" (default) or "pchip" between breakpoints.
             
         Returns:
-            pd.DataFrame: [Date, Time, Incremental, Cumulative]
+            dict: {"hours", "fractions", "cumulative", "incremental"} -> np.ndarray
         """
+        if time_step <= 0:
+            raise ValueError("Time step must be positive.")
+        if duration < 24.0:
+            raise ValueError("Output duration must be at least 24 hours.")
         
-        # Get the distribution points
-        if distribution_name.startswith("Custom") and custom_curve:
-            points = custom_curve
-        else:
-            points = RAINFALL_DISTRIBUTIONS.get(distribution_name)
-            if not points:
-                points = NOAA_ATLAS_14_DISTRIBUTIONS.get(distribution_name)
-            
-        if not points:
-            raise ValueError(f"Unknown distribution: {distribution_name}")
-            
-        # Create interpolation function
+        # Get the compiled distribution (cached for built-in curves)
         # Points are time(hr) -> fraction
-        known_times = sorted(points.keys())
-        known_fractions = [points[t] for t in known_times]
-        
-        # Create 6-minute time series (0.1 hr)
-        # 0 to 48 hours
-        # First 24h is the distribution, next 24h is 0 incremental
-        result_times = np.arange(0, 48.1, 0.1) # 0.0, 0.1, ... 48.0
+        distribution = self.get_distribution(distribution_name, custom_curve)
         
-        # Interpolate cumulative fractions for first 24h using Linear Interpolation (np.interp)
-        # as per user request to distribute increments equally within data blocks.
-        fractions_24h = np.interp(result_times[result_times <= 24.0], known_times, known_fractions)
+        # Create the time series (default 6-minute, 0 to 48 hours)
+        # First 24h is the distribution, the remainder is 0 incremental
+        n_steps = int(round(duration / time_step))
+        result_times = np.arange(n_steps + 1) * time_step # 0.0, 0.1, ... 48.0
         
-        # Extend fractions to 48h (constant 1.0 after 24h)
-        fractions = np.pad(fractions_24h, (0, len(result_times) - len(fractions_24h)), 'edge')
+        # Interpolate cumulative fractions. Linear (np.interp) distributes increments
+        # equally within data blocks, as per user request; pchip is the smooth option.
+        # Curves end at 24h, so both hold 1.0 for the tail.
+        fractions = distribution.on_grid(time_step, n_steps, interpolation)
         
         # Calculate depths
         cumulative_depths = fractions * total_depth
@@ -75,16 +171,49 @@ class RainfallGenerator:
         # First point is 0, so first interval is depth at 0.1 - depth at 0.0
         incremental_depths = np.diff(cumulative_depths, prepend=0)
         
+        return {
+            "hours": result_times,
+            "fractions": fractions,
+            "cumulative": cumulative_depths,
+            "incremental": incremental_depths
+        }
+
+    def generate(self, total_depth, distribution_name, custom_curve=None,
+                 time_step=0.1, duration=48.0, interpolation="linear"):
+        """
+        Generates 24h rainfall distribution.
+        start_time: 2026-01-01 00:00
+        interval: 6 min (see time_step)
+        
+        Args:
+            total_depth (float): Total 24h rainfall in inches.
+            distribution_name (str): Key in RAINFALL_DISTRIBUTIONS or "Custom".
+            custom_curve (dict | CompiledDistribution, optional): {time_hr: fraction} or a
+                compiled curve (see src.core.custom_curves) if distribution_name is "Custom".
+            time_step (float): Output interval in hours (default 0.1).
+            duration (float): Output length in hours (default 48).
+            interpolation (str): "linear" (default) or "pchip" between breakpoints.
+            
+        Returns:
+            pd.DataFrame: [Date, Time, Incremental, Cumulative]
+        """
+        # pandas is only needed for the DataFrame output; importing it lazily keeps
+        # src.core (and app startup) fast for callers that only use the arrays
+        import pandas as pd
+        
+        series = self.generate_arrays(total_depth, distribution_name, custom_curve,
+                                      time_step=time_step, duration=duration, interpolation=interpolation)
+        
         # Create DataFrame
-        start_date = pd.Timestamp("2026-01-01 00:00")
-        timestamps = [start_date + pd.Timedelta(hours=t) for t in result_times]
+        start_date = pd.Timestamp(STORM_START)
+        timestamps = start_date + pd.to_timedelta(series["hours"], unit="h")
         
         df = pd.DataFrame({
             "DateTime": timestamps,
-            "Hours": result_times,
-            "Cumulative Fraction": fractions,
-            "Cumulative Rainfall (in)": cumulative_depths,
-            "Incremental Rainfall (in)": incremental_depths
+            "Hours": series["hours"],
+            "Cumulative Fraction": series["fractions"],
+            "Cumulative Rainfall (in)": series["cumulative"],
+            "Incremental Rainfall (in)": series["incremental"]
         })
         
         # Format columns for display
@@ -92,10 +221,10 @@ class RainfallGenerator:
         df["Time"] = df["DateTime"].dt.time
         
         # Rounding as requested
-        # Hours: 1 decimal place
+        # Hours: 1 decimal place (4 for sub-6-minute steps)
         # Incremental Rainfall: 6 decimal places (no more)
         # Cumulative: Let's match incremental precision or standard 2
-        df["Hours"] = df["Hours"].round(1)
+        df["Hours"] = df["Hours"].round(1 if time_step >= 0.1 else 4)
         df["Incremental Rainfall (in)"] = df["Incremental Rainfall (in)"].round(6)
         df["Cumulative Rainfall (in)"] = df["Cumulative Rainfall (in)"].round(6) 
         
@@ -0,0 +1,158 @@
+import re
+import numpy as np
+
+# Duration labels as they appear in the Atlas 14 CSV ("5-min", "24-hr", "2-day")
+_DURATION_UNITS = {"min": 1.0, "hr": 60.0, "day": 1440.0}
+
+# Candidate offsets b (minutes) searched when fitting i = a / (t + b)^c
+B_GRID = np.arange(0.0, 120.25, 0.25)
+
+def duration_minutes(label):
+    """Returns the duration in minutes for an Atlas 14 label, or None if unrecognised."""
+    match = re.match(r"^\s*(\d+(?:\.\d+)?)-(min|hr|day)\s*$", label)
+    if not match:
+        return None
+    return float(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+def depth_table(full_data, min_minutes=5.0, max_minutes=1440.0):
+    """
+    Converts fetch_data()["full_data"] into arrays.
+
+    Returns:
+        tuple: (durations in minutes (n_dur,), return periods (n_rp,),
+                depths in inches (n_dur, n_rp), NaN where missing)
+    """
+    rows = sorted((m, label) for label in full_data
+                  for m in [duration_minutes(label)] if m is not None and min_minutes <= m <= max_minutes)
+    return_periods = sorted({int(rp) for _, label in rows for rp in full_data[label]})
+    depths = np.array([[full_data[label].get(rp, np.nan) for rp in return_periods] for _, label in rows],
+                      dtype=float).reshape(len(rows), len(return_periods))
+    return np.array([m for m, _ in rows]), np.array(return_periods, dtype=int), depths
+
+class IDFCurves:
+    """
+    Fitted intensity-duration-frequency equations for one site,
+    i = a / (t + b)^c with t in minutes and i in in/hr, one (a, b, c) per return period.
+    """
+
+    def __init__(self, return_periods, a, b, c, durations=None):
+        self.return_periods = np.asarray(return_periods, dtype=int)
+        self.a = np.asarray(a, dtype=float)
+        self.b = np.asarray(b, dtype=float)
+        self.c = np.asarray(c, dtype=float)
+        self.durations = np.asarray(durations if durations is not None else [], dtype=float)
+        self._index = {int(rp): i for i, rp in enumerate(self.return_periods)}
+
+    def _rows(self, return_period):
+        if return_period is None:
+            return slice(None)
+        try:
+            return self._index[int(return_period)]
+        except KeyError:
+            raise ValueError(f"No IDF fit for the {return_period}-yr return period.")
+
+    def intensity(self, durations_min, return_period=None):
+        """
+        Evaluates rainfall intensity (in/hr) for any number of durations in one call.
+
+        Args:
+            durations_min (float | array-like): Durations in minutes.
+            return_period (int, optional): Return period in years. If omitted, every
+                fitted return period is evaluated.
+
+        Returns:
+            np.ndarray: Same shape as durations_min, or (n_return_periods, *shape)
+            when return_period is None.
+        """
+        t = np.asarray(durations_min, dtype=float)
+        rows = self._rows(return_period)
+        a, b, c = self.a[rows], self.b[rows], self.c[rows]
+        if return_period is None:
+            # Broadcast the coefficients over a leading return-period axis
+            shape = (-1,) + (1,) * t.ndim
+            a, b, c = a.reshape(shape), b.reshape(shape), c.reshape(shape)
+        return a / (t + b) ** c
+
+    def depth(self, durations_min, return_period=None):
+        """Rainfall depth (in) for the given durations; see intensity()."""
+        t = np.asarray(durations_min, dtype=float)
+        return self.intensity(t, return_period) * (t / 60.0)
+
+    def to_dict(self):
+        """
+        Plain lists, suitable for JSON (stored with the site in the fetch cache).
+        Unfitted coefficients are None (null) rather than NaN, which JSON lacks.
+        """
+        def values(array):
+            return [float(v) if np.isfinite(v) else None for v in array]
+        return {"return_periods": self.return_periods.tolist(), "a": values(self.a),
+                "b": values(self.b), "c": values(self.c), "durations": self.durations.tolist()}
+
+    @classmethod
+    def from_dict(cls, d):
+        # None (unfitted) becomes NaN again
+        return cls(d["return_periods"], d["a"], d["b"], d["c"], d.get("durations"))
+
+    @classmethod
+    def for_site(cls, data):
+        """
+        Returns the fit for fetch_data() output, reusing the one stored with the
+        data when present and storing a new one otherwise.
+        """
+        if data.get("idf"):
+            return cls.from_dict(data["idf"])
+        curves = fit_idf(data.get("full_data", {}))
+        data["idf"] = curves.to_dict()
+        return curves
+
+    def __repr__(self):
+        return f"IDFCurves({len(self.return_periods)} return periods)"
+
+def fit_idf(full_data, min_minutes=5.0, max_minutes=1440.0, b_grid=B_GRID):
+    """
+    Fits i = a / (t + b)^c to every return period of an Atlas 14 depth table.
+
+    For each candidate b the equation is linear in log space
+    (log i = log a - c log(t + b)), so the least-squares a and c for every
+    (b, return period) pair come out of one broadcast computation; the b with the
+    smallest log-space error is kept per return period. Missing depths are ignored.
+
+    Args:
+        full_data (dict): {duration label: {return period: depth}} from fetch_data().
+        min_minutes, max_minutes (float): Durations used for the fit (default 5 min - 24 hr).
+        b_grid (np.ndarray): Candidate b values in minutes.
+
+    Returns:
+        IDFCurves
+    """
+    t, return_periods, depths = depth_table(full_data, min_minutes, max_minutes)
+    if len(t) < 3 or len(return_periods) == 0:
+        raise ValueError("At least three durations are needed to fit IDF curves.")
+
+    intensity = depths / (t[:, None] / 60.0)
+    w = (np.isfinite(intensity) & (intensity > 0)).astype(float) # (n_dur, n_rp)
+    y = np.log(np.where(w > 0, intensity, 1.0))                   # (n_dur, n_rp)
+    x = np.log(t[:, None] + b_grid[None, :])                       # (n_dur, n_b)
+
+    # Weighted simple regression of y on x for every (b, return period) pair
+    n = w.sum(axis=0)                                  # (n_rp,)
+    n_safe = np.maximum(n, 1.0)
+    x_mean = (x.T @ w) / n_safe                        # (n_b, n_rp)
+    y_mean = (w * y).sum(axis=0) / n_safe              # (n_rp,)
+    sxx = ((x ** 2).T @ w) - n * x_mean ** 2           # (n_b, n_rp)
+    sxy = (x.T @ (w * y)) - n * x_mean * y_mean
+    syy = (w * y ** 2).sum(axis=0) - n * y_mean ** 2
+    with np.errstate(divide="ignore", invalid="ignore"): # Unfittable columns; masked below
+        slope = sxy / sxx
+    sse = syy - sxy * slope
+
+    best = np.argmin(sse, axis=0)                      # (n_rp,)
+    cols = np.arange(len(return_periods))
+    c = -slope[best, cols]
+    a = np.exp(y_mean - slope[best, cols] * x_mean[best, cols])
+
+    # Return periods with too few points cannot be fitted
+    bad = n < 3
+    a[bad] = np.nan
+    c[bad] = np.nan
+    return IDFCurves(return_periods, a, b_grid[best], c, durations=t)
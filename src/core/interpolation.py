@@ -0,0 +1,96 @@
+import numpy as np
+
+def pchip_slopes(x, y):
+    """
+    Node slopes for a shape-preserving (monotone) cubic through (x, y), after
+    Fritsch & Carlson: zero at local extrema and flat steps, a weighted harmonic
+    mean of the neighbouring secant slopes elsewhere, and a one-sided
+    three-point estimate at the ends (the same rules as SciPy's PchipInterpolator).
+
+    Args:
+        x (np.ndarray): Strictly increasing nodes, at least 2.
+        y (np.ndarray): Values at the nodes.
+
+    Returns:
+        np.ndarray: dy/dx at every node.
+    """
+    h = np.diff(x)
+    delta = np.diff(y) / h
+    if len(x) == 2:
+        return np.array([delta[0], delta[0]])
+
+    m = np.zeros_like(y)
+    w1 = 2.0 * h[1:] + h[:-1]
+    w2 = h[1:] + 2.0 * h[:-1]
+    same_sign = np.sign(delta[:-1]) * np.sign(delta[1:]) > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        harmonic = (w1 + w2) / (w1 / delta[:-1] + w2 / delta[1:])
+    m[1:-1] = np.where(same_sign, harmonic, 0.0)
+    m[0] = _end_slope(h[0], h[1], delta[0], delta[1])
+    m[-1] = _end_slope(h[-1], h[-2], delta[-1], delta[-2])
+    return m
+
+def _end_slope(h0, h1, d0, d1):
+    """Non-centred three-point end slope, limited so the end interval stays monotone."""
+    m = ((2.0 * h0 + h1) * d0 - h0 * d1) / (h0 + h1)
+    if np.sign(m) != np.sign(d0):
+        return 0.0
+    if np.sign(d0) != np.sign(d1) and abs(m) > abs(3.0 * d0):
+        return 3.0 * d0
+    return m
+
+class PchipCurve:
+    """
+    A monotone piecewise-cubic curve with its per-interval polynomial
+    coefficients precomputed, so evaluation at any number of points is one
+    search plus a Horner step:
+
+        y = c0 + s * (c1 + s * (c2 + s * c3)),  s = x - origin
+
+    Outside [x[0], x[-1]] the end values are held, as np.interp does.
+    """
+
+    __slots__ = ("x", "origin", "c0", "c1", "c2", "c3")
+
+    def __init__(self, x, y):
+        x = np.array(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if len(x) < 2:
+            raise ValueError("At least two points are needed to interpolate.")
+        if np.any(np.diff(x) <= 0):
+            raise ValueError("Interpolation nodes must be strictly increasing.")
+
+        h = np.diff(x)
+        delta = np.diff(y) / h
+        m = pchip_slopes(x, y)
+        # Row k + 1 is interval k; rows 0 and n are constants holding the end values,
+        # so row = searchsorted(x, xq, "right") needs no clipping or masking
+        zero = [0.0]
+        self.x = x
+        self.origin = np.concatenate([x[:1], x])
+        self.c0 = np.concatenate([y[:1], y[:-1], y[-1:]])
+        self.c1 = np.concatenate([zero, m[:-1], zero])
+        self.c2 = np.concatenate([zero, (3.0 * delta - 2.0 * m[:-1] - m[1:]) / h, zero])
+        self.c3 = np.concatenate([zero, (m[:-1] + m[1:] - 2.0 * delta) / h ** 2, zero])
+        for array in (self.x, self.origin, self.c0, self.c1, self.c2, self.c3):
+            array.setflags(write=False)
+
+    def __call__(self, xq):
+        xq = np.asarray(xq, dtype=float)
+        if xq.ndim == 1 and np.all(xq[1:] >= xq[:-1]):
+            # Sorted queries (any time grid): each row's coefficients cover one
+            # contiguous run, so they are repeated instead of gathered point by point
+            runs = np.diff(np.searchsorted(xq, self.x, side="left"), prepend=0, append=len(xq))
+            pick = lambda c: np.repeat(c, runs)
+        else:
+            rows = np.searchsorted(self.x, xq, side="right")
+            pick = lambda c: c.take(rows)
+        s = xq - pick(self.origin)
+        y = pick(self.c3)
+        for c in (self.c2, self.c1, self.c0):
+            y *= s
+            y += pick(c)
+        return y
+
+    def __repr__(self):
+        return f"PchipCurve({len(self.x)} points)"
@@ -0,0 +1,91 @@
+import numpy as np
+
+def decimate_peaks(edges, values, max_bins):
+    """
+    Reduces a step series to at most `max_bins` steps for display.
+    Consecutive steps are grouped and each group shows its maximum,
+    so the storm peak is never lost however long the series is.
+
+    Args:
+        edges (np.ndarray): Step edges, len(values) + 1.
+        values (np.ndarray): Step heights.
+        max_bins (int): Upper bound on the number of drawn steps.
+
+    Returns:
+        tuple: (edges, values) with at most max_bins steps.
+    """
+    n = len(values)
+    if n <= max_bins:
+        return edges, values
+    group = int(np.ceil(n / max_bins))
+    n_groups = int(np.ceil(n / group))
+    padded = np.full(n_groups * group, -np.inf)
+    padded[:n] = values
+    grouped = padded.reshape(n_groups, group).max(axis=1)
+    grouped_edges = np.append(edges[:-1:group], edges[-1])
+    return grouped_edges, grouped
+
+def prepare_series(hours, incremental, cumulative, max_bins=2000):
+    """
+    Builds the display arrays for GraphWidget.show_prepared(). Pure numpy, so it can
+    run on a worker thread before the result is handed to the GUI.
+
+    Returns:
+        dict: bar edges/values, cumulative line x/y and axis limits.
+    """
+    hours = np.asarray(hours, dtype=float)
+    incremental = np.asarray(incremental, dtype=float)
+    cumulative = np.asarray(cumulative, dtype=float)
+
+    # One bar per time step, starting at its time stamp
+    width = hours[1] - hours[0] if len(hours) > 1 else 0.1
+    edges = np.append(hours, hours[-1] + width)
+
+    bar_edges, bar_values = decimate_peaks(edges, incremental, max_bins)
+    stride = max(1, int(np.ceil(len(hours) / max_bins)))
+
+    peak = float(incremental.max()) if len(incremental) else 0.0
+    total = float(cumulative.max()) if len(cumulative) else 0.0
+    return {
+        "bar_edges": bar_edges,
+        "bar_values": bar_values,
+        "line_x": np.append(hours[::stride], hours[-1]),
+        "line_y": np.append(cumulative[::stride], cumulative[-1]),
+        "xlim": (edges[0], edges[-1]),
+        "ylim": (0, peak * 1.05 if peak > 0 else 1.0),
+        "ylim2": (0, total * 1.05 if total > 0 else 1.0),
+    }
+
+# Storm arrays that are proportional to the total depth
+DEPTH_KEYS = ("incremental", "cumulative", "incremental_mm", "cumulative_mm")
+
+def rescale_prepared(prepared, factor):
+    """prepare_series() output for the same storm with every depth multiplied by factor."""
+    bar_values = prepared["bar_values"] * factor
+    line_y = prepared["line_y"] * factor
+    peak = float(bar_values.max()) if len(bar_values) else 0.0
+    total = float(line_y.max()) if len(line_y) else 0.0
+    return dict(prepared, bar_values=bar_values, line_y=line_y,
+                ylim=(0, peak * 1.05 if peak > 0 else 1.0),
+                ylim2=(0, total * 1.05 if total > 0 else 1.0))
+
+def rescale_storm(storm, depth):
+    """
+    The same storm at another total depth. A storm is its cumulative fraction
+    curve times the depth, so the depth arrays and the prepared plot just scale;
+    nothing is re-interpolated or re-binned. New arrays are returned (the input
+    may be shared, e.g. with a project).
+
+    Returns:
+        dict: The rescaled storm, or None if the storm's depth is 0 (nothing to scale).
+    """
+    if not storm.get("depth"):
+        return None
+    factor = depth / storm["depth"]
+    scaled = dict(storm, depth=depth)
+    for key in DEPTH_KEYS:
+        if key in storm:
+            scaled[key] = storm[key] * factor
+    if "plot" in storm:
+        scaled["plot"] = rescale_prepared(storm["plot"], factor)
+    return scaled
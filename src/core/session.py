@@ -0,0 +1,243 @@
+import io
+import json
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+import numpy as np
+from src.core.fetch_cache import site_key
+
+# Bump when the layout below changes incompatibly
+PROJECT_VERSION = 1
+PROJECT_EXTENSION = ".stormgen"
+
+# Project file layout (a zip archive):
+#   manifest.json                 settings + one small summary per site (read on open)
+#   sites/<id>/site.json          scalar fetch results, duration labels, return periods, IDF fit
+#   sites/<id>/depths.npy         Atlas 14 depth table, (n_durations, n_return_periods)
+#   sites/<id>/raw.csv            NOAA CSV as fetched
+#   sites/<id>/storm-<k>.npy      generated storm k: rows hours, incremental, cumulative
+
+class ProjectError(ValueError):
+    """Raised when a project file is missing parts or was written by a newer version."""
+
+def _npy_bytes(array):
+    buffer = io.BytesIO()
+    np.save(buffer, np.ascontiguousarray(array), allow_pickle=False)
+    return buffer.getvalue()
+
+class ProjectSite:
+    """
+    One site in a project. Only the summary from the manifest is held in memory
+    until data() or storms() is called; those read just this site's members.
+    """
+
+    def __init__(self, site_id, lat, lon, summary=None, storm_meta=None, project=None):
+        self.id = site_id
+        self.lat = lat
+        self.lon = lon
+        self.summary = summary or {}       # {"60m_25yr", "24h_25yr"} for lists and the map
+        self.storm_meta = storm_meta or [] # [{"label", "pattern", "depth"}] per stored storm
+        self._project = project            # Source Project for lazy loading, or None
+        self._data = None
+        self._storms = None
+
+    @property
+    def loaded(self):
+        return self._data is not None
+
+    def data(self):
+        """Returns the fetch_data()-style dict for this site, loading it on first use."""
+        if self._data is None and self._project is not None:
+            self._data = self._project._read_site(self.id)
+        return self._data
+
+    def storms(self):
+        """Returns the stored storms as dicts with hours/incremental/cumulative arrays."""
+        if self._storms is None:
+            self._storms = []
+            if self._project is not None:
+                for k, meta in enumerate(self.storm_meta):
+                    hours, incremental, cumulative = self._project._read_array(f"sites/{self.id}/storm-{k}.npy")
+                    self._storms.append(dict(meta, hours=hours, incremental=incremental, cumulative=cumulative))
+        return self._storms
+
+    def __repr__(self):
+        return f"ProjectSite({self.lat:.4f}, {self.lon:.4f}, {len(self.storm_meta)} storms)"
+
+class Project:
+    """
+    A set of sites (fetched Atlas 14 tables plus generated storms) and the
+    settings they were worked with, saved as one compact zip of numpy arrays.
+
+    Opening a project reads only its manifest; each site's arrays are read
+    from the archive the first time that site is viewed.
+    """
+
+    def __init__(self):
+        self.settings = {}
+        self.sites = OrderedDict() # site key -> ProjectSite
+        self.current = None        # site key of the site last viewed
+        self.path = None
+        self._zip = None
+        self._zip_lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path):
+        project = cls()
+        project._attach(path)
+        return project
+
+    def _attach(self, path):
+        try:
+            zf = zipfile.ZipFile(path, "r")
+        except zipfile.BadZipFile as e:
+            raise ProjectError(f"{path} is not a StormGen project: {e}")
+        try:
+            manifest = json.loads(zf.read("manifest.json"))
+            if manifest.get("version", 0) > PROJECT_VERSION:
+                raise ProjectError(f"{path} was written by a newer StormGen (format {manifest['version']}).")
+            sites = OrderedDict()
+            for entry in manifest.get("sites", []):
+                site = ProjectSite(entry["id"], entry["lat"], entry["lon"], entry.get("summary"),
+                                   entry.get("storms"), project=self)
+                sites[site_key(site.lat, site.lon)] = site
+        except ProjectError:
+            zf.close()
+            raise
+        except (KeyError, ValueError, TypeError, AttributeError, zipfile.BadZipFile) as e:
+            zf.close()
+            raise ProjectError(f"{path} is not a StormGen project: {e}")
+
+        self.close()
+        self._zip = zf
+        self.path = path
+        self.settings = manifest.get("settings", {})
+        self.sites = sites
+        current = manifest.get("current")
+        self.current = tuple(current) if current else None
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _read_array(self, name):
+        try:
+            with self._zip_lock:
+                with self._zip.open(name) as f:
+                    return np.load(io.BytesIO(f.read()), allow_pickle=False)
+        except (KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise ProjectError(f"{self.path} is damaged ({name}): {e}")
+
+    def _read_site(self, site_id):
+        try:
+            with self._zip_lock:
+                meta = json.loads(self._zip.read(f"sites/{site_id}/site.json"))
+                raw_csv = self._zip.read(f"sites/{site_id}/raw.csv").decode("utf-8")
+        except (KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise ProjectError(f"{self.path} is damaged (site {site_id}): {e}")
+        depths = self._read_array(f"sites/{site_id}/depths.npy")
+
+        data = {k: v for k, v in meta.items() if k not in ("durations", "return_periods")}
+        # NaN marks depths NOAA did not publish; leave them out as fetch_data() does
+        data["full_data"] = {label: {rp: float(d) for rp, d in zip(meta["return_periods"], row) if np.isfinite(d)}
+                             for label, row in zip(meta["durations"], depths)}
+        data["raw_csv"] = raw_csv
+        return data
+
+    def site(self, lat, lon):
+        """Returns the ProjectSite for the grid cell containing lat/lon, or None."""
+        return self.sites.get(site_key(lat, lon))
+
+    def add_site(self, lat, lon, data):
+        """Adds (or refreshes) a site from fetch_data() output and makes it current."""
+        key = site_key(lat, lon)
+        site = self.sites.get(key)
+        if site is None:
+            site = self.sites[key] = ProjectSite(f"{len(self.sites):05d}", lat, lon)
+        site._data = data
+        site.summary = {"60m_25yr": data.get("60m_25yr"), "24h_25yr": data.get("24h_25yr")}
+        self.current = key
+        return site
+
+    def add_storm(self, lat, lon, storm):
+        """
+        Stores a generated storm with its site. A storm with the same label
+        replaces the earlier one.
+        """
+        site = self.sites.get(site_key(lat, lon))
+        if site is None:
+            raise ProjectError("Add the site to the project before its storms.")
+        storms = site.storms()
+        meta = {"label": storm.get("label", storm.get("pattern", "")),
+                "pattern": storm.get("pattern", ""), "depth": float(storm.get("depth", 0.0))}
+        entry = dict(meta, hours=storm["hours"], incremental=storm["incremental"], cumulative=storm["cumulative"])
+        for i, existing in enumerate(site.storm_meta):
+            if existing["label"] == meta["label"]:
+                site.storm_meta[i] = meta
+                storms[i] = entry
+                return
+        site.storm_meta.append(meta)
+        storms.append(entry)
+
+    def save(self, path):
+        """
+        Writes the project. Sites never opened in this session are copied from the
+        source archive as stored bytes, so saving a large project stays cheap.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        manifest = {"version": PROJECT_VERSION, "settings": self.settings,
+                    "current": list(self.current) if self.current else None, "sites": []}
+
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED) as out:
+            for i, site in enumerate(self.sites.values()):
+                new_id = f"{i:05d}"
+                if site._project is None or site.loaded or site._storms is not None:
+                    self._write_site(out, new_id, site)
+                else:
+                    self._copy_site(out, site.id, new_id, len(site.storm_meta))
+                manifest["sites"].append({"id": new_id, "lat": site.lat, "lon": site.lon,
+                                          "summary": site.summary, "storms": site.storm_meta})
+            out.writestr("manifest.json", json.dumps(manifest))
+
+        in_memory = {key: site for key, site in self.sites.items() if site.loaded or site._storms is not None}
+        current = self.current
+        self.close()
+        os.replace(tmp_path, path)
+        self._attach(path)
+        # Sites are re-read lazily from the new file; keep what this session already holds
+        for key, old in in_memory.items():
+            self.sites[key]._data = old._data
+            self.sites[key]._storms = old._storms
+        self.current = current
+
+    def _write_site(self, out, site_id, site):
+        data = site.data() or {}
+        full_data = data.get("full_data", {})
+        durations = list(full_data)
+        return_periods = sorted({int(rp) for row in full_data.values() for rp in row})
+        depths = np.array([[full_data[d].get(rp, np.nan) for rp in return_periods] for d in durations],
+                          dtype=float).reshape(len(durations), len(return_periods))
+
+        meta = {k: v for k, v in data.items() if k not in ("full_data", "raw_csv")}
+        meta["durations"] = durations
+        meta["return_periods"] = return_periods
+        out.writestr(f"sites/{site_id}/site.json", json.dumps(meta))
+        out.writestr(f"sites/{site_id}/depths.npy", _npy_bytes(depths))
+        out.writestr(f"sites/{site_id}/raw.csv", data.get("raw_csv", ""))
+        for k, storm in enumerate(site.storms()):
+            rows = np.vstack([storm["hours"], storm["incremental"], storm["cumulative"]]).astype(float)
+            out.writestr(f"sites/{site_id}/storm-{k}.npy", _npy_bytes(rows))
+
+    def _copy_site(self, out, old_id, new_id, n_storms):
+        names = ["site.json", "depths.npy", "raw.csv"] + [f"storm-{k}.npy" for k in range(n_storms)]
+        with self._zip_lock:
+            for name in names:
+                out.writestr(f"sites/{new_id}/{name}", self._zip.read(f"sites/{old_id}/{name}"))
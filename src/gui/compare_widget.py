@@ -0,0 +1,132 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import matplotlib.pyplot as plt
+import numpy as np
+
+# Legend entries beyond this are summarised rather than listed
+MAX_LEGEND_ENTRIES = 12
+
+# tab20 gives 20 distinct colours; each further 20 storms take the next line style
+LINE_STYLES = ["-", "--", ":", "-."]
+
+def series_styles(n):
+    """Colours and line styles for n storms, distinct for the first 80."""
+    index = np.arange(n)
+    colors = plt.cm.tab20(index % 20) if n else []
+    return colors, [LINE_STYLES[(i // 20) % len(LINE_STYLES)] for i in range(n)]
+
+def step_outline(edges, values):
+    """Vertices of the outline of a step series (what ax.stairs draws), as (n, 2)."""
+    x = np.repeat(edges, 2)[1:-1]
+    y = np.repeat(values, 2)
+    return np.column_stack([x, y])
+
+class CompareWidget(QWidget):
+    """
+    Overlays many storms on one canvas: incremental hyetographs on top,
+    cumulative curves below.
+
+    Every series lives in a single LineCollection per axis, so adding a storm
+    only swaps the segment list; 50+ overlays redraw as one artist each.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.layout.addWidget(self.canvas)
+        self.is_dark = False
+
+        self.ax, self.ax_cum = self.figure.subplots(2, 1, sharex=True)
+        self.incremental_lines = LineCollection([], linewidths=1.2)
+        self.cumulative_lines = LineCollection([], linewidths=1.5)
+        self.ax.add_collection(self.incremental_lines)
+        self.ax_cum.add_collection(self.cumulative_lines)
+
+        self.ax.set_title('Storm Comparison')
+        self.ax.set_ylabel('Incremental (in)')
+        self.ax_cum.set_ylabel('Cumulative (in)')
+        self.ax_cum.set_xlabel('Time (hours)')
+
+        self.labels = []
+        self.set_theme(self.is_dark)
+
+    def set_series(self, series):
+        """
+        Replaces the overlaid storms.
+
+        Args:
+            series (list): (label, prepared) pairs, where prepared is the output of
+                src.core.series.prepare_series() (e.g. a generated storm's "plot").
+        """
+        self.labels = [label for label, _ in series]
+        colors, styles = series_styles(len(series))
+
+        self.incremental_lines.set_segments([step_outline(p["bar_edges"], p["bar_values"]) for _, p in series])
+        self.cumulative_lines.set_segments([np.column_stack([p["line_x"], p["line_y"]]) for _, p in series])
+        self.incremental_lines.set_color(colors)
+        self.cumulative_lines.set_color(colors)
+        self.incremental_lines.set_linestyle(styles or "-")
+        self.cumulative_lines.set_linestyle(styles or "-")
+
+        if series:
+            self.ax.set_xlim(min(p["xlim"][0] for _, p in series), max(p["xlim"][1] for _, p in series))
+            self.ax.set_ylim(0, max(p["ylim"][1] for _, p in series))
+            self.ax_cum.set_ylim(0, max(p["ylim2"][1] for _, p in series))
+        self._update_legend(colors, styles)
+        self.canvas.draw_idle()
+
+    def clear(self):
+        self.set_series([])
+
+    def _update_legend(self, colors, styles):
+        legend = self.ax.get_legend()
+        if legend:
+            legend.remove()
+        if not self.labels:
+            return
+        shown = min(len(self.labels), MAX_LEGEND_ENTRIES)
+        handles = [Line2D([], [], color=colors[i], linestyle=styles[i]) for i in range(shown)]
+        title = f"{len(self.labels)} storms" if len(self.labels) > shown else None
+        self.ax.legend(handles, self.labels[:shown], loc='upper right', fontsize='small', title=title)
+        self._style_legend()
+
+    def _style_legend(self):
+        legend = self.ax.get_legend()
+        if legend:
+            plt.setp(legend.get_texts(), color=self._fg)
+            legend.get_title().set_color(self._fg)
+            legend.get_frame().set_facecolor(self._bg)
+            legend.get_frame().set_edgecolor(self._grid)
+
+    def set_theme(self, is_dark):
+        self.is_dark = is_dark
+        if is_dark:
+            bg = "#2b2b2b"
+            fg = "#ffffff"
+            grid = "#555555"
+        else:
+            bg = "#ffffff"
+            fg = "#000000"
+            grid = "#cccccc"
+        self._bg, self._fg, self._grid = bg, fg, grid
+
+        self.figure.patch.set_facecolor(bg)
+        for ax in (self.ax, self.ax_cum):
+            ax.set_facecolor(bg)
+            for spine in ax.spines.values():
+                spine.set_color(fg)
+            ax.xaxis.label.set_color(fg)
+            ax.yaxis.label.set_color(fg)
+            ax.tick_params(axis='x', colors=fg)
+            ax.tick_params(axis='y', colors=fg)
+            ax.grid(True, linestyle='--', alpha=0.7, color=grid)
+        self.ax.title.set_color(fg)
+
+        self._style_legend()
+        self.canvas.draw_idle()
@@ -2,55 +2,63 @@ from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
+from src.core.series import prepare_series
 
 class GraphWidget(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
-        
+
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
-        self.layout.addWidget(self.canvas)
-        self.ax = self.figure.add_subplot(111)
         self.is_dark = False # Default to light
-        
-    def plot_data(self, df):
-        self.figure.clear() # Clear the entire figure
-        self.ax = self.figure.add_subplot(111) # Re-add subplot
-        
-        # Apply current theme to new axes
-        self.set_theme(self.is_dark)
-        
-        # Plot incremental rainfall as bars
-        hours = df["Hours"].values
-        incremental = df["Incremental Rainfall (in)"].values
-        cumulative = df["Cumulative Rainfall (in)"].values
-
-        # Bar plot for incremental (hyetograph)
-        self.ax.bar(hours, incremental, width=0.1, align='edge', label='Incremental (in)', color='blue', alpha=0.7)
-        
-        # Line plot for cumulative on secondary axis
+
+        # Artists are created once and updated in place by plot_series()
+        self.ax = self.figure.add_subplot(111)
         self.ax2 = self.ax.twinx()
-        self.ax2.plot(hours, cumulative, color='green', label='Cumulative (in)', linewidth=2)
+
+        # Incremental rainfall as a filled step patch (one bar per time step)
+        self.bars = self.ax.stairs([0.0], [0.0, 0.1], fill=True, label='Incremental (in)', color='blue', alpha=0.7)
+        # Cumulative rainfall on secondary axis
+        self.line_cumulative, = self.ax2.plot([], [], color='green', label='Cumulative (in)', linewidth=2)
         self.ax2.set_ylabel('Cumulative Rainfall (in)', color='green')
-        
+
         self.ax.set_xlabel('Time (hours)')
         self.ax.set_ylabel('Incremental Rainfall (in)', color='blue')
         self.ax.set_title('24-Hour Rainfall Hyetograph')
-        
+
         # Legend
         # Combine legends
         lines, labels = self.ax.get_legend_handles_labels()
         lines2, labels2 = self.ax2.get_legend_handles_labels()
         self.ax.legend(lines + lines2, labels + labels2, loc='lower right')
-        
-        self.ax.grid(True, linestyle='--', alpha=0.7)
-        
-        # Apply theme to new axes (both ax and ax2)
+
         self.set_theme(self.is_dark)
-        
-        self.canvas.draw()
+
+    def plot_data(self, df):
+        self.plot_series(df["Hours"].values,
+                         df["Incremental Rainfall (in)"].values,
+                         df["Cumulative Rainfall (in)"].values)
+
+    def display_bins(self):
+        """Never draw more steps than there are pixels across the canvas."""
+        return max(500, self.canvas.width())
+
+    def plot_series(self, hours, incremental, cumulative):
+        """Updates the existing artists with a new series and redraws once."""
+        self.show_prepared(prepare_series(hours, incremental, cumulative, self.display_bins()))
+
+    def show_prepared(self, prepared):
+        """Applies arrays from prepare_series() to the existing artists and redraws once."""
+        self.bars.set_data(prepared["bar_values"], prepared["bar_edges"])
+        self.line_cumulative.set_data(prepared["line_x"], prepared["line_y"])
+
+        self.ax.set_xlim(*prepared["xlim"])
+        self.ax.set_ylim(*prepared["ylim"])
+        self.ax2.set_ylim(*prepared["ylim2"])
+
+        self.canvas.draw_idle()
 
     def set_theme(self, is_dark):
         self.is_dark = is_dark
@@ -62,13 +70,13 @@ class GraphWidget(QWidget):
             bg = "#ffffff"
             fg = "#000000"
             grid = "#cccccc"
-            
+
         self.figure.patch.set_facecolor(bg)
         self.ax.set_facecolor(bg)
-        
+
         # Axis lines and labels
         self.ax.spines['bottom'].set_color(fg)
-        self.ax.spines['top'].set_color(fg) 
+        self.ax.spines['top'].set_color(fg)
         self.ax.spines['left'].set_color(fg)
         self.ax.spines['right'].set_color(fg)
         self.ax.xaxis.label.set_color(fg)
@@ -76,25 +84,23 @@ class GraphWidget(QWidget):
         self.ax.tick_params(axis='x', colors=fg)
         self.ax.tick_params(axis='y', colors=fg)
         self.ax.title.set_color(fg)
-        
+
         # Grid color
         self.ax.grid(True, linestyle='--', alpha=0.7, color=grid)
-        
-        # Style ax2 if it exists
-        if hasattr(self, 'ax2'):
-            self.ax2.spines['bottom'].set_color(fg)
-            self.ax2.spines['top'].set_color(fg) 
-            self.ax2.spines['left'].set_color(fg)
-            self.ax2.spines['right'].set_color(fg)
-            # Y-label is already green, but let's ensure ticks are visible
-            self.ax2.tick_params(axis='y', colors='green') 
-            # Or use fg for ticks if preferred, but green matches line
-        
-        # Update legend if exists
+
+        # Style ax2
+        self.ax2.spines['bottom'].set_color(fg)
+        self.ax2.spines['top'].set_color(fg)
+        self.ax2.spines['left'].set_color(fg)
+        self.ax2.spines['right'].set_color(fg)
+        # Y-label is already green, but let's ensure ticks are visible
+        self.ax2.tick_params(axis='y', colors='green')
+
+        # Update legend
         legend = self.ax.get_legend()
         if legend:
             plt.setp(legend.get_texts(), color=fg)
             legend.get_frame().set_facecolor(bg)
             legend.get_frame().set_edgecolor(grid)
-            
-        self.canvas.draw()
+
+        self.canvas.draw_idle()
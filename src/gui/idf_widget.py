@@ -3,6 +3,7 @@ from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 import matplotlib.pyplot as plt
 import numpy as np
+from src.core.idf import depth_table, fit_idf
 
 class IDFWidget(QWidget):
     def __init__(self, parent=None):
@@ -15,51 +16,47 @@ class IDFWidget(QWidget):
         self.ax = self.figure.add_subplot(111)
         self.is_dark = False
         
-    def plot_data(self, atlas_data):
+    def plot_data(self, atlas_data, curves=None):
         """
-        Plot IDF curves on a log-log scale.
+        Plot IDF curves on a log-log scale: tabulated Atlas 14 intensities as
+        markers and, when available, the fitted i = a/(t+b)^c equations as lines.
+        
+        Args:
+            atlas_data (dict): {duration label: {return period: depth}}.
+            curves (IDFCurves, optional): Fitted equations; fitted here if omitted.
         """
         self.figure.clear()
         self.ax = self.figure.add_subplot(111)
         self.set_theme(self.is_dark)
         
-        if not atlas_data:
+        durations, rps, depths = depth_table(atlas_data) if atlas_data else (None, [], None)
+        if len(rps) == 0:
             self.ax.text(0.5, 0.5, "No Data Available", 
                         horizontalalignment='center', verticalalignment='center',
                         transform=self.ax.transAxes, color='gray')
             self.canvas.draw()
             return
-
-        # Helper to parse duration key to minutes
-        def parse_dur(k):
-            if "-min" in k: return int(k.replace("-min", ""))
-            if "-hr" in k: return int(k.replace("-hr", "")) * 60
-            return None
-
-        first_key = list(atlas_data.keys())[0]
-        rps = sorted(atlas_data[first_key].keys()) 
         
-        durations = []
-        for k in atlas_data.keys():
-            m = parse_dur(k)
-            if m: durations.append((k, m))
-        durations.sort(key=lambda x: x[1])
-        x_vals = [d[1] for d in durations] # minutes
+        if curves is None:
+            try:
+                curves = fit_idf(atlas_data)
+            except ValueError:
+                curves = None # Too few durations; show the table only
         
+        # Intensity = Depth / (Duration_in_hours), for every duration/return period at once
+        intensities = depths / (durations[:, None] / 60.0)
         colors = plt.cm.jet(np.linspace(0, 1, len(rps)))
+        self.ax.set_prop_cycle(color=colors)
         
-        for i, rp in enumerate(rps):
-            y_vals = [] # Intensity
-            
-            for k, m in durations:
-                depth = atlas_data[k].get(rp, np.nan)
-                # Intensity = Depth / (Duration_in_hours)
-                intensity = depth / (m / 60.0)
-                y_vals.append(intensity)
-            
-            # Plot
-            label = f"{rp}-yr"
-            self.ax.loglog(x_vals, y_vals, marker='o', linestyle='-', label=label, color=colors[i], markersize=4)
+        if curves is not None:
+            t = np.geomspace(durations[0], durations[-1], 200)
+            fitted = curves.intensity(t) # (n_rp, 200)
+            self.ax.loglog(durations, intensities, marker='o', linestyle='none', markersize=4)
+            self.ax.set_prop_cycle(color=colors)
+            self.ax.loglog(t, fitted.T, linestyle='-', label=[f"{rp}-yr" for rp in curves.return_periods])
+        else:
+            self.ax.loglog(durations, intensities, marker='o', linestyle='-', markersize=4,
+                           label=[f"{rp}-yr" for rp in rps])
 
         self.ax.set_xlabel('Duration (min)')
         self.ax.set_ylabel('Intensity (in/hr)')
@@ -0,0 +1,32 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+
+class LazyTab(QWidget):
+    """
+    Tab page whose contents are built the first time it is shown (or asked for).
+
+    The factory is called with no arguments and returns the page widget; heavy
+    imports (matplotlib, etc.) belong inside the factory so they are only paid
+    for when the user actually opens the tab.
+    """
+
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self._factory = factory
+        self._content = None
+        self.layout = QVBoxLayout(self)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+
+    @property
+    def is_built(self):
+        return self._content is not None
+
+    def content(self):
+        """Returns the page widget, building it now if needed."""
+        if self._content is None:
+            self._content = self._factory()
+            self.layout.addWidget(self._content)
+        return self._content
+
+    def showEvent(self, event):
+        self.content()
+        super().showEvent(event)
@@ -1,30 +1,95 @@
+import os
+from collections import OrderedDict
+import numpy as np
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QLabel, QComboBox, QDoubleSpinBox, QPushButton, 
-                             QTableWidget, QTabWidget, QTableWidgetItem, QMessageBox,
-                             QScrollArea, QApplication)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
+                             QTableView, QTabWidget, QMessageBox, QHeaderView,
+                             QScrollArea, QApplication, QFileDialog, QProgressBar, QAction,
+                             QCheckBox)
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import Qt, QMimeData, QTimer
 from src.gui.map_widget import MapWidget
-from src.gui.graph_widget import GraphWidget
-from src.gui.idf_widget import IDFWidget
-from src.core.atlas14 import Atlas14Fetcher
+from src.gui.lazy_tab import LazyTab
+from src.core.series import prepare_series, rescale_storm
+from src.core.idf import IDFCurves
+from src.core.session import Project, ProjectError, PROJECT_EXTENSION
+from src.core.fetch_cache import FetchCache, site_key
 from src.core.generator import RainfallGenerator
+from src.core.api import parse_return_period, select_region
+from src.core.custom_curves import CustomCurveLoader, CustomCurveError
+from src.gui.table_models import (ArrayTableModel, format_fixed, format_hours,
+                                  format_storm_date, format_storm_time)
+from src.gui.table_export import clipboard_payloads, write_table
+from src.gui.workers import TaskRunner
+from src.utils.paths import app_data_dir
 
-class FetchWorker(QThread):
-    result_ready = pyqtSignal(object)
-    error_occurred = pyqtSignal(str)
+# Results table columns: (header, storm series key)
+RESULT_COLUMNS = [
+    ("Date", "hours"),
+    ("Time", "hours"),
+    ("Hours", "hours"),
+    ("Incremental Rainfall (in)", "incremental"),
+    ("Cumulative Rainfall (in)", "cumulative"),
+    ("Incremental Rainfall (mm)", "incremental_mm"),
+    ("Cumulative Rainfall (mm)", "cumulative_mm"),
+]
 
-    def __init__(self, lat, lon):
-        super().__init__()
-        self.lat = lat
-        self.lon = lon
-        self.fetcher = Atlas14Fetcher()
+# Output resolution choices: label -> hours
+TIME_STEPS = {"6 min": 0.1, "1 min": 1 / 60, "2 min": 2 / 60, "5 min": 5 / 60,
+              "10 min": 10 / 60, "15 min": 0.25, "30 min": 0.5, "60 min": 1.0}
+OUTPUT_DURATIONS = {"48 hr": 48.0, "24 hr": 24.0, "72 hr": 72.0}
+# How the curve is filled in between breakpoints: label -> generator interpolation
+INTERPOLATION_MODES = {"Linear": "linear", "Smooth (monotone cubic)": "pchip"}
 
-    def run(self):
-        try:
-            data = self.fetcher.fetch_data(self.lat, self.lon)
-            self.result_ready.emit(data)
-        except Exception as e:
-            self.error_occurred.emit(str(e))
+# Quiet period after the location last changed before NOAA data is prefetched
+PREFETCH_DELAY_MS = 600
+
+# Live preview: quiet period after a depth/pattern edit, and previewed storms kept for reuse
+PREVIEW_DELAY_MS = 120
+PREVIEW_CACHE_SIZE = 16
+
+def fetch_site(token, report_progress, cache, lat, lon):
+    """Worker-thread fetch through the shared cache; abandoned if the request goes stale."""
+    return cache.fetch(lat, lon, is_cancelled=lambda: token.cancelled)
+
+def build_storm(token, report_progress, generator, depth, pattern, custom_curve,
+                time_step, duration, max_bins, interpolation="linear"):
+    """
+    Worker-thread half of Generate: builds the series plus everything the table
+    and graph need, so the GUI thread only swaps data into existing views.
+    """
+    storm = generator.generate_arrays(depth, pattern, custom_curve=custom_curve,
+                                      time_step=time_step, duration=duration, interpolation=interpolation)
+    report_progress(40)
+    token.check()
+    
+    # Calculate MM columns
+    storm["incremental_mm"] = storm["incremental"] * 25.4
+    storm["cumulative_mm"] = storm["cumulative"] * 25.4
+    storm["pattern"] = pattern
+    storm["depth"] = depth
+    storm["time_step"] = time_step
+    storm["duration"] = duration
+    storm["interpolation"] = interpolation
+    report_progress(60)
+    token.check()
+    
+    storm["plot"] = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"], max_bins)
+    report_progress(100)
+    return storm
+
+def build_pattern_set(token, report_progress, generator, depth, patterns, time_step, duration, max_bins,
+                      interpolation="linear"):
+    """Worker-thread storms for several patterns at one depth, for the compare view."""
+    series = []
+    for i, pattern in enumerate(patterns):
+        token.check()
+        storm = generator.generate_arrays(depth, pattern, time_step=time_step, duration=duration,
+                                          interpolation=interpolation)
+        plot = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"], max_bins)
+        series.append((f"{pattern}, {depth:.2f} in", plot))
+        report_progress(100 * (i + 1) // len(patterns))
+    return series
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -34,6 +99,36 @@ class MainWindow(QMainWindow):
         
         self.generator = RainfallGenerator()
         self.fetched_data = None
+        self.last_generated = None
+        
+        # Sites and storms worked on this session; saved/opened as a project file
+        self.project = Project()
+        self.current_site = None # (lat, lon) of the site whose data is shown
+        
+        # Background work (fetching, generation, rendering prep) runs on a shared thread pool
+        self.tasks = TaskRunner(parent=self)
+        # One long-lived fetcher behind a grid-cell cache, shared by every fetch.
+        # Fetched sites persist on disk and are shown as the map's cached-sites overlay.
+        self.fetch_cache = FetchCache(db_path=os.path.join(app_data_dir("cache"), "atlas14.sqlite"))
+        self.overlay_keys = set() # site keys already drawn on the map
+        self.fetch_errors = {} # site key -> last error message
+        
+        # Speculative prefetch once the selected location settles
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_key = None
+        
+        # Live preview of the shown storm as depth/pattern/step change (debounced)
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self.preview_storms = OrderedDict() # (pattern, step, duration) -> storm at some depth
+        
+        # Custom distributions: compiled once, re-read only when the file changes
+        self.custom_loader = CustomCurveLoader()
+        self.custom_curve_path = "custom.csv"
+        self.custom_curve_files = {} # combo entry ("Custom: name") -> file path
         
         self.central_widget = QWidget()
         self.setCentralWidget(self.central_widget)
@@ -41,7 +136,9 @@ class MainWindow(QMainWindow):
         self.layout = QHBoxLayout(self.central_widget)
         
         self._init_ui()
+        self._init_menu()
         self._connect_signals()
+        self._load_site_overlay()
         
     def _init_ui(self):
         # Left Panel (Controls)
@@ -107,6 +204,27 @@ class MainWindow(QMainWindow):
         self.input_depth.setDecimals(2)
         self.left_layout.addWidget(self.input_depth)
         
+        # Output resolution and length
+        step_layout = QHBoxLayout()
+        step_layout.addWidget(QLabel("Time Step:"))
+        self.combo_time_step = QComboBox()
+        self.combo_time_step.addItems(list(TIME_STEPS.keys()))
+        step_layout.addWidget(self.combo_time_step)
+        step_layout.addWidget(QLabel("Length:"))
+        self.combo_duration = QComboBox()
+        self.combo_duration.addItems(list(OUTPUT_DURATIONS.keys()))
+        step_layout.addWidget(self.combo_duration)
+        self.left_layout.addLayout(step_layout)
+        
+        interp_layout = QHBoxLayout()
+        interp_layout.addWidget(QLabel("Curve Between Points:"))
+        self.combo_interpolation = QComboBox()
+        self.combo_interpolation.addItems(list(INTERPOLATION_MODES.keys()))
+        self.combo_interpolation.setToolTip("Linear joins the distribution's tabulated points with straight lines;\n"
+                                            "smooth uses a monotone cubic, so intensity has no kinks at fine time steps.")
+        interp_layout.addWidget(self.combo_interpolation)
+        self.left_layout.addLayout(interp_layout)
+        
         self.lbl_pattern = QLabel("Distribution Pattern:")
         self.left_layout.addWidget(self.lbl_pattern)
         self.combo_pattern = QComboBox()
@@ -124,6 +242,17 @@ class MainWindow(QMainWindow):
         ])
         self.left_layout.addWidget(self.combo_pattern)
         
+        # Custom distribution source
+        self.lbl_custom_path = QLabel(f"Custom file: {self.custom_curve_path}")
+        self.lbl_custom_path.setWordWrap(True)
+        self.left_layout.addWidget(self.lbl_custom_path)
+        custom_layout = QHBoxLayout()
+        self.btn_custom_file = QPushButton("Custom File...")
+        self.btn_custom_folder = QPushButton("Load Folder...")
+        custom_layout.addWidget(self.btn_custom_file)
+        custom_layout.addWidget(self.btn_custom_folder)
+        self.left_layout.addLayout(custom_layout)
+        
         # Add a help tip regarding distributions
         self.lbl_dist_help = QLabel("<i>Note: NOAA Atlas 14 distributions (A/B/C/D) are site-specific. <br>Auto-Select uses the best standard proxy. <br>Use 'Custom' for exact regional data.</i>")
         self.lbl_dist_help.setWordWrap(True)
@@ -134,6 +263,17 @@ class MainWindow(QMainWindow):
         self.btn_generate.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 5px;")
         self.left_layout.addWidget(self.btn_generate)
         
+        self.chk_live_preview = QCheckBox("Live preview (update the shown storm as settings change)")
+        self.chk_live_preview.setChecked(True)
+        self.left_layout.addWidget(self.chk_live_preview)
+        
+        self.progress_generate = QProgressBar()
+        self.progress_generate.setRange(0, 100)
+        self.progress_generate.setTextVisible(False)
+        self.progress_generate.setFixedHeight(6)
+        self.progress_generate.hide()
+        self.left_layout.addWidget(self.progress_generate)
+        
         # Add attribution
         self.lbl_attribution = QLabel("Made by Aadi Bhattarai (aaditya.r.bhattarai@gmail.com)")
         self.lbl_attribution.setAlignment(Qt.AlignCenter)
@@ -157,31 +297,26 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.tab_map = MapWidget()
         
-        # Hyetograph Tab with Copy Button
-        self.graph_container = QWidget()
-        self.graph_layout = QVBoxLayout(self.graph_container)
-        self.btn_copy_graph = QPushButton("Copy Graph Image")
-        self.btn_copy_graph.setStyleSheet("padding: 2px; height: 25px;")
-        self.tab_graph = GraphWidget()
-        self.graph_layout.addWidget(self.btn_copy_graph)
-        self.graph_layout.addWidget(self.tab_graph)
-        
-        # IDF Tab with Copy Button
-        self.idf_container = QWidget()
-        self.idf_layout = QVBoxLayout(self.idf_container)
-        self.btn_copy_idf = QPushButton("Copy IDF Graph")
-        self.btn_copy_idf.setStyleSheet("padding: 2px; height: 25px;")
-        self.tab_idf = IDFWidget()
-        self.idf_layout.addWidget(self.btn_copy_idf)
-        self.idf_layout.addWidget(self.tab_idf)
+        # Plot tabs import matplotlib, so they are only built when first opened
+        self.tab_graph = None
+        self.tab_idf = None
+        self.graph_container = LazyTab(self._build_graph_tab)
+        self.idf_container = LazyTab(self._build_idf_tab)
+        self.tab_compare = None
+        self.compare_series = [] # (label, prepared plot arrays) overlaid on the Compare tab
+        self.compare_container = LazyTab(self._build_compare_tab)
         
         # Atlas 14 Tab with Copy Button
         self.atlas14_container = QWidget()
         self.atlas14_layout = QVBoxLayout(self.atlas14_container)
         self.btn_copy_atlas14 = QPushButton("Copy Atlas 14 Table")
         self.btn_copy_atlas14.setStyleSheet("padding: 2px; height: 25px;")
-        self.tab_atlas14 = QTableWidget()
-        self.atlas14_layout.addWidget(self.btn_copy_atlas14)
+        self.btn_export_atlas14 = QPushButton("Export Atlas 14 Table...")
+        self.btn_export_atlas14.setStyleSheet("padding: 2px; height: 25px;")
+        self.tab_atlas14 = self._make_table_view()
+        self.atlas14_model = ArrayTableModel(self)
+        self.tab_atlas14.setModel(self.atlas14_model)
+        self.atlas14_layout.addLayout(self._make_button_row(self.btn_copy_atlas14, self.btn_export_atlas14))
         self.atlas14_layout.addWidget(self.tab_atlas14)
         
         # Results Tab with Copy Button
@@ -189,8 +324,12 @@ class MainWindow(QMainWindow):
         self.results_layout = QVBoxLayout(self.results_container)
         self.btn_copy_results = QPushButton("Copy Results Table")
         self.btn_copy_results.setStyleSheet("padding: 2px; height: 25px;")
-        self.tab_table = QTableWidget()
-        self.results_layout.addWidget(self.btn_copy_results)
+        self.btn_export_results = QPushButton("Export Results Table...")
+        self.btn_export_results.setStyleSheet("padding: 2px; height: 25px;")
+        self.tab_table = self._make_table_view()
+        self.results_model = ArrayTableModel(self)
+        self.tab_table.setModel(self.results_model)
+        self.results_layout.addLayout(self._make_button_row(self.btn_copy_results, self.btn_export_results))
         self.results_layout.addWidget(self.tab_table)
         
         self.tabs.addTab(self.tab_map, "Map Selection")
@@ -198,6 +337,7 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.results_container, "Formatted Results")
         self.tabs.addTab(self.graph_container, "Hyetograph")
         self.tabs.addTab(self.idf_container, "IDF Curves")
+        self.tabs.addTab(self.compare_container, "Compare")
         
         self.layout.addWidget(self.left_panel)
         self.layout.addWidget(self.tabs)
@@ -206,6 +346,99 @@ class MainWindow(QMainWindow):
         self.is_dark_mode = False
         self._apply_theme()
 
+    def _init_menu(self):
+        file_menu = self.menuBar().addMenu("&File")
+        for text, shortcut, slot in (("&New Project", QKeySequence.New, self._on_new_project),
+                                     ("&Open Project...", QKeySequence.Open, self._on_open_project),
+                                     ("&Save Project", QKeySequence.Save, self._on_save_project),
+                                     ("Save Project &As...", QKeySequence.SaveAs,
+                                      lambda: self._on_save_project(save_as=True))):
+            action = QAction(text, self)
+            action.setShortcut(shortcut)
+            action.triggered.connect(slot)
+            file_menu.addAction(action)
+
+    def _build_graph_tab(self):
+        """Hyetograph Tab with Copy Button (built on first show)."""
+        from src.gui.graph_widget import GraphWidget
+        
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        self.btn_copy_graph = QPushButton("Copy Graph Image")
+        self.btn_copy_graph.setStyleSheet("padding: 2px; height: 25px;")
+        self.btn_copy_graph.clicked.connect(self._copy_graph_to_clipboard)
+        self.tab_graph = GraphWidget()
+        layout.addWidget(self.btn_copy_graph)
+        layout.addWidget(self.tab_graph)
+        
+        # Catch up on anything that happened before the tab existed
+        self.tab_graph.set_theme(self.is_dark_mode)
+        if self.last_generated is not None:
+            self.tab_graph.show_prepared(self.last_generated["plot"])
+        return container
+
+    def _build_idf_tab(self):
+        """IDF Tab with Copy Button (built on first show)."""
+        from src.gui.idf_widget import IDFWidget
+        
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        self.btn_copy_idf = QPushButton("Copy IDF Graph")
+        self.btn_copy_idf.setStyleSheet("padding: 2px; height: 25px;")
+        self.btn_copy_idf.clicked.connect(self._copy_idf_to_clipboard)
+        self.tab_idf = IDFWidget()
+        layout.addWidget(self.btn_copy_idf)
+        layout.addWidget(self.tab_idf)
+        
+        self.tab_idf.set_theme(self.is_dark_mode)
+        if self.fetched_data is not None:
+            self.tab_idf.plot_data(self.full_atlas_data, self._site_idf())
+        return container
+
+    def _build_compare_tab(self):
+        """Compare Tab: many storms overlaid on one canvas (built on first show)."""
+        from src.gui.compare_widget import CompareWidget
+        
+        container = QWidget()
+        layout = QVBoxLayout(container)
+        self.btn_compare_add = QPushButton("Add Current Storm")
+        self.btn_compare_patterns = QPushButton("Add All Patterns")
+        self.btn_compare_clear = QPushButton("Clear")
+        for button in (self.btn_compare_add, self.btn_compare_patterns, self.btn_compare_clear):
+            button.setStyleSheet("padding: 2px; height: 25px;")
+        self.btn_compare_add.clicked.connect(self._on_compare_add_clicked)
+        self.btn_compare_patterns.clicked.connect(self._on_compare_patterns_clicked)
+        self.btn_compare_clear.clicked.connect(self._on_compare_clear_clicked)
+        self.tab_compare = CompareWidget()
+        layout.addLayout(self._make_button_row(self.btn_compare_add, self.btn_compare_patterns, self.btn_compare_clear))
+        layout.addWidget(self.tab_compare)
+        
+        self.tab_compare.set_theme(self.is_dark_mode)
+        self.tab_compare.set_series(self.compare_series)
+        return container
+
+    def closeEvent(self, event):
+        # Abort in-flight fetches so no worker outlives the window
+        self.prefetch_timer.stop()
+        self.tasks.shutdown()
+        self.fetch_cache.close()
+        self.project.close()
+        super().closeEvent(event)
+
+    def _make_button_row(self, *buttons):
+        row = QHBoxLayout()
+        for button in buttons:
+            row.addWidget(button)
+        return row
+
+    def _make_table_view(self):
+        view = QTableView()
+        # Fixed row heights and sampled column sizing keep the view O(visible rows)
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(22)
+        view.horizontalHeader().setResizeContentsPrecision(50)
+        return view
+
     def _make_line(self):
         line = QWidget()
         line.setFixedHeight(1)
@@ -214,60 +447,85 @@ class MainWindow(QMainWindow):
 
     def _connect_signals(self):
         self.tab_map.location_selected.connect(self._on_map_location)
+        self.tab_map.cached_site_selected.connect(self._on_cached_site_selected)
         self.btn_fetch.clicked.connect(self._on_fetch_clicked)
         self.btn_generate.clicked.connect(self._on_generate_clicked)
         self.btn_theme.clicked.connect(self._toggle_theme)
         self.input_lat.valueChanged.connect(self._update_coords_label)
         self.input_lon.valueChanged.connect(self._update_coords_label)
+        self.input_lat.valueChanged.connect(self._schedule_prefetch)
+        self.input_lon.valueChanged.connect(self._schedule_prefetch)
+        self.prefetch_timer.timeout.connect(self._start_prefetch)
         self.combo_return_period.currentTextChanged.connect(self._update_display_values)
-        self.btn_copy_results.clicked.connect(lambda: self._copy_table_to_clipboard(self.tab_table))
-        self.btn_copy_atlas14.clicked.connect(lambda: self._copy_table_to_clipboard(self.tab_atlas14))
-        self.btn_copy_graph.clicked.connect(self._copy_graph_to_clipboard)
-        self.btn_copy_idf.clicked.connect(self._copy_idf_to_clipboard)
+        self.btn_copy_results.clicked.connect(lambda: self._copy_table_to_clipboard(self.results_model))
+        self.btn_copy_atlas14.clicked.connect(lambda: self._copy_table_to_clipboard(self.atlas14_model))
+        self.btn_export_results.clicked.connect(lambda: self._export_table(self.results_model, "stormgen_results"))
+        self.btn_export_atlas14.clicked.connect(lambda: self._export_table(self.atlas14_model, "atlas14_depths"))
+        self.combo_duration.currentTextChanged.connect(self._on_duration_changed)
         self.combo_pattern.currentTextChanged.connect(self._on_pattern_changed)
+        self.btn_custom_file.clicked.connect(self._on_custom_file_clicked)
+        self.btn_custom_folder.clicked.connect(self._on_custom_folder_clicked)
+        self.preview_timer.timeout.connect(self._update_preview)
+        self.input_depth.valueChanged.connect(self._schedule_preview)
+        for combo in (self.combo_pattern, self.combo_time_step, self.combo_duration, self.combo_return_period,
+                      self.combo_interpolation):
+            combo.currentTextChanged.connect(self._schedule_preview)
+
+    def _on_duration_changed(self, text):
+        tail = OUTPUT_DURATIONS[text] - 24.0
+        if tail > 0:
+            self.lbl_note_48h.setText(f"<b>Note:</b> Output includes an additional {tail:g}h tail of zero rainfall ({OUTPUT_DURATIONS[text]:g}h total duration).")
+        else:
+            self.lbl_note_48h.setText("<b>Note:</b> Output covers the 24h storm only (no zero-rainfall tail).")
 
     def _on_pattern_changed(self, text):
-        if text.startswith("Custom"):
+        if text.startswith("Custom (Paste Table)"):
             QMessageBox.information(self, "Custom Distribution", 
                 "You have selected 'Custom'.\n\n"
-                "Please edit the 'custom.csv' file in the project folder to set your distribution.\n"
+                f"The distribution is read from '{self.custom_curve_path}'. "
+                "Edit that file or use 'Custom File...' to choose another one.\n"
                 "Format: hours, cum. unit rain\n"
                 "Example: 12.0, 0.50")
 
-    def _load_custom_csv(self):
-        import csv
-        import os
+    def _on_custom_file_clicked(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Select Custom Distribution", 
+                                              self.custom_curve_path, "CSV Files (*.csv);;All Files (*)")
+        if not path:
+            return
+        try:
+            self.custom_loader.load(path)
+        except CustomCurveError as e:
+            QMessageBox.critical(self, "CSV Error", f"Failed to read {path}:\n{str(e)}")
+            return
+        self.custom_curve_path = path
+        self.lbl_custom_path.setText(f"Custom file: {path}")
+        self.combo_pattern.setCurrentText("Custom (Paste Table)")
+
+    def _on_custom_folder_clicked(self):
+        folder = QFileDialog.getExistingDirectory(self, "Select Folder of Custom Distributions")
+        if not folder:
+            return
+        try:
+            curves, errors = self.custom_loader.load_folder(folder)
+        except CustomCurveError as e:
+            QMessageBox.critical(self, "Custom Distributions", str(e))
+            return
+        for path, compiled in curves.items():
+            if compiled.name not in self.custom_curve_files:
+                self.combo_pattern.addItem(compiled.name)
+            self.custom_curve_files[compiled.name] = path
         
-        file_path = "custom.csv"
-        if not os.path.exists(file_path):
-            QMessageBox.critical(self, "File Not Found", f"Could not find '{file_path}'. Please ensure it exists in the project root.")
-            return None
-            
-        custom_data = {}
+        msg = f"Loaded {len(curves)} custom distribution(s)."
+        if errors:
+            msg += "\n\nSkipped:\n" + "\n".join(f"{os.path.basename(p)}: {e}" for p, e in errors.items())
+        QMessageBox.information(self, "Custom Distributions", msg)
+
+    def _load_custom_csv(self, pattern="Custom (Paste Table)"):
+        file_path = self.custom_curve_files.get(pattern, self.custom_curve_path)
         try:
-            with open(file_path, 'r') as f:
-                reader = csv.reader(f)
-                header = next(reader, None) # Skip header
-                for row in reader:
-                    if not row or len(row) < 2: continue
-                    try:
-                        h = float(row[0])
-                        f_val = float(row[1])
-                        custom_data[h] = f_val
-                    except ValueError:
-                        continue
-            
-            if not custom_data:
-                raise ValueError("No valid data found in CSV.")
-            
-            # Ensure 0.0 and 24.0 are present
-            if 0.0 not in custom_data: custom_data[0.0] = 0.0
-            if 24.0 not in custom_data: custom_data[24.0] = 1.0
-            
-            return custom_data
-            
-        except Exception as e:
-            QMessageBox.critical(self, "CSV Error", f"Failed to read custom.csv:\n{str(e)}")
+            return self.custom_loader.load(file_path)
+        except CustomCurveError as e:
+            QMessageBox.critical(self, "CSV Error", f"Failed to read {file_path}:\n{str(e)}")
             return None
 
     def _toggle_theme(self):
@@ -305,7 +563,7 @@ class MainWindow(QMainWindow):
                     border-radius: 4px; 
                 }}
                 QPushButton:hover {{ background-color: #0b5ed7; }}
-                QTableWidget {{ 
+                QTableView {{ 
                     background-color: {input_bg}; 
                     color: {fg_color}; 
                     gridline-color: {border_color};
@@ -365,7 +623,7 @@ class MainWindow(QMainWindow):
                     border-radius: 4px; 
                 }}
                 QPushButton:hover {{ background-color: #0b5ed7; }}
-                QTableWidget {{ background-color: white; alternate-background-color: #f2f2f2; }}
+                QTableView {{ background-color: white; alternate-background-color: #f2f2f2; }}
             """)
             
             # Specific Widgets
@@ -376,8 +634,13 @@ class MainWindow(QMainWindow):
             
             self.setStyleSheet(self.styleSheet() + f" QWidget#separator_line {{ background-color: #ccc; }}")
             
-        # Update child widgets
-        self.tab_graph.set_theme(self.is_dark_mode)
+        # Update child widgets (plot tabs pick up the theme when they are built)
+        if self.tab_graph is not None:
+            self.tab_graph.set_theme(self.is_dark_mode)
+        if self.tab_idf is not None:
+            self.tab_idf.set_theme(self.is_dark_mode)
+        if self.tab_compare is not None:
+            self.tab_compare.set_theme(self.is_dark_mode)
         self.tab_map.set_theme(self.is_dark_mode)
         
         # Update btn_generate specifically if needed (it overrides the global QPushButton style)
@@ -387,9 +650,75 @@ class MainWindow(QMainWindow):
         self.input_lat.setValue(lat)
         self.input_lon.setValue(lon)
 
+    def _site_region(self, d60m, d24h):
+        """Region letter ("A"-"D") for the overlay, from the 25-yr depth ratio."""
+        type_name, _ = self.generator.suggest_type(self.generator.calculate_ratio(d60m, d24h))
+        return type_name[-1]
+
+    def _load_site_overlay(self):
+        """Draws every site in the persistent fetch cache on the map."""
+        points = []
+        for lat, lon, d60m, d24h in self.fetch_cache.sites():
+            if d60m is None or d24h is None:
+                continue
+            self.overlay_keys.add(site_key(lat, lon))
+            points.append((lat, lon, self._site_region(d60m, d24h), d24h))
+        self.tab_map.set_cached_sites(points)
+
+    def _on_site_cached(self, lat, lon, data):
+        """Adds a newly fetched site to the map overlay."""
+        key = site_key(lat, lon)
+        d60m, d24h = data.get("60m_25yr"), data.get("24h_25yr")
+        if key in self.overlay_keys or d60m is None or d24h is None:
+            return
+        self.overlay_keys.add(key)
+        self.tab_map.add_cached_site(lat, lon, self._site_region(d60m, d24h), d24h)
+
+    def _on_cached_site_selected(self, lat, lon):
+        """A cached site was clicked on the map: load it straight from the cache."""
+        data = self.fetch_cache.get(lat, lon)
+        site = self.project.site(lat, lon)
+        if data is None and site is not None:
+            try:
+                data = site.data() # Only in the open project file (e.g. made on another machine)
+            except ProjectError as e:
+                QMessageBox.critical(self, "Open Error", str(e))
+                return
+        self.input_lat.setValue(lat)
+        self.input_lon.setValue(lon)
+        if data is None:
+            self._on_fetch_clicked() # Evicted from disk in the meantime; fetch normally
+            return
+        self.prefetch_timer.stop()
+        self.tasks.cancel("prefetch")
+        self.tasks.cancel("fetch")
+        self._on_fetch_success(data, lat, lon)
+
     def _update_coords_label(self):
         pass # Optional logic
 
+    def _schedule_prefetch(self):
+        # Restarting the timer debounces map clicks and typing
+        self.prefetch_timer.start()
+
+    def _start_prefetch(self):
+        """Fetches the settled location in the background so Fetch finds it cached."""
+        lat = self.input_lat.value()
+        lon = self.input_lon.value()
+        if lat == 0 and lon == 0:
+            return
+        if self.fetch_cache.state(lat, lon) is not None:
+            return # Already cached or being fetched
+        key = site_key(lat, lon)
+        if key in self.fetch_errors:
+            return # Don't keep retrying a cell NOAA rejected; Fetch will report it
+        
+        # Superseding the previous prefetch aborts it unless a Fetch is waiting on it
+        self.prefetch_key = key
+        self.tasks.submit("prefetch", fetch_site, self.fetch_cache, lat, lon,
+                          on_result=lambda data: self._on_site_cached(lat, lon, data),
+                          on_error=lambda msg: self.fetch_errors.__setitem__(key, msg))
+
     def _on_fetch_clicked(self):
         lat = self.input_lat.value()
         lon = self.input_lon.value()
@@ -401,18 +730,34 @@ class MainWindow(QMainWindow):
         # Update map to reflect manually entered coordinates (as requested by user)
         self.tab_map.set_marker_location(lat, lon)
             
-        self.btn_fetch.setEnabled(False)
+        # A prefetch for another cell is no longer useful
+        self.prefetch_timer.stop()
+        if self.prefetch_key != site_key(lat, lon):
+            self.tasks.cancel("prefetch")
+        
+        # Same grid cell already fetched (or prefetched): no thread, no network
+        cached = self.fetch_cache.get(lat, lon)
+        if cached is not None:
+            self.tasks.cancel("fetch")
+            self._on_fetch_success(cached, lat, lon)
+            return
+        
         self.btn_fetch.setText("Fetching...")
         self.lbl_results.setText("Fetching data from NOAA Atlas 14...")
         
-        self.worker = FetchWorker(lat, lon)
-        self.worker.result_ready.connect(self._on_fetch_success)
-        self.worker.error_occurred.connect(self._on_fetch_error)
-        self.worker.start()
+        # A newer click supersedes the previous one; a stale request for another
+        # cell is aborted, one for the same cell is joined rather than repeated
+        key = site_key(lat, lon)
+        self.fetch_errors.pop(key, None)
+        self.tasks.submit("fetch", fetch_site, self.fetch_cache, lat, lon,
+                          on_result=lambda data: self._on_fetch_success(data, lat, lon),
+                          on_error=lambda msg: self._on_fetch_error(msg, key))
 
-    def _on_fetch_success(self, data):
-        self.btn_fetch.setEnabled(True)
+    def _on_fetch_success(self, data, lat, lon):
         self.btn_fetch.setText("Fetch NOAA Data")
+        self._on_site_cached(lat, lon, data)
+        self.current_site = (lat, lon)
+        self.project.add_site(lat, lon, data)
         
         self.fetched_data = data
         self.full_atlas_data = data.get("full_data", {}) # Store the full dataset
@@ -423,29 +768,25 @@ class MainWindow(QMainWindow):
         # Populate Atlas 14 Table
         self._populate_atlas14_table(self.full_atlas_data)
         
-        # Plot IDF Curves
-        self.tab_idf.plot_data(self.full_atlas_data)
+        # Plot IDF Curves (or leave it to the tab once it is first opened)
+        if self.tab_idf is not None:
+            self.tab_idf.plot_data(self.full_atlas_data, self._site_idf())
         
+    def _site_idf(self):
+        """Fitted IDF equations for the current site (cached with its data), or None."""
+        try:
+            return IDFCurves.for_site(self.fetched_data)
+        except ValueError:
+            return None
+
     def _update_display_values(self):
         if not self.fetched_data or not hasattr(self, 'full_atlas_data'):
             return
             
         rp_text = self.combo_return_period.currentText()
-        try:
-            rp = int(rp_text.replace("yr", ""))
-        except ValueError:
-            rp = 25 # Default fallback
-            
-        # Retrieve values from full data
-        # Note: keys in atlas14.py might include '60-min' and '24-hr'
-        d60m = self.full_atlas_data.get("60-min", {}).get(rp, 0.0)
-        d24h = self.full_atlas_data.get("24-hr", {}).get(rp, 0.0)
-        
-        # If not found (e.g. 1000yr might be missing in some regions), fallback or show 0
-        
-        # Calculate Ratio
-        ratio = self.generator.calculate_ratio(d60m, d24h)
-        type_name, proxy_name = self.generator.suggest_type(ratio)
+        # Missing depths (e.g. 1000yr in some regions) show as 0
+        rp, d60m, d24h, ratio, type_name, proxy_name = select_region(
+            self.fetched_data, parse_return_period(rp_text, default=25))
         
         # Update Results Label
         info = (f"<b>Fetched Data ({rp_text}):</b><br>"
@@ -467,95 +808,265 @@ class MainWindow(QMainWindow):
             if index >= 0:
                 self.combo_pattern.setCurrentIndex(index)
 
-    def _on_fetch_error(self, error_msg):
-        self.btn_fetch.setEnabled(True)
+    def _on_fetch_error(self, error_msg, key=None):
+        if key is not None:
+            self.fetch_errors[key] = error_msg
         self.btn_fetch.setText("Fetch NOAA Data")
         self.lbl_results.setText(f"<font color='red'>Error: {error_msg}</font>")
         QMessageBox.critical(self, "Fetch Error", f"Failed to fetch data:\n{error_msg}")
 
-    def _on_generate_clicked(self):
-        depth = self.input_depth.value()
+    def _selected_pattern(self, warn=True):
+        """The pattern to generate, with Auto-Select resolved; None if it needs fetched data."""
         pattern = self.combo_pattern.currentText()
-        
         if pattern.startswith("Auto-Select"):
             # Recalculate if still on auto
-            if self.fetched_data and hasattr(self, 'full_atlas_data'):
-                 # Get current RP
-                 rp_text = self.combo_return_period.currentText()
-                 try:
-                     rp = int(rp_text.replace("yr", ""))
-                 except ValueError:
-                     rp = 25
-
-                 d60m = self.full_atlas_data.get("60-min", {}).get(rp, 0.0)
-                 d24h = self.full_atlas_data.get("24-hr", {}).get(rp, 0.0)
-                 
-                 ratio = self.generator.calculate_ratio(d60m, d24h)
-                 _, proxy_name = self.generator.suggest_type(ratio)
-                 pattern = proxy_name
-            elif self.fetched_data:
-                 # Fallback
-                 d60m = self.fetched_data["60m_25yr"]
-                 d24h = self.fetched_data["24h_25yr"]
-                 ratio = self.generator.calculate_ratio(d60m, d24h)
-                 _, proxy_name = self.generator.suggest_type(ratio)
-                 pattern = proxy_name
+            if self.fetched_data:
+                rp = parse_return_period(self.combo_return_period.currentText(), default=25)
+                pattern = select_region(self.fetched_data, rp).pattern
             else:
-                QMessageBox.warning(self, "No Data", "Please fetch data first for Auto-Select.")
-                return
+                if warn:
+                    QMessageBox.warning(self, "No Data", "Please fetch data first for Auto-Select.")
+                return None
+        return pattern
+
+    def _on_generate_clicked(self):
+        self.preview_timer.stop()
+        self.tasks.cancel("preview")
+        depth = self.input_depth.value()
+        pattern = self._selected_pattern()
+        if pattern is None:
+            return
 
         # Check if Custom
         custom_curve = None
         if pattern.startswith("Custom"):
-            custom_curve = self._load_custom_csv()
+            custom_curve = self._load_custom_csv(pattern)
             if not custom_curve:
                 return # Error message already shown in _load_custom_csv
 
+        # Latest request wins: submitting cancels any generation still in flight
+        label = self._storm_label(pattern, depth)
+        self.progress_generate.setValue(0)
+        self.progress_generate.show()
+        self.tasks.submit("generate", build_storm, self.generator, depth, pattern, custom_curve,
+                          TIME_STEPS[self.combo_time_step.currentText()],
+                          OUTPUT_DURATIONS[self.combo_duration.currentText()],
+                          self.tab_graph.display_bins() if self.tab_graph is not None else 2000,
+                          INTERPOLATION_MODES[self.combo_interpolation.currentText()],
+                          on_result=lambda storm: self._on_generate_finished(dict(storm, label=label)),
+                          on_error=self._on_generate_error,
+                          on_progress=self.progress_generate.setValue)
+
+    def _on_generate_finished(self, storm):
+        self.progress_generate.hide()
+        if self.current_site is not None:
+            self.project.add_storm(*self.current_site, storm)
+        self._remember_preview(storm)
+        self._show_storm(storm)
+
+    def _schedule_preview(self, *args):
+        if self.chk_live_preview.isChecked() and self.last_generated is not None:
+            self.preview_timer.start()
+
+    def _remember_preview(self, storm):
+        if "time_step" not in storm:
+            return
+        key = (storm["pattern"], storm["time_step"], storm["duration"], storm["interpolation"])
+        self.preview_storms[key] = storm
+        self.preview_storms.move_to_end(key)
+        while len(self.preview_storms) > PREVIEW_CACHE_SIZE:
+            self.preview_storms.popitem(last=False)
+
+    def _update_preview(self):
+        """
+        Re-shows the current storm for the edited settings. A depth change only
+        rescales the shown arrays; a pattern/step/length seen before is rescaled
+        from its cached storm, and anything new is generated in the background.
+        The project keeps only storms made with Generate.
+        """
+        if self.last_generated is None:
+            return
+        depth = self.input_depth.value()
+        pattern = self._selected_pattern(warn=False)
+        if pattern is None or pattern.startswith("Custom"):
+            return # Custom curves are read from disk; regenerate those explicitly
+        time_step = TIME_STEPS[self.combo_time_step.currentText()]
+        duration = OUTPUT_DURATIONS[self.combo_duration.currentText()]
+        interpolation = INTERPOLATION_MODES[self.combo_interpolation.currentText()]
+        
+        key = (pattern, time_step, duration, interpolation)
+        shown = self.last_generated
+        if tuple(shown.get(k) for k in ("pattern", "time_step", "duration", "interpolation")) == key:
+            base = shown
+        else:
+            base = self.preview_storms.get(key)
+        storm = rescale_storm(base, depth) if base is not None else None
+        if storm is not None:
+            storm["label"] = self._storm_label(pattern, depth)
+            self._show_preview(storm)
+            return
+        
+        label = self._storm_label(pattern, depth)
+        self.tasks.submit("preview", build_storm, self.generator, depth, pattern, None, time_step, duration,
+                          self.tab_graph.display_bins() if self.tab_graph is not None else 2000, interpolation,
+                          on_result=lambda storm: self._on_preview_finished(dict(storm, label=label)),
+                          on_error=lambda msg: None) # Generate reports errors; a preview just keeps the old storm
+
+    def _on_preview_finished(self, storm):
+        self._remember_preview(storm)
+        self._show_preview(storm)
+
+    def _show_preview(self, storm):
+        """Swaps a previewed storm into the existing table and plot (no tab switch)."""
+        self.last_generated = storm
+        if self.results_model.rowCount() == len(storm["hours"]):
+            self.results_model.update_columns([storm[key] for _, key in RESULT_COLUMNS])
+        else:
+            self._populate_results_table(storm)
+        if self.tab_graph is not None:
+            self.tab_graph.show_prepared(storm["plot"])
+
+    def _show_storm(self, storm):
+        self.last_generated = storm # Store for unit toggling re-plot
+
+        # Populate Table (model-backed: cells are formatted only when painted)
+        self._populate_results_table(storm)
+        
+        # Plot Graph
+        if self.tab_graph is not None:
+            self.tab_graph.show_prepared(storm["plot"])
+        
+        self.tabs.setCurrentIndex(2) # Switch to Graph tab
+
+    def _project_settings(self):
+        return {"return_period": self.combo_return_period.currentText(),
+                "pattern": self.combo_pattern.currentText(),
+                "time_step": self.combo_time_step.currentText(),
+                "duration": self.combo_duration.currentText(),
+                "interpolation": self.combo_interpolation.currentText(),
+                "depth": self.input_depth.value()}
+
+    def _apply_project_settings(self, settings):
+        for combo, key in ((self.combo_return_period, "return_period"), (self.combo_pattern, "pattern"),
+                           (self.combo_time_step, "time_step"), (self.combo_duration, "duration"),
+                           (self.combo_interpolation, "interpolation")):
+            if combo.findText(settings.get(key, "")) >= 0:
+                combo.setCurrentText(settings[key])
+        if "depth" in settings:
+            self.input_depth.setValue(settings["depth"])
+
+    def _on_new_project(self):
+        self.project.close()
+        self.project = Project()
+        self.setWindowTitle("StormGen: Automated NOAA Rainfall Distribution Tool")
+
+    def _on_save_project(self, save_as=False):
+        path = self.project.path
+        if save_as or not path:
+            path, _ = QFileDialog.getSaveFileName(self, "Save Project", f"project{PROJECT_EXTENSION}",
+                                                  f"StormGen Project (*{PROJECT_EXTENSION})")
+            if not path:
+                return
+        self.project.settings = self._project_settings()
         try:
-            df = self.generator.generate(depth, pattern, custom_curve=custom_curve)
-            
-            # Calculate MM columns
-            df["Incremental Rainfall (mm)"] = df["Incremental Rainfall (in)"] * 25.4
-            df["Cumulative Rainfall (mm)"] = df["Cumulative Rainfall (in)"] * 25.4
-            
-            # Reorder columns for display
-            display_cols = ["Date", "Time", "Hours", 
-                            "Incremental Rainfall (in)", "Cumulative Rainfall (in)",
-                            "Incremental Rainfall (mm)", "Cumulative Rainfall (mm)"]
-            
-            # Ensure df has these columns (Time/Date/Hours are standard from generator)
-            # The generator returns: Date, Time, Hours, Incremental Rainfall (in), Cumulative Rainfall (in)
-            
-            self.last_generated_df = df # Store for unit toggling re-plot
+            self.project.save(path)
+        except (OSError, ProjectError) as e:
+            QMessageBox.critical(self, "Save Error", f"Failed to save {path}:\n{str(e)}")
+            return
+        self.setWindowTitle(f"StormGen - {os.path.basename(path)}")
 
-            # Populate Table
-            self.tab_table.setRowCount(len(df))
-            self.tab_table.setColumnCount(len(display_cols))
-            self.tab_table.setHorizontalHeaderLabels(display_cols)
-            
-            for i, row in df.iterrows():
-                # We need to access by column name to match display_cols order
-                for j, col_name in enumerate(display_cols):
-                    val = row[col_name]
-                    # Format floats
-                    if isinstance(val, (float, int)):
-                         if "Time" in col_name or "Hours" in col_name:
-                             item = QTableWidgetItem(str(val))
-                         else:
-                             item = QTableWidgetItem(f"{val:.4f}")
-                    else:
-                        item = QTableWidgetItem(str(val))
-                    self.tab_table.setItem(i, j, item)
-            
-            self.tab_table.resizeColumnsToContents()
-            
-            # Plot Graph
-            self.tab_graph.plot_data(df)
-            
-            self.tabs.setCurrentIndex(2) # Switch to Graph tab
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Generation Error", str(e))
+    def _on_open_project(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Project", "",
+                                              f"StormGen Project (*{PROJECT_EXTENSION});;All Files (*)")
+        if path:
+            self.open_project(path)
+
+    def open_project(self, path):
+        """Opens a project file. Only the current site's arrays are read now."""
+        try:
+            project = Project.open(path)
+        except (OSError, ProjectError, ValueError) as e:
+            QMessageBox.critical(self, "Open Error", f"Failed to open {path}:\n{str(e)}")
+            return
+        self.project.close()
+        self.project = project
+        self.setWindowTitle(f"StormGen - {os.path.basename(path)}")
+        self._apply_project_settings(project.settings)
+        
+        # Every site goes on the map from its manifest summary, without loading it
+        for site in project.sites.values():
+            self._on_site_cached(site.lat, site.lon, site.summary)
+        
+        site = project.sites.get(project.current)
+        if site is None:
+            return
+        self.prefetch_timer.stop()
+        self.tasks.cancel("prefetch")
+        self.tasks.cancel("fetch")
+        self.input_lat.setValue(site.lat)
+        self.input_lon.setValue(site.lon)
+        self.tab_map.set_marker_location(site.lat, site.lon)
+        try:
+            data, storms = site.data(), site.storms()
+        except ProjectError as e:
+            QMessageBox.critical(self, "Open Error", f"Failed to open {path}:\n{str(e)}")
+            return
+        self._on_fetch_success(data, site.lat, site.lon)
+        
+        if storms:
+            stored = storms[-1]
+            storm = dict(stored, incremental_mm=stored["incremental"] * 25.4,
+                         cumulative_mm=stored["cumulative"] * 25.4)
+            storm["plot"] = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"],
+                                           self.tab_graph.display_bins() if self.tab_graph is not None else 2000)
+            self._show_storm(storm)
+
+    def _storm_label(self, pattern, depth):
+        """Legend text for a storm in the compare view."""
+        label = f"{pattern}, {depth:.2f} in"
+        if self.fetched_data:
+            label += f" ({self.combo_return_period.currentText()} @ {self.input_lat.value():.3f}, {self.input_lon.value():.3f})"
+        return label
+
+    def _set_compare_series(self, series):
+        self.compare_series = series
+        if self.tab_compare is not None:
+            self.tab_compare.set_series(series)
+
+    def _on_compare_add_clicked(self):
+        if self.last_generated is None:
+            QMessageBox.warning(self, "No Storm", "Generate a storm first, then add it to the comparison.")
+            return
+        storm = self.last_generated
+        self._set_compare_series(self.compare_series + [(storm["label"], storm["plot"])])
+
+    def _on_compare_patterns_clicked(self):
+        """Adds every built-in pattern at the current depth, step and duration."""
+        patterns = [self.combo_pattern.itemText(i) for i in range(self.combo_pattern.count())]
+        patterns = [p for p in patterns if not p.startswith(("Auto-Select", "Custom"))]
+        self.tasks.submit("compare", build_pattern_set, self.generator, self.input_depth.value(), patterns,
+                          TIME_STEPS[self.combo_time_step.currentText()],
+                          OUTPUT_DURATIONS[self.combo_duration.currentText()],
+                          max(500, self.tab_compare.canvas.width()),
+                          INTERPOLATION_MODES[self.combo_interpolation.currentText()],
+                          on_result=lambda series: self._set_compare_series(self.compare_series + series),
+                          on_error=self._on_generate_error)
+
+    def _on_compare_clear_clicked(self):
+        self._set_compare_series([])
+
+    def _on_generate_error(self, error_msg):
+        self.progress_generate.hide()
+        QMessageBox.critical(self, "Generation Error", error_msg)
+
+    def _populate_results_table(self, storm):
+        """Points the results model at the generated arrays (no per-cell work)."""
+        formatters = {"Date": format_storm_date, "Time": format_storm_time, "Hours": format_hours}
+        headers = [header for header, _ in RESULT_COLUMNS]
+        columns = [storm[key] for _, key in RESULT_COLUMNS]
+        formats = [formatters.get(header, format_fixed(4)) for header in headers]
+        self.results_model.set_columns(headers, columns, formats)
+        self.tab_table.resizeColumnsToContents()
 
     def _populate_atlas14_table(self, data_map):
         """
@@ -586,62 +1097,49 @@ class MainWindow(QMainWindow):
         first_dur = available_durations[0]
         return_periods = sorted([int(rp) for rp in data_map[first_dur].keys()])
         
-        # Setup Table
-        self.tab_atlas14.setRowCount(len(available_durations))
-        self.tab_atlas14.setColumnCount(len(return_periods))
+        # Depth matrix (durations x return periods), NaN where NOAA has no value
+        depths = np.array([[data_map[dur].get(rp, np.nan) for rp in return_periods]
+                           for dur in available_durations], dtype=float)
         
-        # Set Headers
         info_header = [f"{rp}-yr" for rp in return_periods]
-        self.tab_atlas14.setHorizontalHeaderLabels(info_header)
-        self.tab_atlas14.setVerticalHeaderLabels(available_durations)
-        
-        # Fill Data
-        for row_idx, dur in enumerate(available_durations):
-            row_data = data_map[dur]
-            for col_idx, rp in enumerate(return_periods):
-                val = row_data.get(rp, "")
-                if isinstance(val, (int, float)):
-                    item = QTableWidgetItem(f"{val:.3f}")
-                    item.setTextAlignment(Qt.AlignCenter)
-                    self.tab_atlas14.setItem(row_idx, col_idx, item)
-                else:
-                    self.tab_atlas14.setItem(row_idx, col_idx, QTableWidgetItem(""))
+        self.atlas14_model.set_columns(info_header,
+                                       [depths[:, j] for j in range(len(return_periods))],
+                                       [format_fixed(3)] * len(return_periods),
+                                       row_headers=available_durations,
+                                       alignment=Qt.AlignCenter)
         
         self.tab_atlas14.resizeColumnsToContents()
 
-    def _copy_table_to_clipboard(self, table):
-        """Copies the contents of a QTableWidget to the clipboard in TSV format."""
-        if table.rowCount() == 0:
+    def _copy_table_to_clipboard(self, model):
+        """
+        Copies the full table model to the clipboard as TSV plus an HTML table,
+        built straight from the column arrays (not from what is rendered).
+        """
+        if model.rowCount() == 0:
             return
 
-        text = ""
-        # Add Headers
-        headers = []
-        for j in range(table.columnCount()):
-            headers.append(str(table.horizontalHeaderItem(j).text()) if table.horizontalHeaderItem(j) else "")
-        
-        if table == self.tab_atlas14:
-            # Add vertical header if it's the Atlas 14 table (Durations)
-            text += "\t" + "\t".join(headers) + "\n"
-            for i in range(table.rowCount()):
-                row_label = table.verticalHeaderItem(i).text() if table.verticalHeaderItem(i) else ""
-                row_data = []
-                for j in range(table.columnCount()):
-                    item = table.item(i, j)
-                    row_data.append(item.text() if item else "")
-                text += row_label + "\t" + "\t".join(row_data) + "\n"
-        else:
-            text += "\t".join(headers) + "\n"
-            for i in range(table.rowCount()):
-                row_data = []
-                for j in range(table.columnCount()):
-                    item = table.item(i, j)
-                    row_data.append(item.text() if item else "")
-                text += "\t".join(row_data) + "\n"
-
-        QApplication.clipboard().setText(text)
+        tsv, html_table = clipboard_payloads(model)
+        mime = QMimeData()
+        mime.setText(tsv)
+        mime.setHtml(html_table)
+        QApplication.clipboard().setMimeData(mime)
         QMessageBox.information(self, "Copied", "Table data copied to clipboard.")
 
+    def _export_table(self, model, default_name):
+        """Saves the full table model to CSV, TSV or Excel."""
+        if model.rowCount() == 0:
+            QMessageBox.warning(self, "No Data", "There is nothing to export yet.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(self, "Export Table", f"{default_name}.csv",
+                                              "CSV Files (*.csv);;Tab-Separated (*.tsv);;Excel Workbook (*.xlsx)")
+        if not path:
+            return
+        try:
+            write_table(model, path)
+        except Exception as e:
+            QMessageBox.critical(self, "Export Error", f"Failed to write {path}:\n{str(e)}")
+
     def _copy_graph_to_clipboard(self):
         """Captures the graph widget as an image and copies it to the clipboard."""
         # Grab the canvas widget specifically for a clean capture
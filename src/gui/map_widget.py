@@ -1,20 +1,120 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from PyQt5.QtWebEngineWidgets import QWebEngineView
-from PyQt5.QtCore import pyqtSignal, QUrl
+from PyQt5.QtWebEngineCore import QWebEngineUrlScheme, QWebEngineUrlSchemeHandler, QWebEngineUrlRequestJob
+from PyQt5.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply
+from PyQt5.QtCore import pyqtSignal, QUrl, QBuffer, QByteArray, QTimer
 import jinja2
+import json
 import os
+from src.utils.tile_cache import TileCache, TILE_SOURCES, USER_AGENT, content_type
+
+# Leaflet is bundled so the map works offline and starts without a CDN round trip
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Tiles are requested as stormtile://<source>/<z>/<x>/<y> and served from the disk cache
+TILE_SCHEME = b"stormtile"
+
+# Region letters as indexed by the page's REGION_NAMES / REGION_COLORS
+OVERLAY_REGIONS = "ABCD"
+
+def register_tile_scheme():
+    """Registers the tile URL scheme. Must run before the QApplication is created."""
+    scheme = QWebEngineUrlScheme(TILE_SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(QWebEngineUrlScheme.SecureScheme |
+                    QWebEngineUrlScheme.LocalAccessAllowed |
+                    QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+class TileSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Answers stormtile:// requests from the TileCache, downloading (asynchronously)
+    and storing tiles that are not cached yet.
+    """
+
+    def __init__(self, cache, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.network = QNetworkAccessManager(self)
+
+    def requestStarted(self, job):
+        url = job.requestUrl()
+        source = url.host()
+        try:
+            z, x, y = (int(part) for part in url.path().strip("/").split("/"))
+        except ValueError:
+            job.fail(QWebEngineUrlRequestJob.UrlInvalid)
+            return
+        if source not in TILE_SOURCES:
+            job.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            return
+
+        data = self.cache.get(source, z, x, y)
+        if data is not None:
+            self._reply(job, data)
+            return
+
+        request = QNetworkRequest(QUrl(self.cache.remote_url(source, z, x, y)))
+        request.setRawHeader(b"User-Agent", USER_AGENT.encode())
+        reply = self.network.get(request)
+        reply.finished.connect(lambda: self._on_downloaded(job, reply, source, z, x, y))
+
+    def _on_downloaded(self, job, reply, source, z, x, y):
+        reply.deleteLater()
+        ok = reply.error() == QNetworkReply.NoError
+        data = bytes(reply.readAll()) if ok else b""
+        if ok and data:
+            try:
+                self.cache.put(source, z, x, y, data)
+            except OSError as e:
+                print(f"Error caching tile: {e}")
+        try:
+            if ok and data:
+                self._reply(job, data)
+            else:
+                job.fail(QWebEngineUrlRequestJob.RequestFailed)
+        except RuntimeError:
+            pass # The page dropped the request (e.g. panned away) before it finished
+
+    def _reply(self, job, data):
+        buffer = QBuffer(job)
+        buffer.setData(QByteArray(data))
+        job.reply(content_type(data).encode(), buffer)
 
 class MapWidget(QWidget):
     location_selected = pyqtSignal(float, float)  # Signal emitting lat, lon
+    cached_site_selected = pyqtSignal(float, float)  # A cached-site dot was clicked
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self.layout = QVBoxLayout(self)
         self.layout.setContentsMargins(0, 0, 0, 0)
         
+        # The web view (and its browser process) is created just after the widget is
+        # first shown, so the main window paints without waiting for Chromium
+        self.web_view = None
+        self._view_scheduled = False
+        self.tile_cache = TileCache()
+        self.tile_handler = TileSchemeHandler(self.tile_cache, self)
+        
+        # Scripts issued before the page has loaded are queued and run once it has
+        self._page_ready = False
+        self._pending_js = []
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._view_scheduled:
+            self._view_scheduled = True
+            QTimer.singleShot(0, self._create_view)
+
+    def _create_view(self):
         self.web_view = QWebEngineView()
         self.layout.addWidget(self.web_view)
         
+        # Serve map tiles from the on-disk cache
+        self.web_view.page().profile().installUrlSchemeHandler(TILE_SCHEME, self.tile_handler)
+        self.web_view.loadFinished.connect(self._on_load_finished)
+        
         self._init_map()
 
     def _init_map(self):
@@ -27,28 +127,31 @@ class MapWidget(QWidget):
             <title>Map</title>
             <meta charset="utf-8" />
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
-            <link rel="stylesheet" href="https://unpkg.com/leaflet@1.7.1/dist/leaflet.css" />
-            <script src="https://unpkg.com/leaflet@1.7.1/dist/leaflet.js"></script>
+            <link rel="stylesheet" href="leaflet/leaflet.css" />
+            <script src="leaflet/leaflet.js"></script>
             <style>
                 html, body { margin: 0; padding: 0; height: 100%; width: 100%; overflow: hidden; }
                 #map { position: absolute; top: 0; bottom: 0; left: 0; right: 0; }
+                .cached-legend { background: rgba(255, 255, 255, 0.85); padding: 4px 8px; border-radius: 4px; font: 12px sans-serif; line-height: 18px; }
+                .cached-legend i { display: inline-block; width: 10px; height: 10px; border-radius: 5px; margin-right: 4px; }
             </style>
         </head>
         <body>
             <div id="map"></div>
             <script>
                 // Define Base Layers
-                var osm = L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+                // Tiles go through the stormtile:// disk cache (see TileSchemeHandler)
+                var osm = L.tileLayer('stormtile://osm/{z}/{x}/{y}', {
                     maxZoom: 19,
                     attribution: '© OpenStreetMap contributors'
                 });
 
-                var satellite_img = L.tileLayer('https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}', {
+                var satellite_img = L.tileLayer('stormtile://esri_imagery/{z}/{x}/{y}', {
                     maxZoom: 19,
                     attribution: 'Tiles &copy; Esri &mdash; Source: Esri, i-cubed, USDA, USGS, AEX, GeoEye, Getmapping, Aerogrid, IGN, IGP, UPR-EGP, and the GIS User Community'
                 });
 
-                var satellite_labels = L.tileLayer('https://server.arcgisonline.com/ArcGIS/rest/services/Reference/World_Boundaries_and_Places/MapServer/tile/{z}/{y}/{x}', {
+                var satellite_labels = L.tileLayer('stormtile://esri_labels/{z}/{x}/{y}', {
                     maxZoom: 19,
                     attribution: 'Esri'
                 });
@@ -73,6 +176,12 @@ class MapWidget(QWidget):
 
                 // Handle map clicks
                 function onMapClick(e) {
+                    // Clicking a cached site loads it from the cache instead of refetching
+                    var i = cachedSites.hitTest(e.containerPoint);
+                    if (i >= 0) {
+                        selectCachedSite(i);
+                        return;
+                    }
                     updateMarker(e.latlng);
                 }
 
@@ -86,16 +195,172 @@ class MapWidget(QWidget):
                 }
 
                 map.on('click', onMapClick);
+
+                // ---- Cached sites overlay ----
+                // All cached sites are drawn on one canvas (no DOM element per site),
+                // with a pixel grid for hit testing, so tens of thousands stay responsive.
+                var REGION_NAMES = ['A', 'B', 'C', 'D'];
+                var REGION_COLORS = ['#2b83ba', '#1a9641', '#fdae61', '#d7191c'];
+                var LABEL_MIN_ZOOM = 9;   // Depth labels only once zoomed in...
+                var LABEL_MAX_COUNT = 400; // ...and only while few sites are in view
+                var HIT_CELL = 16;
+
+                var CachedSitesLayer = L.Layer.extend({
+                    initialize: function () {
+                        this._data = []; // Flat [lat, lon, region, depth, ...]
+                        this._grid = {};
+                    },
+                    onAdd: function (map) {
+                        this._canvas = L.DomUtil.create('canvas', 'leaflet-zoom-hide');
+                        this._canvas.style.pointerEvents = 'none';
+                        map.getPanes().overlayPane.appendChild(this._canvas);
+                        map.on('moveend resize', this._redraw, this);
+                        this._redraw();
+                    },
+                    onRemove: function (map) {
+                        L.DomUtil.remove(this._canvas);
+                        map.off('moveend resize', this._redraw, this);
+                    },
+                    setData: function (flat) {
+                        this._data = flat;
+                        this._redraw();
+                    },
+                    addSite: function (lat, lon, region, depth) {
+                        this._data.push(lat, lon, region, depth);
+                        this._redraw();
+                    },
+                    _redraw: function () {
+                        if (!this._map) { return; }
+                        var map = this._map, size = map.getSize(), data = this._data;
+                        L.DomUtil.setPosition(this._canvas, map.containerPointToLayerPoint([0, 0]));
+                        this._canvas.width = size.x;
+                        this._canvas.height = size.y;
+                        var ctx = this._canvas.getContext('2d');
+                        var bounds = map.getBounds().pad(0.05);
+                        var south = bounds.getSouth(), north = bounds.getNorth();
+                        var west = bounds.getWest(), east = bounds.getEast();
+                        var radius = map.getZoom() >= LABEL_MIN_ZOOM ? 6 : 4;
+                        var grid = {}, visible = [];
+
+                        ctx.lineWidth = 1;
+                        ctx.strokeStyle = '#ffffff';
+                        for (var i = 0; i < data.length; i += 4) {
+                            var lat = data[i], lon = data[i + 1];
+                            if (lat < south || lat > north || lon < west || lon > east) { continue; }
+                            var p = map.latLngToContainerPoint([lat, lon]);
+                            ctx.beginPath();
+                            ctx.arc(p.x, p.y, radius, 0, 2 * Math.PI);
+                            ctx.fillStyle = REGION_COLORS[data[i + 2]];
+                            ctx.fill();
+                            ctx.stroke();
+                            var cell = Math.floor(p.x / HIT_CELL) + ':' + Math.floor(p.y / HIT_CELL);
+                            (grid[cell] = grid[cell] || []).push(i);
+                            visible.push(i, p.x, p.y);
+                        }
+                        this._grid = grid;
+
+                        if (map.getZoom() >= LABEL_MIN_ZOOM && visible.length / 3 <= LABEL_MAX_COUNT) {
+                            ctx.font = 'bold 11px sans-serif';
+                            ctx.lineWidth = 3;
+                            ctx.strokeStyle = 'rgba(255, 255, 255, 0.9)';
+                            ctx.fillStyle = '#222222';
+                            for (var j = 0; j < visible.length; j += 3) {
+                                var text = data[visible[j] + 3].toFixed(2) + '"';
+                                ctx.strokeText(text, visible[j + 1] + radius + 2, visible[j + 2] + 4);
+                                ctx.fillText(text, visible[j + 1] + radius + 2, visible[j + 2] + 4);
+                            }
+                        }
+                    },
+                    // Returns the data index of the site drawn under a container point, or -1
+                    hitTest: function (point) {
+                        var best = -1, bestDist = 8 * 8;
+                        var cx = Math.floor(point.x / HIT_CELL), cy = Math.floor(point.y / HIT_CELL);
+                        for (var dx = -1; dx <= 1; dx++) {
+                            for (var dy = -1; dy <= 1; dy++) {
+                                var bucket = this._grid[(cx + dx) + ':' + (cy + dy)] || [];
+                                for (var k = 0; k < bucket.length; k++) {
+                                    var i = bucket[k];
+                                    var p = this._map.latLngToContainerPoint([this._data[i], this._data[i + 1]]);
+                                    var d = (p.x - point.x) * (p.x - point.x) + (p.y - point.y) * (p.y - point.y);
+                                    if (d <= bestDist) { best = i; bestDist = d; }
+                                }
+                            }
+                        }
+                        return best;
+                    }
+                });
+
+                var cachedSites = new CachedSitesLayer().addTo(map);
+                var cachedTip = L.tooltip({direction: 'top', offset: [0, -6]});
+                var selectSeq = 0;
+
+                function setCachedSites(flat) { cachedSites.setData(flat); }
+                function addCachedSite(lat, lon, region, depth) { cachedSites.addSite(lat, lon, region, depth); }
+
+                function selectCachedSite(i) {
+                    var lat = cachedSites._data[i], lon = cachedSites._data[i + 1];
+                    if (marker) {
+                        map.removeLayer(marker);
+                    }
+                    marker = L.marker([lat, lon]).addTo(map);
+                    // The sequence number makes repeated clicks on one site change the title
+                    document.title = "CACHED:" + lat + "," + lon + "," + (++selectSeq);
+                }
+
+                map.on('mousemove', function (e) {
+                    var i = cachedSites.hitTest(e.containerPoint);
+                    if (i < 0) {
+                        map.closeTooltip(cachedTip);
+                        map.getContainer().style.cursor = '';
+                        return;
+                    }
+                    var data = cachedSites._data;
+                    cachedTip.setLatLng([data[i], data[i + 1]])
+                        .setContent('Region ' + REGION_NAMES[data[i + 2]] + '<br>24-hr (25-yr): ' + data[i + 3].toFixed(2) + ' in');
+                    map.openTooltip(cachedTip);
+                    map.getContainer().style.cursor = 'pointer';
+                });
+
+                var legend = L.control({position: 'bottomright'});
+                legend.onAdd = function () {
+                    var div = L.DomUtil.create('div', 'cached-legend');
+                    var html = '<b>Cached sites</b>';
+                    for (var r = 0; r < REGION_NAMES.length; r++) {
+                        html += '<br><i style="background:' + REGION_COLORS[r] + '"></i>Region ' + REGION_NAMES[r];
+                    }
+                    div.innerHTML = html;
+                    return div;
+                };
+                legend.addTo(map);
             </script>
         </body>
         </html>
         """
         
-        self.web_view.setHtml(map_html)
+        # Base URL lets the page load the bundled Leaflet files by relative path
+        self.web_view.setHtml(map_html, QUrl.fromLocalFile(ASSETS_DIR + os.sep))
         self.web_view.titleChanged.connect(self._on_title_changed)
 
+    def _on_load_finished(self, ok):
+        self._page_ready = True
+        pending, self._pending_js = self._pending_js, []
+        for js_code in pending:
+            self.web_view.page().runJavaScript(js_code)
+
+    def _run_js(self, js_code):
+        if self._page_ready:
+            self.web_view.page().runJavaScript(js_code)
+        else:
+            self._pending_js.append(js_code)
+
     def _on_title_changed(self, title):
-        if title.startswith("LOC:"):
+        if title.startswith("CACHED:"):
+            try:
+                lat, lon = (float(v) for v in title.split(":")[1].split(",")[:2])
+                self.cached_site_selected.emit(lat, lon)
+            except Exception as e:
+                print(f"Error parsing coordinates: {e}")
+        elif title.startswith("LOC:"):
             try:
                 coords = title.split(":")[1].split(",")
                 lat = float(coords[0])
@@ -109,23 +374,43 @@ class MapWidget(QWidget):
             # Simple CSS filter for dark mode on the map tiles
             # Inverts colors and rotates hue to make it look like a dark map
             js_filter = "document.querySelector('.leaflet-tile-pane').style.filter = 'invert(100%) hue-rotate(180deg) brightness(95%) contrast(90%)';"
-            self.web_view.page().runJavaScript(js_filter)
+            self._run_js(js_filter)
         else:
             js_filter = "document.querySelector('.leaflet-tile-pane').style.filter = 'none';"
-            self.web_view.page().runJavaScript(js_filter)
+            self._run_js(js_filter)
+
+    def set_cached_sites(self, sites):
+        """
+        Replaces the cached-sites overlay.
+
+        Args:
+            sites (iterable): (lat, lon, region letter "A"-"D", 24-hr depth) tuples.
+        """
+        flat = []
+        for lat, lon, region, depth in sites:
+            flat.extend((round(lat, 5), round(lon, 5), OVERLAY_REGIONS.index(region), round(depth, 3)))
+        # One compact array literal; the page draws it in a single canvas pass
+        self._run_js(f"setCachedSites({json.dumps(flat, separators=(',', ':'))});")
+
+    def add_cached_site(self, lat, lon, region, depth):
+        """Adds one newly fetched site to the overlay."""
+        self._run_js(f"addCachedSite({round(lat, 5)}, {round(lon, 5)}, "
+                     f"{OVERLAY_REGIONS.index(region)}, {round(depth, 3)});")
 
-    def set_marker_location(self, lat, lon):
+    def set_marker_location(self, lat, lon, zoom=12):
         """
         Updates the map view and places a marker at the given coordinates.
         This is called when the user manually enters coordinates and clicks Fetch.
+        With zoom=None the current view is kept.
         """
+        set_view = f"map.setView(newLatLng, {int(zoom)}); // Zoom in for better context" if zoom is not None else ""
         js_code = f"""
             var newLatLng = new L.LatLng({lat}, {lon});
             if (marker) {{
                 map.removeLayer(marker);
             }}
             marker = L.marker(newLatLng).addTo(map);
-            map.setView(newLatLng, 12); // Zoom in to level 12 for better context
+            {set_view}
             // We do NOT update document.title here to avoid a feedback loop
         """
-        self.web_view.page().runJavaScript(js_code)
+        self._run_js(js_code)
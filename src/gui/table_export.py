@@ -0,0 +1,63 @@
+import csv
+import html
+import io
+
+def _table_rows(model, include_row_headers=True):
+    """Yields the header row then every data row of `model` as lists of strings."""
+    headers = model.headers()
+    row_headers = model.row_headers() if include_row_headers else None
+    columns = model.formatted_columns()
+    if row_headers is not None:
+        headers = [""] + headers
+        columns = [row_headers] + columns
+    yield headers
+    yield from zip(*columns)
+
+def table_to_tsv(model, rows=None):
+    """Formats the whole model as tab-separated text in a single buffer."""
+    rows = _table_rows(model) if rows is None else rows
+    return "\n".join("\t".join(row) for row in rows) + "\n"
+
+def table_to_html(model, rows=None):
+    """Formats the whole model as an HTML table (the format Excel reads from the clipboard)."""
+    rows = iter(_table_rows(model) if rows is None else rows)
+    headers = next(rows)
+    parts = ["<table><tr>", "".join(f"<th>{html.escape(h)}</th>" for h in headers), "</tr>"]
+    parts.extend("<tr><td>" + "</td><td>".join(html.escape(cell) for cell in row) + "</td></tr>" for row in rows)
+    parts.append("</table>")
+    return "".join(parts)
+
+def clipboard_payloads(model):
+    """Returns (tsv, html) for the clipboard, formatting the columns only once."""
+    rows = list(_table_rows(model))
+    return table_to_tsv(model, rows), table_to_html(model, rows)
+
+def write_table(model, path):
+    """
+    Writes the model to `path`. The format follows the extension:
+    .csv (comma), .tsv/.txt (tab) or .xlsx (numeric cells kept as numbers).
+    """
+    lower = path.lower()
+    if lower.endswith(".xlsx"):
+        _write_xlsx(model, path)
+        return
+
+    buffer = io.StringIO()
+    if lower.endswith(".csv"):
+        csv.writer(buffer, lineterminator="\n").writerows(_table_rows(model))
+    else:
+        buffer.write(table_to_tsv(model))
+    with open(path, "w", newline="") as f:
+        f.write(buffer.getvalue())
+
+def _write_xlsx(model, path):
+    import pandas as pd
+    data = {}
+    formatted = model.formatted_columns()
+    row_headers = model.row_headers()
+    if row_headers is not None:
+        data[""] = row_headers
+    for j, header in enumerate(model.headers()):
+        # Keep real numbers for numeric columns, formatted text otherwise (Date/Time)
+        data[header] = model.column_array(j) if model.column_format(j).numeric else formatted[j]
+    pd.DataFrame(data).to_excel(path, index=False)
@@ -0,0 +1,162 @@
+import datetime
+from abc import ABC, abstractmethod
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+from src.core.generator import STORM_START
+
+_STORM_START = datetime.datetime.fromisoformat(STORM_START)
+_STORM_START_64 = np.datetime64(_STORM_START, "s")
+
+class ColumnFormat(ABC):
+    """
+    Formats one table column. Calling the object formats a single cell for the view;
+    bulk() formats a whole column array at once for copy/export.
+    """
+    numeric = True # False when the column array is not the displayed value (e.g. dates)
+
+    @abstractmethod
+    def __call__(self, val):
+        """Formats one cell."""
+
+    def bulk(self, values):
+        return [self(v) for v in values]
+
+class FixedFormat(ColumnFormat):
+    """Floats with a fixed number of decimals ('' for NaN)."""
+
+    def __init__(self, decimals):
+        self.spec = f"%.{decimals}f"
+
+    def __call__(self, val):
+        return "" if val != val else self.spec % val
+
+    def bulk(self, values):
+        spec = self.spec
+        return ["" if v != v else spec % v for v in np.asarray(values, dtype=float).tolist()]
+
+class HoursFormat(ColumnFormat):
+    def __call__(self, val):
+        return str(round(float(val), 4))
+
+    def bulk(self, values):
+        return [str(v) for v in np.round(np.asarray(values, dtype=float), 4).tolist()]
+
+class StormDateTimeFormat(ColumnFormat):
+    """Date or time of day for a storm hour offset (rounded to the second)."""
+    numeric = False
+
+    def __init__(self, part):
+        self.part = part # "date" or "time"
+
+    def __call__(self, val):
+        stamp = _STORM_START + datetime.timedelta(seconds=round(float(val) * 3600.0))
+        return str(stamp.date() if self.part == "date" else stamp.time())
+
+    def bulk(self, values):
+        seconds = np.round(np.asarray(values, dtype=float) * 3600.0).astype("timedelta64[s]")
+        stamps = np.datetime_as_string(_STORM_START_64 + seconds, unit="s")
+        date_part, _, time_part = np.char.partition(stamps, "T").T
+        return (date_part if self.part == "date" else time_part).tolist()
+
+def format_fixed(decimals):
+    """Returns a formatter that renders floats with a fixed number of decimals ('' for NaN)."""
+    return FixedFormat(decimals)
+
+format_hours = HoursFormat()
+format_storm_date = StormDateTimeFormat("date")
+format_storm_time = StormDateTimeFormat("time")
+
+class ArrayTableModel(QAbstractTableModel):
+    """
+    Read-only table model backed directly by numpy column arrays.
+
+    Nothing is formatted up front: the view only asks for the cells it is painting,
+    so populating the table costs the same for 50 rows or 50,000.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers = []
+        self._columns = []
+        self._formats = []
+        self._row_headers = None
+        self._alignment = None
+        self._n_rows = 0
+
+    def set_columns(self, headers, columns, formats, row_headers=None, alignment=None):
+        """
+        Replaces the table contents.
+
+        Args:
+            headers (list[str]): Column titles.
+            columns (list[np.ndarray]): One 1-D array per column, all the same length.
+            formats (list[ColumnFormat]): One formatter per column (see format_fixed etc.).
+            row_headers (list[str], optional): Vertical header labels (defaults to row numbers).
+            alignment (Qt.Alignment, optional): Text alignment applied to every cell.
+        """
+        self.beginResetModel()
+        self._headers = list(headers)
+        self._columns = [np.asarray(c) for c in columns]
+        self._formats = list(formats)
+        self._row_headers = list(row_headers) if row_headers is not None else None
+        self._alignment = alignment
+        self._n_rows = len(self._columns[0]) if self._columns else 0
+        self.endResetModel()
+
+    def update_columns(self, columns):
+        """
+        Swaps in new arrays for the same columns. When the row count is unchanged
+        the view keeps its scroll position and selection and just repaints.
+        """
+        columns = [np.asarray(c) for c in columns]
+        n_rows = len(columns[0]) if columns else 0
+        if len(columns) != len(self._columns) or n_rows != self._n_rows:
+            self.set_columns(self._headers, columns, self._formats, self._row_headers, self._alignment)
+            return
+        self._columns = columns
+        if n_rows:
+            self.dataChanged.emit(self.index(0, 0), self.index(n_rows - 1, len(columns) - 1), [Qt.DisplayRole])
+
+    def clear(self):
+        self.set_columns([], [], [])
+
+    def headers(self):
+        return list(self._headers)
+
+    def row_headers(self):
+        return list(self._row_headers) if self._row_headers is not None else None
+
+    def column_array(self, col):
+        return self._columns[col]
+
+    def column_format(self, col):
+        return self._formats[col]
+
+    def formatted_columns(self):
+        """Returns every column formatted in bulk (one list of str per column), for copy/export."""
+        return [fmt.bulk(col) for col, fmt in zip(self._columns, self._formats)]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._n_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        if role == Qt.DisplayRole:
+            col = index.column()
+            return self._formats[col](self._columns[col][index.row()])
+        if role == Qt.TextAlignmentRole and self._alignment is not None:
+            return int(self._alignment)
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else QVariant()
+        if self._row_headers is not None:
+            return self._row_headers[section] if section < len(self._row_headers) else QVariant()
+        return str(section + 1)
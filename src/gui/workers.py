@@ -0,0 +1,145 @@
+import itertools
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+class TaskCancelled(Exception):
+    """Raised inside a task when its CancelToken has been cancelled."""
+
+class CancelToken:
+    """Cooperative cancellation flag shared between the GUI and one task."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        """Raises TaskCancelled if the task should stop. Call between work stages."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+class WorkerSignals(QObject):
+    progress = pyqtSignal(int, int)       # request id, percent
+    result_ready = pyqtSignal(int, object)
+    error_occurred = pyqtSignal(int, str)
+    finished = pyqtSignal(int)
+
+class Task(QRunnable):
+    """
+    Runs fn(token, report_progress, *args, **kwargs) on a thread pool.
+    Results of cancelled tasks are never emitted.
+    """
+
+    def __init__(self, request_id, fn, *args, **kwargs):
+        super().__init__()
+        self.request_id = request_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.token = CancelToken()
+        self.signals = WorkerSignals()
+
+    def report_progress(self, percent):
+        if not self.token.cancelled:
+            self.signals.progress.emit(self.request_id, int(percent))
+
+    def run(self):
+        try:
+            if self.token.cancelled:
+                return
+            result = self.fn(self.token, self.report_progress, *self.args, **self.kwargs)
+            if not self.token.cancelled:
+                self.signals.result_ready.emit(self.request_id, result)
+        except TaskCancelled:
+            pass
+        except Exception as e:
+            if not self.token.cancelled:
+                self.signals.error_occurred.emit(self.request_id, str(e))
+        finally:
+            self.signals.finished.emit(self.request_id)
+
+class TaskRunner(QObject):
+    """
+    Dispatches Tasks to a shared QThreadPool, grouped into named channels.
+
+    Submitting to a channel cancels whatever that channel was running before,
+    so only the latest request's callbacks ever fire ("latest wins").
+    Callbacks always run on the GUI thread.
+    """
+
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._ids = itertools.count(1)
+        self._latest = {}    # channel -> Task
+        self._callbacks = {} # request id -> (on_result, on_error, on_progress)
+        self._tasks = {}     # request id -> Task (kept alive until finished)
+
+    def submit(self, channel, fn, *args, on_result=None, on_error=None, on_progress=None, **kwargs):
+        """
+        Queues fn(token, report_progress, *args, **kwargs) on the pool.
+
+        Returns:
+            int: The request id of the new task.
+        """
+        self.cancel(channel)
+
+        request_id = next(self._ids)
+        task = Task(request_id, fn, *args, **kwargs)
+        task.signals.result_ready.connect(self._on_result)
+        task.signals.error_occurred.connect(self._on_error)
+        task.signals.progress.connect(self._on_progress)
+        task.signals.finished.connect(self._on_finished)
+
+        self._latest[channel] = task
+        self._callbacks[request_id] = (on_result, on_error, on_progress)
+        self._tasks[request_id] = task
+        self.pool.start(task)
+        return request_id
+
+    def cancel(self, channel):
+        """Cancels the channel's current task, if any. Its callbacks will not fire."""
+        task = self._latest.pop(channel, None)
+        if task is not None:
+            task.token.cancel()
+            self._callbacks.pop(task.request_id, None)
+
+    def shutdown(self, timeout_ms=3000):
+        """Cancels every channel and waits briefly for running tasks to wind down."""
+        for channel in list(self._latest):
+            self.cancel(channel)
+        self.pool.waitForDone(timeout_ms)
+
+    def is_busy(self, channel):
+        return channel in self._latest
+
+    @pyqtSlot(int, object)
+    def _on_result(self, request_id, result):
+        on_result = self._callbacks.get(request_id, (None, None, None))[0]
+        if on_result:
+            on_result(result)
+
+    @pyqtSlot(int, str)
+    def _on_error(self, request_id, message):
+        on_error = self._callbacks.get(request_id, (None, None, None))[1]
+        if on_error:
+            on_error(message)
+
+    @pyqtSlot(int, int)
+    def _on_progress(self, request_id, percent):
+        on_progress = self._callbacks.get(request_id, (None, None, None))[2]
+        if on_progress:
+            on_progress(percent)
+
+    @pyqtSlot(int)
+    def _on_finished(self, request_id):
+        self._callbacks.pop(request_id, None)
+        task = self._tasks.pop(request_id, None)
+        for channel, latest in list(self._latest.items()):
+            if latest is task:
+                del self._latest[channel]
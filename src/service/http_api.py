@@ -0,0 +1,271 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+import numpy as np
+from src.core.api import parse_return_period, select_region
+from src.core.atlas14 import PFDSHTTPError
+from src.core.fetch_cache import FetchCache, site_key
+from src.core.generator import RainfallGenerator
+from src.core.idf import IDFCurves
+from src.utils.paths import app_data_dir
+
+DEFAULT_PORT = 8750
+
+# Largest batch accepted in one request body
+MAX_BATCH = 1000
+
+# Bounds on one generated series: at most a week at 1-minute steps (10,080 values)
+MIN_TIME_STEP_MIN = 1.0
+MAX_DURATION_HR = 168.0
+
+class RequestError(ValueError):
+    """Bad request parameters (answered with HTTP 400)."""
+
+class UpstreamError(RuntimeError):
+    """The NOAA fetch behind a request failed (answered with HTTP 502)."""
+
+def _float(params, name, default=None):
+    value = params.get(name, default)
+    if value is None:
+        raise RequestError(f"Missing parameter: {name}")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise RequestError(f"Parameter {name} must be a number, got {value!r}")
+
+def _return_period(params):
+    try:
+        return parse_return_period(params.get("return_period", 25))
+    except ValueError as e:
+        raise RequestError(str(e))
+
+def _flag(params, name, default=True):
+    value = params.get(name, default)
+    if isinstance(value, str):
+        return value.lower() not in ("0", "false", "no")
+    return bool(value)
+
+class StormService:
+    """
+    The service's operations on plain dicts, independent of HTTP: site frequency
+    data, region suggestion and hyetograph generation. Every request shares one
+    FetchCache, so repeated and concurrent requests for a grid cell fetch it once.
+    """
+
+    def __init__(self, cache=None, generator=None, workers=8):
+        self.cache = cache or FetchCache()
+        self.generator = generator or RainfallGenerator()
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stormgen-batch")
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+        self.cache.close()
+
+    def _site_data(self, params):
+        lat = _float(params, "lat")
+        lon = _float(params, "lon")
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180):
+            raise RequestError("lat/lon out of range")
+        try:
+            return lat, lon, self.cache.fetch(lat, lon)
+        except Exception as e:
+            raise UpstreamError(str(e)) from e
+
+    def site(self, params):
+        """Atlas 14 depth table and fitted IDF equations for lat/lon."""
+        lat, lon, data = self._site_data(params)
+        result = {"lat": lat, "lon": lon, "site_key": list(site_key(lat, lon)),
+                  "60m_25yr": data["60m_25yr"], "24h_25yr": data["24h_25yr"],
+                  "depths": {dur: {str(rp): d for rp, d in row.items()} for dur, row in data["full_data"].items()}}
+        try:
+            result["idf"] = IDFCurves.for_site(data).to_dict()
+        except ValueError:
+            pass
+        return result
+
+    def _depths_for(self, data, rp):
+        full = data["full_data"]
+        d60m = full.get("60-min", {}).get(rp)
+        d24h = full.get("24-hr", {}).get(rp)
+        if d60m is None or d24h is None:
+            raise RequestError(f"No {rp}-yr depths published for this site")
+        return d60m, d24h
+
+    def suggest(self, params):
+        """Region and pattern from the 60-min/24-hr ratio, given depths or a site."""
+        rp = _return_period(params)
+        if "d60m" in params or "d24h" in params:
+            d60m, d24h = _float(params, "d60m"), _float(params, "d24h")
+            ratio = self.generator.calculate_ratio(d60m, d24h)
+            region, pattern = self.generator.suggest_type(ratio)
+            return {"return_period": rp, "d60m": d60m, "d24h": d24h, "ratio": ratio,
+                    "region": region, "pattern": pattern}
+        _, _, data = self._site_data(params)
+        self._depths_for(data, rp)
+        return select_region(data, rp)._asdict()
+
+    def generate(self, params, raw=False):
+        """
+        Design storm series. Depth is taken from the request or, with lat/lon, the
+        site's 24-hr depth at return_period; pattern "auto" (default) picks the region.
+
+        Series are rounded lists for JSON, or the generator's float arrays with raw=True.
+        """
+        rp = _return_period(params)
+        pattern = params.get("pattern", "auto")
+        data = None
+        if "lat" in params or "lon" in params:
+            _, _, data = self._site_data(params)
+
+        if "depth" in params:
+            depth = _float(params, "depth")
+            if not (np.isfinite(depth) and depth > 0):
+                raise RequestError(f"depth must be a positive number, got {depth:g}")
+        elif data is not None:
+            depth = self._depths_for(data, rp)[1]
+        else:
+            raise RequestError("Give either depth or lat/lon")
+
+        if str(pattern).lower() == "auto":
+            if data is None:
+                raise RequestError("pattern 'auto' needs lat/lon")
+            self._depths_for(data, rp)
+            pattern = select_region(data, rp).pattern
+
+        time_step = _float(params, "time_step_min", 6) / 60.0
+        duration = _float(params, "duration_hr", 48)
+        # Comparisons are written so NaN fails them too
+        if not time_step * 60.0 >= MIN_TIME_STEP_MIN:
+            raise RequestError(f"time_step_min must be at least {MIN_TIME_STEP_MIN:g}")
+        if not 0 < duration <= MAX_DURATION_HR:
+            raise RequestError(f"duration_hr must be positive and at most {MAX_DURATION_HR:g}")
+        interpolation = params.get("interpolation", "linear")
+        try:
+            storm = self.generator.generate_arrays(depth, pattern, time_step=time_step, duration=duration,
+                                                   interpolation=interpolation)
+        except ValueError as e:
+            raise RequestError(str(e))
+
+        result = {"pattern": pattern, "depth": depth, "return_period": rp,
+                  "time_step_min": time_step * 60.0, "duration_hr": duration,
+                  "interpolation": interpolation,
+                  "peak_intensity_in_hr": float(storm["incremental"].max() / time_step)}
+        if _flag(params, "series"):
+            for key in ("hours", "incremental", "cumulative"):
+                result[key] = storm[key] if raw else np.round(storm[key], 6).tolist()
+        return result
+
+    def stats(self, params=None):
+        return self.cache.stats()
+
+    def run(self, operation, body):
+        """
+        Runs one request (dict) or a batch (list of dicts). Batch items run
+        concurrently on the service pool; failures are reported per item.
+        """
+        if isinstance(body, list):
+            if len(body) > MAX_BATCH:
+                raise RequestError(f"Batch too large ({len(body)} > {MAX_BATCH})")
+            return list(self.pool.map(lambda item: self._run_item(operation, item), body))
+        if not isinstance(body, dict):
+            raise RequestError("Request body must be a JSON object or a list of objects")
+        return operation(body)
+
+    def _run_item(self, operation, item):
+        try:
+            if not isinstance(item, dict):
+                raise RequestError("Batch items must be JSON objects")
+            return operation(item)
+        except Exception as e:
+            return {"error": str(e)}
+
+class StormRequestHandler(BaseHTTPRequestHandler):
+    # Keep-alive lets clients reuse one connection for many requests
+    protocol_version = "HTTP/1.1"
+    quiet = False
+
+    def _routes(self):
+        service = self.server.service
+        return {"/site": service.site, "/suggest": service.suggest,
+                "/generate": service.generate, "/stats": service.stats}
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        self._dispatch(url.path, dict(parse_qsl(url.query)))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            self._send(400, {"error": f"Invalid JSON body: {e}"})
+            return
+        self._dispatch(url.path, body)
+
+    def _dispatch(self, path, body):
+        operation = self._routes().get(path.rstrip("/") or "/")
+        if operation is None:
+            self._send(404, {"error": f"Unknown endpoint {path}", "endpoints": sorted(self._routes())})
+            return
+        try:
+            self._send(200, self.server.service.run(operation, body))
+        except RequestError as e:
+            self._send(400, {"error": str(e)})
+        except (UpstreamError, PFDSHTTPError) as e:
+            # NOAA unreachable, rejected location, etc.
+            self._send(502, {"error": str(e)})
+        except Exception as e:
+            self._send(500, {"error": f"Internal error: {e}"})
+
+    def _send(self, status, payload):
+        try:
+            data = json.dumps(payload, allow_nan=False).encode("utf-8")
+        except ValueError as e:
+            # NaN/Infinity would make the body invalid JSON
+            status, data = 500, json.dumps({"error": f"Internal error: {e}"}).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, service=None, quiet=False):
+    """
+    Builds (but does not start) the HTTP server. Each connection is handled on
+    its own thread; call serve_forever() to run it.
+    """
+    handler = type("Handler", (StormRequestHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.service = service or StormService()
+    return server
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run StormGen as a local HTTP/JSON service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=8, help="Threads for batch request items")
+    parser.add_argument("--memory-cache", action="store_true",
+                        help="Don't use (or fill) the on-disk site cache shared with the desktop app")
+    parser.add_argument("--quiet", action="store_true", help="Don't log every request")
+    args = parser.parse_args()
+
+    db_path = None if args.memory_cache else os.path.join(app_data_dir("cache"), "atlas14.sqlite")
+    service = StormService(FetchCache(db_path=db_path), workers=args.workers)
+    server = make_server(args.host, args.port, service, quiet=args.quiet)
+    print(f"StormGen service on http://{args.host}:{server.server_port} (endpoints: /site /suggest /generate /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
@@ -0,0 +1,140 @@
+import json
+import os
+import sys
+import time
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from src.core.fetch_cache import FetchCache
+from src.service.http_api import StormService
+from src.utils.paths import app_data_dir
+
+# Job records are JSON objects, one per line:
+#   {"id": "site-17", "op": "generate", "lat": 29.76, "lon": -95.37, "return_period": 100}
+# "op" is one of the service operations (site, suggest, generate; default generate) and
+# the remaining keys are its parameters (see src.service.http_api). Each job produces
+#   {"id": ..., "line": n, "result": {...}}  or  {"id": ..., "line": n, "error": "..."}
+# in completion order; "line" is the 1-based input line for matching results to jobs,
+# and a job's lat/lon are copied into its record.
+
+DEFAULT_OP = "generate"
+
+def _operations(service, raw_series=False):
+    generate = (lambda params: service.generate(params, raw=True)) if raw_series else service.generate
+    return {"site": service.site, "suggest": service.suggest, "generate": generate}
+
+def _run_job(operations, line_no, text):
+    job_id = None
+    try:
+        job = json.loads(text)
+        if not isinstance(job, dict):
+            raise ValueError("Job must be a JSON object")
+        job_id = job.get("id")
+        op = job.get("op", DEFAULT_OP)
+        if op not in operations:
+            raise ValueError(f"Unknown op {op!r} (expected one of {', '.join(sorted(operations))})")
+        params = {k: v for k, v in job.items() if k not in ("id", "op")}
+        record = {"id": job_id, "line": line_no}
+        if "lat" in params and "lon" in params:
+            record["lat"], record["lon"] = params["lat"], params["lon"]
+        record["result"] = operations[op](params)
+        return record
+    except Exception as e:
+        return {"id": job_id, "line": line_no, "error": str(e)}
+
+def _to_dataset(dataset, record):
+    """Moves a generate result's series out of the record and into the storm dataset."""
+    result = record.get("result")
+    if not isinstance(result, dict) or "hours" not in result:
+        return
+    dataset.add({"lat": record.get("lat", np.nan), "lon": record.get("lon", np.nan),
+                 "return_period": result["return_period"], "pattern": result["pattern"], "depth": result["depth"],
+                 "hours": np.asarray(result.pop("hours"), dtype=float),
+                 "incremental": np.asarray(result.pop("incremental"), dtype=float),
+                 "cumulative": np.asarray(result.pop("cumulative"), dtype=float)})
+
+def run_jobs(lines, out, service=None, workers=8, max_in_flight=None, dataset=None):
+    """
+    Streams jobs from an iterable of JSON lines and writes one result line per job
+    as it finishes.
+
+    Lines are read only as workers free up, so at most `max_in_flight` jobs (and
+    their results) are held at once however long the input is.
+
+    Args:
+        lines (iterable): JSON job records, e.g. an open file or sys.stdin.
+        out (file): Text stream receiving result records.
+        service (StormService, optional): Shares its fetch cache across jobs.
+        workers (int): Jobs run concurrently.
+        max_in_flight (int, optional): Queued + running jobs (default 4 x workers).
+        dataset (StormDatasetWriter, optional): Receives generated series, which are
+            then left out of the result records.
+
+    Returns:
+        dict: {"jobs", "errors", "seconds"}
+    """
+    service = service or StormService()
+    # Series bound for the dataset skip the JSON rounding and keep full precision
+    operations = _operations(service, raw_series=dataset is not None)
+    max_in_flight = max_in_flight or workers * 4
+    counts = {"jobs": 0, "errors": 0}
+    started = time.perf_counter()
+
+    def emit(done):
+        for future in done:
+            record = future.result()
+            counts["jobs"] += 1
+            counts["errors"] += "error" in record
+            if dataset is not None:
+                _to_dataset(dataset, record)
+            out.write(json.dumps(record) + "\n")
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stormgen-job") as pool:
+        for line_no, text in enumerate(lines, start=1):
+            if not text.strip():
+                continue
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                emit(done)
+            pending.add(pool.submit(_run_job, operations, line_no, text))
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            emit(done)
+    out.flush()
+
+    counts["seconds"] = time.perf_counter() - started
+    return counts
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Run StormGen jobs from a JSON-lines file.")
+    parser.add_argument("jobs", help="JSONL job file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="Result file (default stdout)")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--max-in-flight", type=int, default=None, help="Default 4 x workers")
+    parser.add_argument("--memory-cache", action="store_true",
+                        help="Don't use (or fill) the on-disk site cache shared with the desktop app")
+    parser.add_argument("--dataset", default=None,
+                        help="Write generated series to a Parquet dataset in this directory (needs pyarrow)")
+    parser.add_argument("--format", choices=["parquet", "arrow"], default="parquet", help="Format for --dataset")
+    args = parser.parse_args()
+
+    db_path = None if args.memory_cache else os.path.join(app_data_dir("cache"), "atlas14.sqlite")
+    service = StormService(FetchCache(db_path=db_path), workers=1)
+    source = sys.stdin if args.jobs == "-" else open(args.jobs, encoding="utf-8")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    dataset = None
+    if args.dataset:
+        from src.core.columnar import StormDatasetWriter
+        dataset = StormDatasetWriter(args.dataset, format=args.format)
+    try:
+        counts = run_jobs(source, sink, service, args.workers, args.max_in_flight, dataset)
+    finally:
+        if dataset is not None:
+            dataset.close()
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+        service.close()
+    print(f"{counts['jobs']} jobs, {counts['errors']} errors in {counts['seconds']:.1f}s", file=sys.stderr)
@@ -0,0 +1,189 @@
+import json
+import random
+import sys
+import threading
+import time
+import tracemalloc
+import numpy as np
+from src.core import api
+from src.core.atlas14 import Atlas14Fetcher
+from src.core.fetch_cache import FetchCache
+from src.service.pfds_standin import PFDSStandIn, start_standin
+
+try:
+    import resource
+except ImportError: # Windows
+    resource = None
+
+RETURN_PERIODS = (2, 10, 25, 100, 500)
+TIME_STEPS_MIN = (1, 5, 6, 15, 60)
+
+def site_pool(n, seed=0):
+    """n distinct points spread over the Texas coastal plain (one Atlas 14 cell each)."""
+    rng = np.random.default_rng(seed)
+    lat = 28.0 + rng.random(n) * 4.0
+    lon = -99.0 + rng.random(n) * 5.0
+    return list(zip(lat.round(4).tolist(), lon.round(4).tolist()))
+
+def _process_peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def _client(client_id, cache, sites, requests, generate_share, hot_share, seed, samples, errors):
+    rng = random.Random(seed * 1000 + client_id)
+    hot = sites[:max(1, len(sites) // 10)]
+    for _ in range(requests):
+        # hot_share of requests go to the busiest 10% of sites, like repeat lookups in an office
+        lat, lon = rng.choice(hot if rng.random() < hot_share else sites)
+        op = "generate" if rng.random() < generate_share else "fetch"
+        started = time.perf_counter()
+        try:
+            data = cache.fetch(lat, lon)
+            if op == "generate":
+                rp = rng.choice(RETURN_PERIODS)
+                api.generate(data["full_data"]["24-hr"][rp], "auto", site=data, return_period=rp,
+                             time_step=rng.choice(TIME_STEPS_MIN) / 60.0)
+        except Exception as e:
+            errors.append(f"{op} {lat},{lon}: {e}")
+            continue
+        samples.append((op, time.perf_counter() - started))
+
+def _percentiles(latencies):
+    if not latencies:
+        return {"p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) * 1000.0
+    return {"p50_ms": round(p50, 2), "p95_ms": round(p95, 2), "p99_ms": round(p99, 2),
+            "max_ms": round(max(latencies) * 1000.0, 2)}
+
+def run_load(clients=8, requests=200, sites=100, generate_share=0.5, hot_share=0.8,
+             cache_entries=1024, base_url=None, standin=None, trace_memory=False, seed=0):
+    """
+    Runs `clients` threads, each issuing `requests` mixed fetch/generate calls
+    against one FetchCache, and measures them.
+
+    Without a base_url a PFDS stand-in is started for the run (pass a configured
+    PFDSStandIn to add latency, errors or throttling).
+
+    Args:
+        clients (int): Concurrent client threads.
+        requests (int): Requests per client.
+        sites (int): Distinct locations requested.
+        generate_share (float): Fraction of requests that also generate a storm.
+        hot_share (float): Fraction of requests for the busiest 10% of sites.
+        cache_entries (int): FetchCache memory limit.
+        base_url (str, optional): PFDS endpoint to load instead of a local stand-in.
+        standin (PFDSStandIn, optional): Stand-in behaviour.
+        trace_memory (bool): Also report the Python heap peak (tracemalloc; slower).
+        seed (int): Makes the request sequence repeatable.
+
+    Returns:
+        dict: Throughput, latency percentiles (overall and per operation), cache
+        statistics and memory: the process's peak RSS so far, and how far this
+        run raised it (0 when an earlier run in the process peaked higher).
+    """
+    server = None
+    if base_url is None:
+        server = start_standin(standin or PFDSStandIn(seed=seed))
+        base_url = server.csv_url
+    # verbose=False: the fetcher would print every URL
+    cache = FetchCache(Atlas14Fetcher(base_url=base_url, backoff=0.05, verbose=False), max_entries=cache_entries)
+    pool = site_pool(sites, seed)
+    samples, errors = [], []
+    threads = [threading.Thread(target=_client, args=(i, cache, pool, requests, generate_share, hot_share,
+                                                      seed, samples, errors))
+               for i in range(clients)]
+
+    if trace_memory:
+        tracemalloc.start()
+    rss_before = _process_peak_rss_mb()
+    started = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        elapsed = time.perf_counter() - started
+        heap_peak = tracemalloc.get_traced_memory()[1] / 2**20 if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+    lookups = cache.hits + cache.misses + cache.joined
+    report = {
+        "clients": clients, "requests": len(samples) + len(errors), "errors": len(errors),
+        "seconds": round(elapsed, 3), "throughput_rps": round(len(samples) / elapsed, 1),
+        **_percentiles([s for _, s in samples]),
+        "by_operation": {op: dict(count=sum(1 for o, _ in samples if o == op),
+                                  **_percentiles([s for o, s in samples if o == op]))
+                         for op in ("fetch", "generate")},
+        "cache": dict(cache.stats(), max_entries=cache_entries,
+                      hit_ratio=round(cache.hits / lookups, 4) if lookups else None),
+        "process_peak_rss_mb": _process_peak_rss_mb(),
+        "run_peak_rss_growth_mb": (round(_process_peak_rss_mb() - rss_before, 1)
+                                   if rss_before is not None else None),
+        "peak_heap_mb": round(heap_peak, 2) if heap_peak is not None else None,
+        "first_errors": errors[:5],
+    }
+    cache.close()
+    return report
+
+def format_report(report):
+    cache = report["cache"]
+    lines = [
+        f"{report['clients']} clients, {report['requests']} requests ({report['errors']} errors) "
+        f"in {report['seconds']:.2f}s: {report['throughput_rps']:.1f} req/s",
+        f"  latency p50 {report['p50_ms']} ms  p95 {report['p95_ms']} ms  p99 {report['p99_ms']} ms  "
+        f"max {report['max_ms']} ms",
+    ]
+    for op, numbers in report["by_operation"].items():
+        lines.append(f"  {op:<8} n={numbers['count']:<6} p50 {numbers['p50_ms']} ms  p95 {numbers['p95_ms']} ms  "
+                     f"p99 {numbers['p99_ms']} ms")
+    lines.append(f"  cache ({cache['entries']}/{cache['max_entries']} entries): hit ratio {cache['hit_ratio']}  "
+                 f"hits {cache['hits']}  misses {cache['misses']}  joined {cache['joined']}")
+    if report["process_peak_rss_mb"] is not None:
+        memory = (f"  process peak RSS {report['process_peak_rss_mb']:.1f} MB "
+                  f"(+{report['run_peak_rss_growth_mb']:.1f} MB this run)")
+    else:
+        memory = "  peak RSS n/a"
+    if report["peak_heap_mb"] is not None:
+        memory += f"  Python heap peak {report['peak_heap_mb']:.1f} MB"
+    lines.append(memory)
+    for error in report["first_errors"]:
+        lines.append(f"  error: {error}")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Load-test the StormGen fetch and generate path.")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16],
+                        help="One run per client count")
+    parser.add_argument("--cache-entries", type=int, nargs="+", default=[1024],
+                        help="One run per cache size")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client")
+    parser.add_argument("--sites", type=int, default=100)
+    parser.add_argument("--generate-share", type=float, default=0.5)
+    parser.add_argument("--hot-share", type=float, default=0.8)
+    parser.add_argument("--url", default=None, help="PFDS endpoint (default: a local stand-in)")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.05, 0.2],
+                        help="Stand-in latency in seconds, or MIN MAX")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=float, default=None)
+    parser.add_argument("--tracemalloc", action="store_true", help="Also measure the Python heap peak")
+    parser.add_argument("--json", action="store_true", help="Print JSON reports")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    for entries in args.cache_entries:
+        for clients in args.clients:
+            standin = PFDSStandIn(latency, args.error_rate, rate_limit=args.rate_limit,
+                                  burst=max(1, clients), seed=args.seed)
+            report = run_load(clients, args.requests, args.sites, args.generate_share, args.hot_share,
+                              entries, args.url, standin, args.tracemalloc, args.seed)
+            print(json.dumps(report) if args.json else format_report(report), flush=True)
@@ -0,0 +1,201 @@
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+DEFAULT_PORT = 8751
+
+# Path of the CSV endpoint, as on hdsc.nws.noaa.gov
+CSV_PATH = "/cgi-bin/hdsc/new/fe_text_mean.csv"
+# Old location that NOAA answers with 301 Moved Permanently (noaa_response.html)
+LEGACY_PREFIX = "/cgi-bin/new/"
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def _fixture(name):
+    with open(os.path.join(_REPO_ROOT, name), encoding="utf-8") as f:
+        return f.read()
+
+class PFDSStandIn:
+    """
+    Behaviour of a local NOAA PFDS replacement, replaying recorded responses:
+
+    - the CSV endpoint answers with debug_noaa_response.html (the CSV NOAA sent
+      for Houston), with the latitude/longitude lines set to the request's;
+    - points outside `coverage` get the "File not found." page NOAA sends for
+      locations without estimates (noaa_response_followed.html);
+    - paths under /cgi-bin/new/ answer 301 with the recorded page
+      (noaa_response.html), pointing at the CSV endpoint.
+
+    Latency, errors and throttling can be injected; with a fixed seed the
+    same sequence of requests sees the same responses.
+
+    Args:
+        latency (float | tuple): Seconds added to each response, or a (min, max) range.
+        error_rate (float): Fraction of CSV requests answered 503.
+        fail_first (int): The first N requests for each location are answered 503
+            (deterministic, for retry tests).
+        rate_limit (float, optional): Requests per second allowed before answering 429.
+        burst (int): Requests allowed at once under rate_limit.
+        coverage (tuple, optional): (min_lat, max_lat, min_lon, max_lon) with data.
+        seed (int): Seed for latency jitter and error injection.
+    """
+
+    def __init__(self, latency=0.0, error_rate=0.0, fail_first=0, rate_limit=None, burst=1,
+                 coverage=None, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self.coverage = coverage
+        self.csv_template = _fixture("debug_noaa_response.html")
+        self.not_found = _fixture("noaa_response_followed.html")
+        self.moved = _fixture("noaa_response.html")
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._tokens = float(burst)
+        self._refilled = time.monotonic()
+        self._attempts = {}                # (lat, lon) -> requests seen
+        self.requests = 0
+        self.statuses = {}                 # status -> count
+
+    def _delay(self):
+        with self._lock:
+            if isinstance(self.latency, (tuple, list)):
+                return self._random.uniform(*self.latency)
+            return self.latency
+
+    def _throttled(self):
+        """Token bucket: True when the request is over rate_limit."""
+        if not self.rate_limit:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens < 1.0:
+                return True
+            self._tokens -= 1.0
+            return False
+
+    def _inject_error(self, location):
+        with self._lock:
+            seen = self._attempts.get(location, 0)
+            self._attempts[location] = seen + 1
+            if seen < self.fail_first:
+                return True
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _covered(self, lat, lon):
+        if self.coverage is None:
+            return True
+        min_lat, max_lat, min_lon, max_lon = self.coverage
+        return min_lat <= lat <= max_lat and min_lon <= lon <= max_lon
+
+    def csv_for(self, lat, lon):
+        text = re.sub(r"(?m)^Latitude: .*$", f"Latitude: {lat} Degree", self.csv_template)
+        return re.sub(r"(?m)^Longitude: .*$", f"Longitude: {lon} Degree", text)
+
+    def respond(self, path, params, base_url):
+        """
+        Returns (status, headers, body) for a request. Latency is applied by the
+        caller so it does not hold any lock.
+        """
+        with self._lock:
+            self.requests += 1
+        if path.startswith(LEGACY_PREFIX):
+            location = f"{base_url}{CSV_PATH}?{urlencode(params)}"
+            return 301, {"Location": location, "Content-Type": "text/html"}, self.moved
+        if path != CSV_PATH:
+            return 404, {"Content-Type": "text/html"}, self.not_found
+        if self._throttled():
+            return 429, {"Retry-After": "1", "Content-Type": "text/plain"}, "Too Many Requests\n"
+        try:
+            lat, lon = float(params["lat"]), float(params["lon"])
+        except (KeyError, ValueError):
+            return 400, {"Content-Type": "text/plain"}, "lat and lon are required\n"
+        if self._inject_error((lat, lon)):
+            return 503, {"Content-Type": "text/plain"}, "Service Unavailable\n"
+        if not self._covered(lat, lon):
+            return 200, {"Content-Type": "text/html"}, self.not_found
+        return 200, {"Content-Type": "text/csv"}, self.csv_for(lat, lon)
+
+    def record(self, status):
+        with self._lock:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+class PFDSRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    quiet = False
+
+    def do_GET(self):
+        standin = self.server.standin
+        url = urlparse(self.path)
+        delay = standin._delay()
+        if delay > 0:
+            time.sleep(delay)
+        status, headers, body = standin.respond(url.path, dict(parse_qsl(url.query)), self.server.base_url)
+        data = body.encode("utf-8")
+        standin.record(status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+def make_standin(host="127.0.0.1", port=DEFAULT_PORT, standin=None, quiet=True):
+    """
+    Builds (but does not start) the stand-in server; server.csv_url is the value
+    for Atlas14Fetcher(base_url=...) or $STORMGEN_PFDS_URL.
+    """
+    handler = type("Handler", (PFDSRequestHandler,), {"quiet": quiet})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.standin = standin or PFDSStandIn()
+    server.base_url = f"http://{host}:{server.server_port}"
+    server.csv_url = server.base_url + CSV_PATH
+    return server
+
+def start_standin(standin=None, host="127.0.0.1", port=0):
+    """Starts a stand-in on a background thread; call shutdown() and server_close() when done."""
+    server = make_standin(host, port, standin)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve recorded NOAA PFDS responses locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0],
+                        help="Seconds per response, or MIN MAX for a random range")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 503")
+    parser.add_argument("--fail-first", type=int, default=0, help="Answer 503 to the first N requests per location")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second before 429")
+    parser.add_argument("--burst", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    latency = args.latency[0] if len(args.latency) == 1 else tuple(args.latency[:2])
+    standin = PFDSStandIn(latency, args.error_rate, args.fail_first, args.rate_limit, args.burst, seed=args.seed)
+    server = make_standin(args.host, args.port, standin, quiet=not args.verbose)
+    print(f"PFDS stand-in on {server.csv_url}")
+    print(f"Point StormGen at it with STORMGEN_PFDS_URL={server.csv_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{standin.requests} requests, statuses {standin.statuses}")
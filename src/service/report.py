@@ -0,0 +1,373 @@
+"""
+Headless site reports: one page per site with its design storm hyetograph and
+Atlas 14 IDF curves, rendered without Qt.
+
+A pool of worker processes generates each site's storm and IDF fit. PDF pages
+are then drawn as vector graphics (selectable text, sharp lines) by the parent,
+on one reused page template, in input order. With raster=True the workers also
+draw the pages with matplotlib's Agg renderer and the PDF holds those bitmaps:
+faster for long reports, but far larger files. PNGs (one per site, named by
+CSV row and title) are always drawn by the workers.
+
+    python -m src.service.report sites.csv -o report.pdf --return-period 100
+
+sites.csv needs lat and lon columns; an optional name column titles the pages.
+"""
+import csv
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib import colormaps
+from matplotlib.image import imsave
+from src.core import api
+from src.core.fetch_cache import FetchCache
+from src.core.idf import IDFCurves, depth_table
+from src.core.series import prepare_series
+from src.utils.paths import app_data_dir
+
+# Letter, landscape (inches)
+PAGE_SIZE = (11.0, 8.5)
+DEFAULT_DPI = 150
+
+# Steps drawn per hyetograph; about one per pixel column at DEFAULT_DPI
+MAX_BINS = 1500
+
+IDF_TICKS = [5, 15, 60, 180, 720, 1440]
+IDF_TICK_LABELS = ["5m", "15m", "1h", "3h", "12h", "24h"]
+
+class ReportPage:
+    """
+    A reusable page: header text, hyetograph and IDF axes. The artists are
+    created once; update() only swaps their data (cf. GraphWidget).
+    """
+
+    def __init__(self, dpi=DEFAULT_DPI):
+        self.figure = Figure(figsize=PAGE_SIZE, dpi=dpi, facecolor="white")
+        self.canvas = FigureCanvasAgg(self.figure)
+        grid = self.figure.add_gridspec(2, 1, left=0.07, right=0.84, top=0.86, bottom=0.07, hspace=0.32)
+
+        self.title = self.figure.text(0.07, 0.945, "", fontsize=15, weight="bold")
+        self.subtitle = self.figure.text(0.07, 0.905, "", fontsize=10)
+
+        # Hyetograph: incremental steps with cumulative depth on a second axis
+        self.ax = self.figure.add_subplot(grid[0])
+        self.ax2 = self.ax.twinx()
+        self.bars = self.ax.stairs([0.0], [0.0, 0.1], fill=True, label="Incremental (in)", color="blue", alpha=0.7)
+        self.line_cumulative, = self.ax2.plot([], [], color="green", label="Cumulative (in)", linewidth=2)
+        self.ax.set_xlabel("Time (hours)")
+        self.ax.set_ylabel("Incremental Rainfall (in)", color="blue")
+        self.ax2.set_ylabel("Cumulative Rainfall (in)", color="green")
+        self.ax2.tick_params(axis="y", colors="green")
+        self.ax.grid(True, linestyle="--", alpha=0.7, color="#cccccc")
+        self.ax.legend([self.bars, self.line_cumulative], ["Incremental (in)", "Cumulative (in)"], loc="upper left")
+
+        # IDF: one marker series (Atlas 14) and one fitted line per return period,
+        # added as sites with more return periods come along and hidden when unused
+        self.idf_ax = self.figure.add_subplot(grid[1])
+        self.idf_ax.set_xscale("log")
+        self.idf_ax.set_yscale("log")
+        self.idf_ax.set_xlabel("Duration (min)")
+        self.idf_ax.set_ylabel("Intensity (in/hr)")
+        self.idf_ax.set_xticks(IDF_TICKS)
+        self.idf_ax.set_xticklabels(IDF_TICK_LABELS)
+        self.idf_ax.grid(True, which="major", linestyle="-", alpha=0.7, color="#cccccc")
+        self.idf_ax.grid(True, which="minor", linestyle=":", alpha=0.4, color="#cccccc")
+        self.idf_points = []
+        self.idf_lines = []
+
+    def _idf_artists(self, n):
+        while len(self.idf_lines) < n:
+            self.idf_points.append(self.idf_ax.plot([], [], marker="o", linestyle="none", markersize=4)[0])
+            self.idf_lines.append(self.idf_ax.plot([], [], linestyle="-")[0])
+        return self.idf_points[:n], self.idf_lines[:n]
+
+    def update(self, title, subtitle, storm, data, curves=None):
+        """
+        Shows one site.
+
+        Args:
+            title (str): Page heading.
+            subtitle (str): Line under the heading.
+            storm (dict): api.generate() output.
+            data (dict): Site data (its "full_data" table is plotted).
+            curves (IDFCurves, optional): Fitted equations drawn as lines.
+        """
+        self.title.set_text(title)
+        self.subtitle.set_text(subtitle)
+
+        prepared = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"], MAX_BINS)
+        self.bars.set_data(prepared["bar_values"], prepared["bar_edges"])
+        self.line_cumulative.set_data(prepared["line_x"], prepared["line_y"])
+        self.ax.set_xlim(*prepared["xlim"])
+        self.ax.set_ylim(*prepared["ylim"])
+        self.ax2.set_ylim(*prepared["ylim2"])
+        self.ax.set_title(f"{storm['pattern']} Hyetograph, {storm['depth']:.2f} in")
+
+        durations, rps, depths = depth_table(data.get("full_data", {}))
+        points, lines = self._idf_artists(len(rps))
+        for artist in self.idf_points + self.idf_lines:
+            artist.set_visible(False)
+        colors = colormaps["jet"](np.linspace(0, 1, max(len(rps), 1)))
+        intensities = depths / (durations[:, None] / 60.0)
+        t = np.geomspace(durations[0], durations[-1], 200) if len(durations) else np.empty(0)
+        fitted = curves.intensity(t) if curves is not None else None
+        for i, rp in enumerate(rps):
+            points[i].set_data(durations, intensities[:, i])
+            points[i].set_color(colors[i])
+            points[i].set_visible(True)
+            if fitted is not None and rp in curves.return_periods:
+                lines[i].set_data(t, fitted[list(curves.return_periods).index(rp)])
+                lines[i].set_color(colors[i])
+                lines[i].set_visible(True)
+        labelled = [line if line.get_visible() else point for point, line in zip(points, lines)]
+        self.idf_ax.legend(labelled, [f"{rp}-yr" for rp in rps], loc="upper left", bbox_to_anchor=(1.01, 1.0),
+                           borderaxespad=0.0, fontsize=8)
+        self.idf_ax.relim(visible_only=True)
+        self.idf_ax.autoscale_view()
+        self.idf_ax.set_title("Intensity-Duration-Frequency (IDF) Curves")
+
+    def render(self):
+        """Draws the page and returns it as an (height, width, 3) uint8 array."""
+        self.canvas.draw()
+        return np.asarray(self.canvas.buffer_rgba())[..., :3].copy()
+
+    def save(self, path):
+        """Writes the page in the format given by the extension (.png, .pdf, .svg)."""
+        self.figure.savefig(path, dpi=self.figure.dpi)
+
+def site_title(site):
+    return site.get("name") or f"{site['lat']:.4f}, {site['lon']:.4f}"
+
+def png_name(site, index):
+    """PNG file name: CSV row (input position if unknown) and a slug of the title."""
+    slug = re.sub(r"[^a-z0-9]+", "-", site_title(site).lower()).strip("-")
+    return f"{site.get('row', index + 1):04d}-{slug or 'site'}.png"
+
+def page_content(site, return_period=100, pattern="auto", time_step=0.1, duration=24.0):
+    """
+    Generates the site's design storm and IDF fit.
+
+    Returns:
+        dict: ReportPage.update() keyword arguments.
+    """
+    data = site["data"]
+    full = data.get("full_data", {})
+    if return_period not in full.get("24-hr", {}):
+        raise ValueError(f"No 24-hr depth for the {return_period}-yr return period.")
+    storm = api.generate(full["24-hr"][return_period], pattern, time_step=time_step, duration=duration,
+                         site=data, return_period=return_period)
+    try:
+        curves = IDFCurves.for_site(data)
+    except ValueError:
+        curves = None # Too few durations; the table alone is drawn
+    choice = api.select_region(data, return_period)
+    subtitle = (f"{site['lat']:.4f}, {site['lon']:.4f}   |   {return_period}-yr   |   "
+                f"60-min {choice.d60m:.2f} in, 24-hr {choice.d24h:.2f} in, ratio {choice.ratio:.2f} "
+                f"({choice.region})   |   peak {storm['incremental'].max() / time_step:.2f} in/hr")
+    # Only what the page draws, so little is pickled back from the workers
+    storm = {k: storm[k] for k in ("hours", "incremental", "cumulative", "pattern", "depth")}
+    return {"title": site_title(site), "subtitle": subtitle, "storm": storm,
+            "data": {"full_data": full}, "curves": curves}
+
+def build_page(page, site, **options):
+    """Shows the site's design storm and IDF curves on `page`; see page_content()."""
+    page.update(**page_content(site, **options))
+
+# Worker processes keep one page template each
+_page = None
+
+def _start_worker(dpi):
+    global _page
+    _page = ReportPage(dpi)
+
+def _render_site(index, site, options, png_dir, want):
+    """
+    Runs in a worker: returns (index, page, error or None), the page being
+    the drawn image (want="image"), the page content ("content") or None.
+    """
+    try:
+        content = page_content(site, **options)
+        image = None
+        if png_dir or want == "image":
+            _page.update(**content)
+            image = _page.render()
+        if png_dir:
+            # Encode the pixels just drawn instead of drawing the page again through savefig
+            imsave(os.path.join(png_dir, png_name(site, index)), image, dpi=_page.figure.dpi)
+        return index, {"image": image, "content": content}.get(want), None
+    except Exception as e:
+        return index, None, f"{site_title(site)}: {e}"
+
+class _PdfWriter:
+    """
+    Appends pages to one PDF: page content drawn as vectors on one reused
+    template, or (raster=True) rendered images placed full bleed on one reused figure.
+    """
+
+    def __init__(self, path, dpi, raster=False):
+        from matplotlib.backends.backend_pdf import PdfPages
+        self.pdf = PdfPages(path, metadata={"Title": "StormGen Site Report", "Creator": "StormGen"})
+        self.raster = raster
+        if raster:
+            self.figure = Figure(figsize=PAGE_SIZE, dpi=dpi)
+            FigureCanvasAgg(self.figure)
+            ax = self.figure.add_axes([0, 0, 1, 1])
+            ax.set_axis_off()
+            self.image = ax.imshow(np.zeros((1, 1, 3), dtype=np.uint8), interpolation="none", aspect="auto")
+        else:
+            self.page = ReportPage(dpi)
+            self.figure = self.page.figure
+
+    def add(self, page):
+        if self.raster:
+            self.image.set_data(page)
+        else:
+            self.page.update(**page)
+        self.pdf.savefig(self.figure)
+
+    def close(self):
+        self.pdf.close()
+
+def build_report(sites, pdf_path=None, png_dir=None, return_period=100, pattern="auto", time_step=0.1,
+                 duration=24.0, workers=None, dpi=DEFAULT_DPI, max_in_flight=None, raster=False):
+    """
+    Prepares (and for PNGs and raster PDFs, renders) one page per site in a
+    process pool and collects them, in input order, into a PDF and/or a folder of PNGs.
+
+    Args:
+        sites (iterable): Dicts with "lat", "lon", "data" (fetch_data() output)
+            and optionally "name".
+        pdf_path (str, optional): Multi-page PDF to write.
+        png_dir (str, optional): Folder for one PNG per site, named by png_name()
+            (written by the workers).
+        return_period (int): Return period of the design storms.
+        pattern (str): Distribution name, or "auto" for the site's region.
+        time_step (float): Storm interval in hours.
+        duration (float): Storm length in hours (at least 24).
+        workers (int, optional): Worker processes (default: one per CPU); 0 renders
+            in this process.
+        dpi (int): Page resolution (PNGs, raster PDF pages).
+        max_in_flight (int, optional): Pages rendered ahead of the PDF writer
+            (default 2 x workers); bounds memory for long reports.
+        raster (bool): Put the workers' bitmaps in the PDF instead of drawing
+            vector pages in this process; faster, but much larger files
+            without selectable text.
+
+    Returns:
+        dict: {"pages", "errors", "first_errors", "seconds"}
+    """
+    if not pdf_path and not png_dir:
+        raise ValueError("Give a PDF path, a PNG folder, or both.")
+    if png_dir:
+        os.makedirs(png_dir, exist_ok=True)
+    options = {"return_period": return_period, "pattern": pattern, "time_step": time_step, "duration": duration}
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    max_in_flight = max_in_flight or 2 * max(workers, 1)
+    counts = {"pages": 0, "errors": 0, "first_errors": []}
+    started = time.perf_counter()
+    writer = _PdfWriter(pdf_path, dpi, raster) if pdf_path else None
+    want = None if writer is None else "image" if raster else "content"
+
+    def collect(result):
+        _, page, error = result
+        if error is not None:
+            counts["errors"] += 1
+            if len(counts["first_errors"]) < 5:
+                counts["first_errors"].append(error)
+            return
+        counts["pages"] += 1
+        if writer is not None:
+            writer.add(page)
+
+    try:
+        if workers == 0:
+            _start_worker(dpi)
+            for index, site in enumerate(sites):
+                collect(_render_site(index, site, options, png_dir, want))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(dpi,)) as pool:
+                # Futures are collected in submission order, so pages keep the input order
+                pending = deque()
+                for index, site in enumerate(sites):
+                    if len(pending) >= max_in_flight:
+                        collect(pending.popleft().result())
+                    pending.append(pool.submit(_render_site, index, site, options, png_dir, want))
+                while pending:
+                    collect(pending.popleft().result())
+    finally:
+        if writer is not None:
+            writer.close()
+
+    counts["seconds"] = time.perf_counter() - started
+    return counts
+
+def read_sites(path):
+    """Reads lat, lon (and optional name) rows from a CSV file; "row" is the 1-based data row."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.DictReader(f))
+    sites = []
+    for line_no, row in enumerate(rows, start=2):
+        row = {k.strip().lower(): (v or "").strip() for k, v in row.items() if k}
+        try:
+            sites.append({"lat": float(row["lat"]), "lon": float(row["lon"]), "name": row.get("name", ""),
+                          "row": line_no - 1})
+        except (KeyError, ValueError):
+            raise ValueError(f"{path}, line {line_no}: lat and lon are required")
+    return sites
+
+def fetch_sites(sites, cache, workers=8):
+    """
+    Adds each site's Atlas 14 data (from the cache or NOAA, several at a time).
+    Sites that cannot be fetched are returned separately with the error.
+    """
+    def fetch(site):
+        try:
+            return dict(site, data=cache.fetch(site["lat"], site["lon"])), None
+        except Exception as e:
+            return None, f"{site_title(site)}: {e}"
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stormgen-report") as pool:
+        results = list(pool.map(fetch, sites))
+    return [s for s, _ in results if s is not None], [e for _, e in results if e is not None]
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Render StormGen site reports without the GUI.")
+    parser.add_argument("sites", help="CSV with lat, lon and optional name columns")
+    parser.add_argument("-o", "--output", default=None, help="Multi-page PDF to write")
+    parser.add_argument("--png-dir", default=None, help="Also (or only) write one PNG per site here")
+    parser.add_argument("--return-period", type=api.parse_return_period, default=100)
+    parser.add_argument("--pattern", default="auto")
+    parser.add_argument("--time-step-min", type=float, default=6.0)
+    parser.add_argument("--duration-hr", type=float, default=24.0)
+    parser.add_argument("--workers", type=int, default=None, help="Render processes (default: one per CPU)")
+    parser.add_argument("--dpi", type=int, default=DEFAULT_DPI)
+    parser.add_argument("--raster", action="store_true",
+                        help="Put bitmaps drawn by the workers in the PDF (faster, much larger, no selectable text)")
+    parser.add_argument("--memory-cache", action="store_true",
+                        help="Don't use (or fill) the on-disk site cache shared with the desktop app")
+    args = parser.parse_args()
+    if not args.output and not args.png_dir:
+        parser.error("give -o/--output and/or --png-dir")
+
+    db_path = None if args.memory_cache else os.path.join(app_data_dir("cache"), "atlas14.sqlite")
+    cache = FetchCache(db_path=db_path)
+    try:
+        sites, fetch_errors = fetch_sites(read_sites(args.sites), cache)
+    finally:
+        cache.close()
+    for error in fetch_errors:
+        print(f"skipped {error}", file=sys.stderr)
+
+    counts = build_report(sites, args.output, args.png_dir, args.return_period, args.pattern,
+                          args.time_step_min / 60.0, args.duration_hr, args.workers, args.dpi, raster=args.raster)
+    for error in counts["first_errors"]:
+        print(f"error {error}", file=sys.stderr)
+    print(f"{counts['pages']} pages, {counts['errors'] + len(fetch_errors)} sites skipped "
+          f"in {counts['seconds']:.1f}s", file=sys.stderr)
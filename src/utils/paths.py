@@ -0,0 +1,11 @@
+import os
+
+def app_data_dir(*parts):
+    """
+    Returns (and creates) a folder under the StormGen data directory.
+    Defaults to ~/.stormgen; override with the STORMGEN_HOME environment variable.
+    """
+    root = os.environ.get("STORMGEN_HOME") or os.path.join(os.path.expanduser("~"), ".stormgen")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,196 @@
+import math
+import os
+import threading
+import time
+import urllib.request
+from src.utils.paths import app_data_dir
+
+# Base layers used by the map. {z}/{x}/{y} are standard slippy-map tile indices.
+TILE_SOURCES = {
+    "osm": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+    "esri_imagery": "https://server.arcgisonline.com/ArcGIS/rest/services/World_Imagery/MapServer/tile/{z}/{y}/{x}",
+    "esri_labels": "https://server.arcgisonline.com/ArcGIS/rest/services/Reference/World_Boundaries_and_Places/MapServer/tile/{z}/{y}/{x}",
+}
+
+# Tile servers (OSM in particular) require an identifying User-Agent
+USER_AGENT = "StormGen/1.0 (NOAA Atlas 14 rainfall tool)"
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+def tile_range(south, west, north, east, zoom):
+    """Yields every (x, y) tile index covering the bounding box at `zoom`."""
+    def to_tile(lat, lon):
+        lat = max(min(lat, 85.0511), -85.0511)
+        n = 2 ** zoom
+        x = int((lon + 180.0) / 360.0 * n)
+        y = int((1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n)
+        return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+    x0, y0 = to_tile(north, west)
+    x1, y1 = to_tile(south, east)
+    for x in range(x0, x1 + 1):
+        for y in range(y0, y1 + 1):
+            yield x, y
+
+def content_type(data):
+    """Guesses the image MIME type of a tile from its first bytes."""
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    return "application/octet-stream"
+
+class TileCache:
+    """
+    On-disk map tile cache with size-bounded, least-recently-used eviction.
+
+    Tiles live at <root>/<source>/<z>/<x>/<y>. Reads refresh the file's mtime,
+    and when the cache grows past max_bytes the oldest files are removed until
+    it is back under 90% of the limit.
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or app_data_dir("tiles")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None # Scanned lazily on first write
+
+    def path(self, source, z, x, y):
+        return os.path.join(self.root, source, str(int(z)), str(int(x)), str(int(y)))
+
+    def remote_url(self, source, z, x, y):
+        return TILE_SOURCES[source].format(z=int(z), x=int(x), y=int(y))
+
+    def get(self, source, z, x, y):
+        """Returns the cached tile bytes or None."""
+        path = self.path(source, z, x, y)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path, None) # Mark as recently used
+        except OSError:
+            pass
+        return data
+
+    def put(self, source, z, x, y, data):
+        path = self.path(source, z, x, y)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+
+        with self._lock:
+            # Replacing a tile (refresh, re-seed) only adds the size difference
+            try:
+                old_size = os.path.getsize(path)
+            except OSError:
+                old_size = 0
+            os.replace(tmp_path, path)
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_size()
+            else:
+                self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _files(self):
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                if not name.endswith(".tmp"):
+                    yield os.path.join(dirpath, name)
+
+    def _scan_size(self):
+        total = 0
+        for path in self._files():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def _evict(self):
+        entries = []
+        for path in self._files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._total_bytes = total
+
+    def download(self, source, z, x, y, timeout=15):
+        """Fetches one tile from its server, stores it and returns the bytes."""
+        request = urllib.request.Request(self.remote_url(source, z, x, y), headers={"User-Agent": USER_AGENT})
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            data = response.read()
+        self.put(source, z, x, y, data)
+        return data
+
+    def seed(self, south, west, north, east, zooms, sources=("osm",), max_tiles=20000,
+             delay=0.05, progress=None):
+        """
+        Pre-downloads tiles covering a project area so the map works offline.
+        Tiles already cached are skipped.
+
+        Args:
+            south, west, north, east (float): Bounding box in degrees.
+            zooms (iterable[int]): Zoom levels to fetch.
+            sources (iterable[str]): Keys of TILE_SOURCES.
+            max_tiles (int): Refuse to seed areas larger than this many tiles.
+            delay (float): Pause between downloads, to be polite to tile servers.
+            progress (callable, optional): Called with (done, total).
+
+        Returns:
+            int: Number of tiles downloaded.
+        """
+        jobs = [(source, z, x, y) for source in sources for z in zooms
+                for x, y in tile_range(south, west, north, east, z)]
+        if len(jobs) > max_tiles:
+            raise ValueError(f"Area needs {len(jobs)} tiles (limit {max_tiles}); reduce the zoom range or area.")
+
+        downloaded = 0
+        for i, (source, z, x, y) in enumerate(jobs):
+            if not os.path.exists(self.path(source, z, x, y)):
+                try:
+                    self.download(source, z, x, y)
+                    downloaded += 1
+                    time.sleep(delay)
+                except OSError as e:
+                    print(f"Failed to download tile {source}/{z}/{x}/{y}: {e}")
+            if progress:
+                progress(i + 1, len(jobs))
+        return downloaded
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pre-seed the StormGen map tile cache for a project area.")
+    parser.add_argument("south", type=float)
+    parser.add_argument("west", type=float)
+    parser.add_argument("north", type=float)
+    parser.add_argument("east", type=float)
+    parser.add_argument("--zooms", default="4-12", help="Zoom range, e.g. 4-12")
+    parser.add_argument("--sources", default="osm", help="Comma-separated: " + ",".join(TILE_SOURCES))
+    args = parser.parse_args()
+
+    z0, _, z1 = args.zooms.partition("-")
+    zooms = range(int(z0), int(z1 or z0) + 1)
+    cache = TileCache()
+    count = cache.seed(args.south, args.west, args.north, args.east, zooms,
+                       sources=args.sources.split(","),
+                       progress=lambda done, total: print(f"\r{done}/{total}", end=""))
+    print(f"\nDownloaded {count} tiles into {cache.root}")
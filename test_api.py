@@ -0,0 +1,21 @@
+import csv
+from src.core import api
+
+def test_api_auto_generate_and_export(tmp_path):
+    site = {"60m_25yr": 2.0, "24h_25yr": 6.0,
+            "full_data": {"60-min": {25: 2.0, 100: 3.0}, "24-hr": {25: 6.0, 100: 7.0}}}
+    choice = api.select_region(site, return_period=100)
+    assert choice.return_period == 100 and choice.d24h == 7.0
+    assert choice.pattern == "NOAA Region D" # ratio 0.43
+
+    storm = api.generate(choice.d24h, "auto", site=site, return_period=25, time_step=0.5, duration=24)
+    assert storm["pattern"] == "NOAA Region B" # ratio 0.33
+    assert abs(storm["cumulative"][-1] - 7.0) < 1e-9
+
+    path = tmp_path / "storm.csv"
+    api.export_storm(storm, str(path))
+    with open(path, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:3] == ["Date", "Time", "Hours"]
+    assert len(rows) == 1 + 49
+    assert rows[2][:3] == ["2026-01-01", "00:30:00", "0.5"]
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from src.core import api, columnar
+
+pa_dataset = pytest.importorskip("pyarrow.dataset")
+
+SITE = {"60m_25yr": 2.0, "24h_25yr": 6.0,
+        "full_data": {"60-min": {25: 2.0, 100: 3.0}, "24-hr": {25: 6.0, 100: 7.0, 500: 9.0}}}
+
+def test_storm_dataset_round_trip(tmp_path):
+    storms = []
+    for lat in (29.5, 30.5):
+        for rp in (25, 100):
+            storm = api.generate(SITE["full_data"]["24-hr"][rp], "auto", site=SITE, return_period=rp,
+                                 time_step=1.0, duration=24)
+            storm.update(lat=lat, lon=-95.0, return_period=rp)
+            storms.append(storm)
+    root = str(tmp_path / "storms")
+    columnar.export_storms(storms, root, batch_rows=60) # Several batches
+    columnar.export_storms(storms[:1], root)            # Appends
+
+    table = pa_dataset.dataset(root, partitioning="hive").to_table()
+    assert table.num_rows == 5 * 25
+    rows = table.filter(pa_dataset.field("return_period") == 100).to_pydict()
+    assert len(rows["hours"]) == 2 * 25
+    assert set(rows["pattern"]) == {"NOAA Region D"}
+    assert np.isclose(max(rows["cumulative_in"]), 7.0)
+
+def test_frequency_dataset_arrow(tmp_path):
+    root = str(tmp_path / "freq")
+    columnar.export_frequency([(29.76, -95.37, SITE)], root, format="arrow")
+    table = pa_dataset.dataset(root, format="ipc").to_table().to_pydict()
+    assert sorted(zip(table["duration"], table["return_period"], table["depth_in"])) == [
+        ("24-hr", 25, 6.0), ("24-hr", 100, 7.0), ("24-hr", 500, 9.0), ("60-min", 25, 2.0), ("60-min", 100, 3.0)]
+
+def test_jobs_dataset_keeps_full_precision(tmp_path):
+    import io, json
+    from src.core.generator import RainfallGenerator
+    from src.service.http_api import StormService
+    from src.service.jobs import run_jobs
+    pattern = "SCS Type II (Legacy/Standard)"
+    jobs = io.StringIO(json.dumps({"id": 1, "depth": 3.3, "pattern": pattern, "time_step_min": 7}))
+    out = io.StringIO()
+    root = str(tmp_path / "jobs")
+    with columnar.StormDatasetWriter(root) as dataset:
+        run_jobs(jobs, out, StormService(), workers=1, dataset=dataset)
+    assert "cumulative" not in json.loads(out.getvalue())["result"]
+
+    expected = RainfallGenerator().generate_arrays(3.3, pattern, time_step=7 / 60.0, duration=48)
+    table = pa_dataset.dataset(root, partitioning="hive").to_table().to_pydict()
+    assert np.array_equal(table["cumulative_in"], expected["cumulative"])
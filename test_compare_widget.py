@@ -0,0 +1,22 @@
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from src.core import api
+from src.core.series import prepare_series
+from src.gui.compare_widget import CompareWidget, series_styles
+
+def test_storms_past_twenty_stay_distinguishable():
+    colors, styles = series_styles(60)
+    assert len({(tuple(c), s) for c, s in zip(colors, styles)}) == 60
+
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    storm = api.generate(5.0, "NOAA Region C", time_step=0.25)
+    prepared = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"])
+    widget = CompareWidget()
+    widget.set_series([(f"Storm {i}", prepared) for i in range(25)])
+    widget.canvas.draw()
+    assert len(set(map(str, widget.cumulative_lines.get_linestyle()))) == 2
+    widget.clear()
+    widget.canvas.draw()
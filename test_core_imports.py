@@ -0,0 +1,12 @@
+import subprocess
+import sys
+
+def test_core_imports_without_gui_stack():
+    # src.core must stay usable headless: no Qt, no matplotlib, pandas only on demand
+    code = ("import sys\n"
+            "import src.core.atlas14, src.core.custom_curves, src.core.fetch_cache\n"
+            "import src.core.generator, src.core.series, src.core.api\n"
+            "from src.core import select_region, generate\n"
+            "heavy = [m for m in ('PyQt5', 'matplotlib', 'pandas') if m in sys.modules]\n"
+            "assert not heavy, heavy\n")
+    subprocess.run([sys.executable, "-c", code], check=True)
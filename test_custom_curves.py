@@ -0,0 +1,76 @@
+import os
+import tempfile
+from src.core.custom_curves import CustomCurveLoader, CustomCurveError
+from src.core.generator import RainfallGenerator
+
+def _write(path, rows):
+    with open(path, "w") as f:
+        f.write("hours,cum. unit rain\n")
+        for h, frac in rows:
+            f.write(f"{h},{frac}\n")
+
+def test_custom_curve_cached_until_changed():
+    loader = CustomCurveLoader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "flat.csv")
+        _write(path, [(0, 0.0), (12, 0.5), (24, 1.0)])
+
+        first = loader.load(path)
+        assert loader.load(path) is first
+
+        # Touching without changing content keeps the compiled curve
+        os.utime(path, ns=(0, 1))
+        assert loader.load(path) is first
+
+        _write(path, [(0, 0.0), (12, 0.6), (24, 1.0)])
+        second = loader.load(path)
+        assert second is not first
+        assert second.fractions[1] == 0.6
+
+        df = RainfallGenerator().generate(2.0, "Custom (Paste Table)", custom_curve=second)
+        assert abs(df["Cumulative Rainfall (in)"].iloc[-1] - 2.0) < 1e-6
+
+def test_custom_curve_validation_and_folder():
+    loader = CustomCurveLoader()
+    with tempfile.TemporaryDirectory() as tmp:
+        _write(os.path.join(tmp, "good.csv"), [(0, 0.0), (24, 1.0)])
+        _write(os.path.join(tmp, "decreasing.csv"), [(0, 0.0), (6, 0.4), (12, 0.3), (24, 1.0)])
+        _write(os.path.join(tmp, "short.csv"), [(0, 0.0), (24, 0.8)])
+
+        curves, errors = loader.load_folder(tmp)
+        assert [c.name for c in curves.values()] == ["Custom: good"]
+        assert len(errors) == 2
+
+        try:
+            loader.load(os.path.join(tmp, "missing.csv"))
+            assert False, "Expected CustomCurveError"
+        except CustomCurveError:
+            pass
+
+def test_custom_curve_names_and_collisions():
+    loader = CustomCurveLoader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "flat.csv")
+        _write(path, [(0, 0.0), (24, 1.0)])
+        assert loader.load(path).name == "Custom: flat"
+        assert loader.load(path, name="Office standard").name == "Office standard"
+        assert loader.load(path).name == "Custom: flat"
+
+        first, second = os.path.join(tmp, "one"), os.path.join(tmp, "two")
+        os.mkdir(first)
+        os.mkdir(second)
+        _write(os.path.join(first, "a.csv"), [(0, 0.0), (24, 1.0)])
+        _write(os.path.join(second, "A.CSV"), [(0, 0.0), (24, 1.0)])
+        assert len(loader.load_folder(first)[0]) == 1
+        assert len(loader.load_folder(first)[0]) == 1 # Reloading is not a collision
+        try:
+            loader.load_folder(second)
+            assert False, "Expected CustomCurveError"
+        except CustomCurveError as e:
+            assert "a.csv" in str(e) and "A.CSV" in str(e)
+
+if __name__ == "__main__":
+    test_custom_curve_cached_until_changed()
+    test_custom_curve_validation_and_folder()
+    test_custom_curve_names_and_collisions()
+    print("Custom curve tests passed.")
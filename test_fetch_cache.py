@@ -0,0 +1,118 @@
+import os
+import tempfile
+import threading
+import time
+import pytest
+from src.core.atlas14 import Atlas14Fetcher, FetchCancelled
+from src.core.fetch_cache import FetchCache
+
+SITE = {"24h_25yr": 11.6, "60m_25yr": 3.86, "24h_selected": 14.2,
+        "full_data": {"24-hr": {2: 4.9, 25: 11.6}, "60-min": {2: 1.9, 25: 3.86}},
+        "raw_csv": "header\n24-hr:,4.9,11.6\n"}
+
+class _CountingFetcher:
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_data(self, lat, lon, return_period_years=100, is_cancelled=None):
+        self.calls += 1
+        return SITE
+
+def test_fetch_cache_persists_sites():
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "atlas14.sqlite")
+        fetcher = _CountingFetcher()
+        cache = FetchCache(fetcher, db_path=db_path)
+        cache.fetch(29.76, -95.37)
+        cache.fetch(29.7601, -95.3699) # Same grid cell
+        assert fetcher.calls == 1
+
+        # A new session finds the site on disk, with integer return-period keys
+        reopened = FetchCache(_CountingFetcher(), db_path=db_path)
+        assert reopened.state(29.76, -95.37) == "cached"
+        assert reopened.fetch(29.76, -95.37) == SITE
+        assert reopened.fetcher.calls == 0
+        assert reopened.sites() == [(29.76, -95.37, 3.86, 11.6)]
+        cache.close()
+        reopened.close()
+
+class _BlockingFetcher:
+    """Holds every fetch until released, aborting it like curl when is_cancelled() turns True."""
+
+    def __init__(self, data=SITE):
+        self.data = data
+        self.calls = 0
+        self.release = threading.Event()
+
+    def fetch_data(self, lat, lon, return_period_years=100, is_cancelled=None):
+        self.calls += 1
+        while not self.release.wait(0.01):
+            if is_cancelled is not None and is_cancelled():
+                raise FetchCancelled("Fetch cancelled.")
+        return self.data
+
+def _until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+def test_concurrent_fetches_of_one_cell_coalesce():
+    fetcher = _BlockingFetcher()
+    cache = FetchCache(fetcher)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.fetch(29.76, -95.37))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    _until(lambda: cache.joined == 7)
+    assert cache.state(29.76, -95.37) == "fetching"
+    fetcher.release.set()
+    for t in threads:
+        t.join()
+    assert fetcher.calls == 1 and len(results) == 8
+    assert all(r is results[0] for r in results)
+    assert cache.stats()["in_flight"] == 0
+
+def test_cancel_keeps_fetch_for_waiters_and_abandons_alone():
+    fetcher = _BlockingFetcher()
+    cache = FetchCache(fetcher)
+    cancelled = threading.Event()
+    outcome = {}
+
+    def owner():
+        outcome["owner"] = cache.fetch(29.76, -95.37, is_cancelled=cancelled.is_set)
+
+    def waiter():
+        outcome["waiter"] = cache.fetch(29.76, -95.37)
+
+    threads = [threading.Thread(target=owner)]
+    threads[0].start()
+    _until(lambda: cache.misses == 1)
+    threads.append(threading.Thread(target=waiter))
+    threads[1].start()
+    _until(lambda: cache.joined == 1)
+    cancelled.set() # Someone is still waiting: the request carries on
+    time.sleep(0.05)
+    fetcher.release.set()
+    for t in threads:
+        t.join()
+    assert outcome["waiter"] == SITE and fetcher.calls == 1
+
+    # With nobody else waiting, cancelling aborts the request and clears the entry
+    fetcher = _BlockingFetcher()
+    cache = FetchCache(fetcher)
+    cancelled = threading.Event()
+    cancelled.set()
+    with pytest.raises(FetchCancelled):
+        cache.fetch(29.76, -95.37, is_cancelled=cancelled.is_set)
+    assert cache.state(29.76, -95.37) is None and cache.stats()["in_flight"] == 0
+    fetcher.release.set()
+    assert cache.fetch(29.76, -95.37) == SITE and fetcher.calls == 2
+
+def test_store_leaves_caller_data_alone():
+    with open("debug_noaa_response.html") as f:
+        data = Atlas14Fetcher()._parse_csv(f.read(), 100)
+    cache = FetchCache()
+    stored = cache.put(29.76, -95.37, data)
+    assert "idf" in stored and "idf" not in data
+    assert cache.get(29.76, -95.37) is stored
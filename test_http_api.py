@@ -0,0 +1,78 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from src.core.atlas14 import Atlas14Fetcher
+from src.core.fetch_cache import FetchCache
+from src.service.http_api import StormService, make_server
+
+class _FixtureFetcher:
+    def __init__(self):
+        with open("debug_noaa_response.html") as f:
+            self.data = Atlas14Fetcher()._parse_csv(f.read(), 100)
+        self.calls = 0
+
+    def fetch_data(self, lat, lon, return_period_years=100, is_cancelled=None):
+        self.calls += 1
+        return dict(self.data)
+
+def test_service_endpoints_and_batch():
+    fetcher = _FixtureFetcher()
+    server = make_server(port=0, service=StormService(FetchCache(fetcher)), quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        suggestion = json.loads(urllib.request.urlopen(f"{base}/suggest?lat=29.76&lon=-95.37").read())
+        assert suggestion["pattern"] == "NOAA Region B"
+
+        batch = [{"lat": 29.76, "lon": -95.37, "series": False},
+                 {"depth": 2.0, "pattern": "SCS Type II (Legacy/Standard)"},
+                 {"depth": 2.0, "pattern": "no such pattern"}]
+        request = urllib.request.Request(f"{base}/generate", data=json.dumps(batch).encode(),
+                                         headers={"Content-Type": "application/json"})
+        results = json.loads(urllib.request.urlopen(request).read())
+        assert results[0]["depth"] == 11.6 and "hours" not in results[0]
+        assert abs(results[1]["cumulative"][-1] - 2.0) < 1e-6
+        assert "error" in results[2]
+        assert fetcher.calls == 1 # Shared cache across requests
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_generate_rejects_oversized_series():
+    server = make_server(port=0, service=StormService(FetchCache(_FixtureFetcher())), quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/generate?depth=2&pattern=NOAA+Region+A"
+    try:
+        for query in ("&duration_hr=100000", "&time_step_min=0.0001", "&time_step_min=nan",
+                      "&depth=nan", "&depth=inf", "&depth=-5"):
+            try:
+                urllib.request.urlopen(base + query)
+                assert False, query
+            except urllib.error.HTTPError as e:
+                assert e.code == 400 and "error" in json.loads(e.read())
+        assert json.loads(urllib.request.urlopen(base + "&duration_hr=168&time_step_min=1").read())["duration_hr"] == 168
+    finally:
+        server.shutdown()
+        server.server_close()
+
+class _FailingFetcher:
+    def fetch_data(self, lat, lon, return_period_years=100, is_cancelled=None):
+        raise RuntimeError("NOAA unreachable")
+
+def test_upstream_failures_and_bugs_are_told_apart():
+    service = StormService(FetchCache(_FailingFetcher()))
+    service.stats = lambda params=None: {"bad": 1 / 0}
+    server = make_server(port=0, service=service, quiet=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    try:
+        for path, status in (("/site?lat=30&lon=-95", 502), ("/stats", 500)):
+            try:
+                urllib.request.urlopen(base + path)
+                assert False, path
+            except urllib.error.HTTPError as e:
+                assert e.code == status and "error" in json.loads(e.read())
+    finally:
+        server.shutdown()
+        server.server_close()
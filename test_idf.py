@@ -0,0 +1,44 @@
+import numpy as np
+from src.core.atlas14 import Atlas14Fetcher
+from src.core.idf import IDFCurves, depth_table, fit_idf
+
+def _site():
+    with open("debug_noaa_response.html") as f:
+        return Atlas14Fetcher()._parse_csv(f.read(), 100)
+
+def test_idf_fit_matches_table():
+    data = _site()
+    curves = fit_idf(data["full_data"])
+    durations, rps, depths = depth_table(data["full_data"])
+    table = depths / (durations[:, None] / 60.0)
+
+    fitted = curves.intensity(durations) # (n_rp, n_dur)
+    assert fitted.shape == (len(rps), len(durations))
+    assert np.nanmax(np.abs(fitted.T / table - 1)) < 0.15
+
+    # One return period, any array of durations
+    tc = np.linspace(5, 1440, 1000).reshape(10, 100)
+    assert curves.intensity(tc, 25).shape == (10, 100)
+    assert np.isclose(curves.depth(1440, 25), depths[-1, list(rps).index(25)], rtol=0.1)
+
+def test_idf_fit_stored_with_site():
+    data = _site()
+    curves = IDFCurves.for_site(data)
+    assert "idf" in data
+    again = IDFCurves.for_site(data)
+    assert np.allclose(again.intensity([10, 60], 100), curves.intensity([10, 60], 100))
+
+def test_unfitted_return_period_is_valid_json():
+    import json
+    full_data = _site()["full_data"]
+    for label in list(full_data)[1:]:
+        full_data[label] = dict(full_data[label])
+        full_data[label].pop(1000, None) # 1000-yr left with a single duration
+    curves = fit_idf(full_data)
+    row = list(curves.return_periods).index(1000)
+    assert np.isnan(curves.a[row])
+
+    text = json.dumps(curves.to_dict(), allow_nan=False)
+    again = IDFCurves.from_dict(json.loads(text))
+    assert np.isnan(again.a[row]) and np.isnan(again.c[row])
+    assert np.allclose(again.intensity([10, 60], 25), curves.intensity([10, 60], 25))
@@ -1,14 +1,21 @@
 
+import os
 from src.core.atlas14 import Atlas14Fetcher
 from src.core.generator import RainfallGenerator
+from src.service.pfds_standin import start_standin
 
 def test_integration():
     print("Testing Integration...")
     
-    # 1. Fetch Data (mock or real)
-    # We'll try real since we verified curl works
+    # 1. Fetch Data from the local PFDS stand-in (recorded NOAA responses),
+    # or from NOAA itself with STORMGEN_LIVE_NOAA=1
     print("1. Fetching Data for Houston...")
-    fetcher = Atlas14Fetcher()
+    server = None
+    if os.environ.get("STORMGEN_LIVE_NOAA"):
+        fetcher = Atlas14Fetcher()
+    else:
+        server = start_standin()
+        fetcher = Atlas14Fetcher(base_url=server.csv_url)
     try:
         data = fetcher.fetch_data(29.7604, -95.3698)
         print("   Fetch Success.")
@@ -17,6 +24,10 @@ def test_integration():
     except Exception as e:
         print(f"   Fetch Failed: {e}")
         return
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
 
     # 2. Generator Logic
     print("\n2. Testing Generator Logic...")
@@ -0,0 +1,16 @@
+import numpy as np
+from src.core import api
+from src.core.interpolation import PchipCurve
+
+def test_pchip_storm_is_monotone_and_smooth():
+    x, y = [0.0, 1.0, 2.0, 4.0], [0.0, 0.1, 0.9, 1.0]
+    curve = PchipCurve(x, y)
+    assert abs(curve(x) - y).max() < 1e-12
+    assert abs(curve([3.5, -1.0, 0.5, 9.0]) - curve(sorted([3.5, -1.0, 0.5, 9.0]))[[2, 0, 1, 3]]).max() < 1e-12
+
+    linear = api.generate(5.0, "SCS Type II (Legacy/Standard)", time_step=1 / 60)
+    smooth = api.generate(5.0, "SCS Type II (Legacy/Standard)", time_step=1 / 60, interpolation="pchip")
+    assert smooth["incremental"].min() >= 0.0
+    assert abs(smooth["cumulative"][-1] - 5.0) < 1e-9
+    # No kinks at the breakpoints: intensity changes far less from step to step
+    assert abs(np.diff(smooth["incremental"], 2)).max() < abs(np.diff(linear["incremental"], 2)).max()
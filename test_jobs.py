@@ -0,0 +1,19 @@
+import io
+import json
+from src.core.fetch_cache import FetchCache
+from src.service.http_api import StormService
+from src.service.jobs import run_jobs
+from test_http_api import _FixtureFetcher
+
+def test_jobs_stream_results():
+    fetcher = _FixtureFetcher()
+    jobs = io.StringIO("\n".join([json.dumps({"id": i, "lat": 29.76, "lon": -95.37, "series": False}) for i in range(20)]
+                                 + ["", "not json", json.dumps({"id": "s", "op": "suggest", "d60m": 1, "d24h": 4})]))
+    out = io.StringIO()
+    counts = run_jobs(jobs, out, StormService(FetchCache(fetcher)), workers=4, max_in_flight=3)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert counts["jobs"] == len(records) == 22 and counts["errors"] == 1
+    assert sorted(r["id"] for r in records if isinstance(r["id"], int)) == list(range(20))
+    assert next(r for r in records if r["id"] == "s")["result"]["pattern"] == "NOAA Region A"
+    assert next(r for r in records if r["line"] == 22)["error"]
+    assert fetcher.calls == 1
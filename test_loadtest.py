@@ -0,0 +1,10 @@
+from src.service.loadtest import run_load
+
+def test_load_harness_reports():
+    report = run_load(clients=4, requests=25, sites=5, seed=1)
+    assert report["requests"] == 100 and report["errors"] == 0
+    assert report["cache"]["misses"] == 5
+    assert report["cache"]["hits"] + report["cache"]["joined"] == 95
+    assert report["p50_ms"] <= report["p95_ms"] <= report["p99_ms"]
+    assert sum(op["count"] for op in report["by_operation"].values()) == 100
+    assert report["run_peak_rss_growth_mb"] is None or report["run_peak_rss_growth_mb"] >= 0
@@ -0,0 +1,48 @@
+import threading
+import pytest
+from src.core.atlas14 import Atlas14Fetcher, PFDSHTTPError
+from src.core.fetch_cache import FetchCache
+from src.service.pfds_standin import PFDSStandIn, start_standin
+
+def _fetcher(server, **kwargs):
+    return Atlas14Fetcher(base_url=server.csv_url, backoff=0.01, **kwargs)
+
+def test_retries_injected_errors_and_throttling():
+    standin = PFDSStandIn(fail_first=2, rate_limit=1000, burst=3)
+    server = start_standin(standin)
+    try:
+        data = _fetcher(server).fetch_data(29.7604, -95.3698)
+        assert data["24h_25yr"] == 11.6 and data["60m_25yr"] == 3.86
+        assert standin.statuses == {503: 2, 200: 1}
+
+        with pytest.raises(PFDSHTTPError) as error:
+            _fetcher(server, retries=1).fetch_data(30.0, -95.0) # Fails twice, one retry allowed
+        assert error.value.status == 503
+
+        # Beyond the burst the stand-in answers 429 until tokens refill
+        standin.fail_first = 0
+        standin.rate_limit, standin.burst, standin._tokens = 5, 1, 0.0
+        _fetcher(server, retries=8).fetch_data(31.0, -95.0)
+        assert standin.statuses.get(429, 0) >= 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_cache_coalesces_against_standin():
+    standin = PFDSStandIn(latency=0.2, coverage=(24, 50, -125, -66))
+    server = start_standin(standin)
+    try:
+        cache = FetchCache(_fetcher(server))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.fetch(29.76, -95.37))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(results) == 8 and standin.requests == 1
+
+        with pytest.raises(RuntimeError, match="no data"):
+            cache.fetch(10.0, 10.0) # Outside coverage: NOAA's "File not found."
+    finally:
+        server.shutdown()
+        server.server_close()
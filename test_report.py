@@ -0,0 +1,39 @@
+import re
+import numpy as np
+from src.service.report import ReportPage, build_page, build_report, read_sites
+
+SITE = {"60m_25yr": 2.0, "24h_25yr": 6.0,
+        "full_data": {"5-min": {25: 0.6, 100: 0.8}, "15-min": {25: 1.1, 100: 1.5},
+                      "60-min": {25: 2.0, 100: 3.0}, "6-hr": {25: 4.0, 100: 5.5},
+                      "24-hr": {25: 6.0, 100: 7.0}}}
+
+def test_report_pages_render_headless(tmp_path):
+    sites = [{"lat": 29.5 + i, "lon": -95.0, "name": f"Site {i}", "data": dict(SITE)} for i in range(3)]
+    sites.append({"lat": 31.0, "lon": -95.0, "data": {"full_data": {}}}) # No depths: skipped
+
+    page = ReportPage(dpi=40)
+    build_page(page, sites[0], return_period=100)
+    image = page.render()
+    assert image.shape == (340, 440, 3) and image.dtype == np.uint8
+    assert image.min() < 128 # Something was drawn
+
+    # Vector pages by default, bitmaps with raster=True
+    for raster, images in ((False, 0), (True, 3)):
+        pdf = tmp_path / f"report-{raster}.pdf"
+        counts = build_report(sites, str(pdf), return_period=25, workers=1, dpi=40, raster=raster)
+        assert counts["pages"] == 3 and counts["errors"] == 1
+        assert "31.0000, -95.0000" in counts["first_errors"][0]
+        assert len(re.findall(rb"/Type\s*/Page\b", pdf.read_bytes())) == 3
+        assert len(re.findall(rb"/Subtype\s*/Image", pdf.read_bytes())) == images
+
+def test_report_pngs_named_by_csv_row(tmp_path):
+    path = tmp_path / "sites.csv"
+    path.write_text("name,lat,lon\nBayou City,29.5,-95\n,30.5,-95\nNo data,31.0,-95\nLast,32.0,-95\n")
+    sites = read_sites(str(path))
+    for site in sites:
+        site["data"] = {"full_data": {}} if site["name"] == "No data" else dict(SITE)
+    del sites[1] # Dropped before rendering, e.g. a failed fetch
+
+    counts = build_report(sites, png_dir=str(tmp_path / "png"), return_period=25, workers=0, dpi=40)
+    assert counts["pages"] == 2 and counts["errors"] == 1
+    assert sorted(p.name for p in (tmp_path / "png").iterdir()) == ["0001-bayou-city.png", "0004-last.png"]
@@ -0,0 +1,14 @@
+from src.core import api
+from src.core.series import prepare_series, rescale_storm
+
+def test_rescaled_storm_matches_regenerated():
+    storm = api.generate(4.0, "SCS Type II (Legacy/Standard)", time_step=1 / 60)
+    storm["plot"] = prepare_series(storm["hours"], storm["incremental"], storm["cumulative"], 500)
+    scaled = rescale_storm(storm, 10.0)
+    fresh = api.generate(10.0, "SCS Type II (Legacy/Standard)", time_step=1 / 60)
+    fresh_plot = prepare_series(fresh["hours"], fresh["incremental"], fresh["cumulative"], 500)
+    for key in ("incremental", "cumulative_mm"):
+        assert abs(scaled[key] - fresh[key]).max() < 1e-9
+    assert abs(scaled["plot"]["bar_values"] - fresh_plot["bar_values"]).max() < 1e-9
+    assert abs(scaled["plot"]["ylim"][1] - fresh_plot["ylim"][1]) < 1e-9
+    assert storm["cumulative"][-1] == 4.0 # Input left alone
@@ -0,0 +1,66 @@
+import numpy as np
+from src.core import api
+from src.core.critical_storm import PeakFlow, find_critical_storm, peak_time, site_depths, storm_fractions
+from src.core.hydrograph import runoff_hydrographs, unit_hydrographs
+from src.core.losses import excess_rainfall, runoff_depth
+
+def test_fft_hydrographs_match_direct_convolution():
+    storm = api.generate(6.0, "SCS Type II (Legacy/Standard)", time_step=1 / 60, duration=24)
+    excess = storm["incremental"] * 0.5
+    areas, tc = np.array([0.5, 3.0, 12.0]), np.array([0.3, 1.5, 4.0])
+    result = runoff_hydrographs(excess, areas, tc, 1 / 60, chunk_rows=2)
+
+    kernels = unit_hydrographs(areas, tc, 1 / 60)
+    for row, kernel in zip(result["flow"], kernels):
+        assert abs(row - np.convolve(excess, kernel)).max() < 1e-8
+    # Volume is conserved and a longer Tc attenuates the peak per square mile
+    assert abs(result["volume_in"] - excess.sum()).max() < 1e-9
+    assert np.all(np.diff(result["peak_cfs"] / areas) < 0)
+    assert np.all(np.diff(result["peak_hours"]) > 0)
+
+    # One excess series per subbasin gives the same rows
+    per_row = runoff_hydrographs(np.tile(excess, (3, 1)) * [[1.0], [2.0], [1.0]], areas, tc, 1 / 60)
+    assert abs(per_row["flow"][1] - 2.0 * result["flow"][1]).max() < 1e-8
+
+def test_batch_curve_number_excess():
+    storm = api.generate(5.0, "SCS Type III (Legacy/Gulf)", time_step=0.1, duration=24)
+    cn = np.array([55.0, 70.0, 85.0, 98.0, 100.0])
+    ratio = np.array([0.2, 0.05, 0.2, 0.2, 0.2])
+    excess = excess_rainfall(storm["incremental"], cn, ratio, chunk_rows=2)
+    assert excess.shape == (5, len(storm["hours"]))
+    assert excess.min() >= 0.0
+
+    # Each row matches the textbook equation applied to that subcatchment alone
+    s = 1000.0 / cn - 10.0
+    for row, si, ri in zip(excess, s, ratio):
+        p = storm["cumulative"]
+        with np.errstate(invalid="ignore"): # 0 / 0 before runoff starts at CN 100
+            q = np.where(p > ri * si, (p - ri * si) ** 2 / (p - ri * si + si), 0.0)
+        assert abs(np.cumsum(row) - q).max() < 1e-9
+    assert abs(excess.sum(axis=1) - runoff_depth(5.0, cn, ratio)).max() < 1e-9
+    assert abs(excess[-1] - storm["incremental"]).max() < 1e-12 # CN 100: everything runs off
+
+def test_critical_storm_search():
+    site = {"full_data": {"60-min": {100: 4.2}, "2-hr": {100: 5.3}, "6-hr": {100: 7.1},
+                          "12-hr": {100: 8.6}, "24-hr": {100: 10.0}}}
+    depths = site_depths(site, 100, durations=(1.0, 3.0, 24.0))
+    assert depths[24.0] == 10.0 and 5.3 < depths[3.0] < 7.1
+
+    # A 24-hour storm peaking where the pattern does is the standard storm
+    distribution = api._generator.get_distribution("SCS Type II (Legacy/Standard)")
+    fractions = storm_fractions(distribution, [24.0], [peak_time(distribution) / 24.0], 0.1, 240)
+    standard = api.generate(1.0, "SCS Type II (Legacy/Standard)", time_step=0.1, duration=24)
+    assert abs(fractions[0] - standard["fractions"]).max() < 1e-12
+
+    # Peaks land where asked, and every storm carries its duration's depth
+    fractions = storm_fractions(distribution, [6.0], [0.25, 0.75], 0.1, 240)
+    peaks = np.diff(fractions, axis=1).argmax(axis=1) * 0.1 + 0.1
+    assert abs(peaks - [1.5, 4.5]).max() <= 0.2 # within the pattern's steepest block
+
+    objective = PeakFlow(area=2.0, tc=1.5, curve_number=80)
+    result = find_critical_storm(depths, objective, patterns=["SCS Type II (Legacy/Standard)", "NOAA Region C"])
+    assert len(result["ranking"]) == 2 * 3 * 5
+    assert result["score"] == result["ranking"][0].score == max(c.score for c in result["ranking"])
+    assert abs(result["cumulative"][-1] - depths[result["duration"]]) < 1e-9
+    single = objective(result["hours"], result["incremental"][None, :])
+    assert abs(single[0] - result["score"]) < 1e-9
@@ -0,0 +1,25 @@
+import numpy as np
+from src.core import api
+from src.core.series import decimate_peaks, prepare_series
+
+def test_decimation_keeps_peak_and_total():
+    storm = api.generate(7.3, "NOAA Region C", time_step=1 / 60) # 2,881 one-minute steps
+    hours, incremental = storm["hours"], storm["incremental"]
+    edges = np.append(hours, hours[-1] + hours[1])
+
+    bar_edges, bar_values = decimate_peaks(edges, incremental, 500)
+    assert len(bar_values) <= 500 and len(bar_edges) == len(bar_values) + 1
+    assert bar_values.max() == incremental.max()
+    assert bar_edges[0] == edges[0] and bar_edges[-1] == edges[-1]
+    # Each bar is the largest step it covers
+    for left, right, value in zip(bar_edges[:-1], bar_edges[1:], bar_values):
+        assert value == incremental[(edges[:-1] >= left) & (edges[:-1] < right)].max()
+
+    prepared = prepare_series(hours, incremental, storm["cumulative"], 500)
+    assert abs(prepared["line_y"][-1] - 7.3) < 1e-9
+    assert abs(prepared["ylim2"][1] - 7.3 * 1.05) < 1e-9
+
+def test_short_series_pass_through():
+    edges, values = np.arange(11) * 0.1, np.linspace(0, 1, 10)
+    out_edges, out_values = decimate_peaks(edges, values, 10)
+    assert out_edges is edges and out_values is values
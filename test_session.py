@@ -0,0 +1,59 @@
+import os
+import tempfile
+import zipfile
+import pytest
+import numpy as np
+from src.core.atlas14 import Atlas14Fetcher
+from src.core.generator import RainfallGenerator
+from src.core.session import Project, ProjectError
+
+def test_project_round_trip_is_lazy():
+    with open("debug_noaa_response.html") as f:
+        data = Atlas14Fetcher()._parse_csv(f.read(), 100)
+    storm = RainfallGenerator().generate_arrays(5.0, "NOAA Region C")
+    storm.update(pattern="NOAA Region C", depth=5.0, label="C")
+
+    project = Project()
+    project.settings = {"return_period": "25yr"}
+    for i in range(20):
+        project.add_site(30.0 + i, -95.0, dict(data))
+    project.add_storm(30.0, -95.0, storm)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.stormgen")
+        project.save(path)
+        project.close()
+
+        with Project.open(path) as reopened:
+            assert reopened.settings == {"return_period": "25yr"}
+            assert len(reopened.sites) == 20
+            assert not any(site.loaded for site in reopened.sites.values())
+
+            site = reopened.site(30.0, -95.0)
+            assert site.data()["full_data"] == data["full_data"]
+            assert np.allclose(site.storms()[0]["cumulative"], storm["cumulative"])
+            assert sum(s.loaded for s in reopened.sites.values()) == 1
+
+def test_unreadable_project_raises_project_error(tmp_path):
+    garbage = tmp_path / "garbage.stormgen"
+    garbage.write_bytes(b"not a zip file")
+    with pytest.raises(ProjectError):
+        Project.open(str(garbage))
+
+    with open("debug_noaa_response.html") as f:
+        data = Atlas14Fetcher()._parse_csv(f.read(), 100)
+    project = Project()
+    project.add_site(30.0, -95.0, data)
+    path = str(tmp_path / "site.stormgen")
+    project.save(path)
+    project.close()
+
+    # Same archive with the site's depth table missing
+    damaged = str(tmp_path / "damaged.stormgen")
+    with zipfile.ZipFile(path) as src, zipfile.ZipFile(damaged, "w") as dst:
+        for name in src.namelist():
+            if not name.endswith("depths.npy"):
+                dst.writestr(name, src.read(name))
+    with Project.open(damaged) as reopened:
+        with pytest.raises(ProjectError):
+            reopened.site(30.0, -95.0).data()
@@ -0,0 +1,32 @@
+from src.gui.table_export import clipboard_payloads, table_to_html, table_to_tsv, write_table
+
+class _Model:
+    """The parts of ArrayTableModel the exporters use, without Qt."""
+
+    def __init__(self, headers, columns, row_headers=None):
+        self._headers, self._columns, self._row_headers = headers, columns, row_headers
+
+    def headers(self):
+        return list(self._headers)
+
+    def row_headers(self):
+        return self._row_headers
+
+    def formatted_columns(self):
+        return self._columns
+
+MODEL = _Model(["Pattern", "Depth <in>"], [["A & B", "<C>"], ["1.00", "2.50"]], row_headers=["25-yr", "100-yr"])
+
+def test_tsv_and_html():
+    assert table_to_tsv(MODEL) == "\tPattern\tDepth <in>\n25-yr\tA & B\t1.00\n100-yr\t<C>\t2.50\n"
+    html = table_to_html(MODEL)
+    assert html == ("<table><tr><th></th><th>Pattern</th><th>Depth &lt;in&gt;</th></tr>"
+                    "<tr><td>25-yr</td><td>A &amp; B</td><td>1.00</td></tr>"
+                    "<tr><td>100-yr</td><td>&lt;C&gt;</td><td>2.50</td></tr></table>")
+    assert clipboard_payloads(MODEL) == (table_to_tsv(MODEL), html)
+
+def test_write_table(tmp_path):
+    write_table(MODEL, str(tmp_path / "t.csv"))
+    assert (tmp_path / "t.csv").read_text() == ",Pattern,Depth <in>\n25-yr,A & B,1.00\n100-yr,<C>,2.50\n"
+    write_table(MODEL, str(tmp_path / "t.txt"))
+    assert (tmp_path / "t.txt").read_text() == table_to_tsv(MODEL)
@@ -0,0 +1,38 @@
+import os
+import numpy as np
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PyQt5.QtCore")
+from src.gui.table_models import (ArrayTableModel, ColumnFormat, format_fixed, format_hours,
+                                  format_storm_date, format_storm_time)
+
+def test_formatters_cell_and_bulk_agree():
+    hours = np.array([0.0, 0.1, 23.999999, 24.5, 47.95])
+    values = np.array([0.123456, np.nan, 2.0, -1.5, 1e-9])
+    fixed = format_fixed(3)
+    assert fixed.bulk(values) == [fixed(v) for v in values] == ["0.123", "", "2.000", "-1.500", "0.000"]
+    assert format_hours.bulk(hours) == [format_hours(h) for h in hours] == ["0.0", "0.1", "24.0", "24.5", "47.95"]
+    for fmt in (format_storm_date, format_storm_time):
+        assert fmt.bulk(hours) == [fmt(h) for h in hours]
+    assert format_storm_date(24.5) == "2026-01-02" and format_storm_time(24.5) == "00:30:00"
+    with pytest.raises(TypeError):
+        ColumnFormat()
+
+def test_array_table_model():
+    model = ArrayTableModel()
+    model.set_columns(["Hours", "Depth"], [np.arange(4) * 0.5, np.array([0.1, 0.2, np.nan, 0.4])],
+                      [format_hours, format_fixed(2)])
+    assert model.rowCount() == 4 and model.columnCount() == 2
+    assert model.data(model.index(1, 1)) == "0.20" and model.data(model.index(2, 1)) == ""
+    assert model.headerData(1, QtCore.Qt.Horizontal) == "Depth"
+    assert model.headerData(2, QtCore.Qt.Vertical) == "3"
+
+    changed, reset = [], []
+    model.dataChanged.connect(lambda *args: changed.append(args))
+    model.modelReset.connect(lambda: reset.append(True))
+    model.update_columns([np.arange(4) * 0.5, np.array([1.0, 2.0, 3.0, 4.0])])
+    assert model.data(model.index(2, 1)) == "3.00" and len(changed) == 1 and not reset
+    model.update_columns([np.arange(6) * 0.5, np.ones(6)]) # New row count: reset
+    assert model.rowCount() == 6 and reset
+    assert model.formatted_columns()[1] == ["1.00"] * 6
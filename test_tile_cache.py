@@ -0,0 +1,28 @@
+import os
+import time
+from src.utils.tile_cache import TileCache
+
+def test_tile_cache_put_get_and_eviction(tmp_path):
+    cache = TileCache(root=str(tmp_path), max_bytes=1000)
+    assert cache.get("osm", 3, 1, 2) is None
+    cache.put("osm", 3, 1, 2, b"a" * 100)
+    assert cache.get("osm", 3, 1, 2) == b"a" * 100
+
+    # Overwriting a tile counts only the new size
+    for _ in range(20):
+        cache.put("osm", 3, 1, 2, b"b" * 150)
+    assert cache._total_bytes == 150
+    assert cache.get("osm", 3, 1, 2) == b"b" * 150
+
+    # Past the limit the least recently used tiles go, down to 90%
+    for y in range(3, 10):
+        cache.put("osm", 3, 1, y, b"c" * 100)
+        past = time.time() - 1000 + y
+        os.utime(cache.path("osm", 3, 1, y), (past, past))
+    cache.get("osm", 3, 1, 3) # Recently used again
+    cache.put("osm", 3, 1, 10, b"d" * 200)
+    assert cache._total_bytes <= 900
+    assert cache._total_bytes == cache._scan_size()
+    assert cache.get("osm", 3, 1, 3) is not None
+    assert cache.get("osm", 3, 1, 10) is not None
+    assert cache.get("osm", 3, 1, 4) is None